@@ -47,9 +47,11 @@ def create_app():
     with app.app_context():
         from app.auth_service import AuthService
         from app.blueprint_service import BlueprintService
+        from app.review_service import ReviewService
 
         app.auth = AuthService(db=db)
         app.bp_service = BlueprintService(db=db)
+        app.review_service = ReviewService(db=db)
 
         from app.routes import register_routes
 
@@ -1,11 +1,48 @@
+import csv
+import io
 import json
+import uuid
 
 from sqlalchemy.exc import IntegrityError
 
-from app.models import UserBlueprint
+from app.models import MemoryItem, UserBlueprint
 from app.validators import assert_blueprint_name
 from quiz import parse_blueprint_from_text
 from quiz.units.exceptions import UserConfigError
+from quiz.units.memory_quiz_unit import MemoryQuizUnit
+
+# Number of memory items inserted per bulk insert
+MEMORY_ITEM_CHUNK_SIZE = 5000
+
+
+def _detach_memory_items(blueprint):
+    """
+    Split the items of the memory blocks off a parsed blueprint.
+
+    Returns the blueprint as stored, with memory blocks without items, and
+    the items per block index.
+    """
+    stored = []
+    items_per_block = {}
+    for block, (blueprint_unit, category) in enumerate(blueprint):
+        if category == "memory" and "items" in blueprint_unit:
+            items_per_block[block] = blueprint_unit["items"]
+            blueprint_unit = {
+                key: value
+                for key, value in blueprint_unit.items()
+                if key != "items"
+            }
+        stored.append((blueprint_unit, category))
+    return stored, items_per_block
+
+
+def _assign_deck_ids(blueprint, blocks):
+    """
+    Give the memory blocks with new or changed items a new deck id, which
+    invalidates the cached samplers of their previous items.
+    """
+    for block in blocks:
+        blueprint[block][0]["deck_id"] = uuid.uuid4().hex
 
 
 class BlueprintService:
@@ -16,34 +53,124 @@ class BlueprintService:
     def _create_blueprint_table(self):
         self.db.create_all()
 
-    def add_user_blueprint(self, user_id, name, description, blueprint_text):
+    def _check_new_blueprint_name(self, user_id, name):
         try:
             assert_blueprint_name(name)
         except ValueError as e:
-            return False, str(e)
+            return str(e)
 
         existing = UserBlueprint.query.filter_by(
             user_id=user_id, name=name
         ).first()
         if existing:
-            return False, f"Blueprint '{name}' already exists."
+            return f"Blueprint '{name}' already exists."
+        return None
+
+    def add_user_blueprint(self, user_id, name, description, blueprint_text):
+        error = self._check_new_blueprint_name(user_id, name)
+        if error:
+            return False, error
 
         try:
             blueprint = parse_blueprint_from_text(blueprint_text)
-            blueprint = json.dumps(blueprint)
         except UserConfigError as e:
             return False, str(e)
+        return self._store_user_blueprint(
+            user_id, name, description, blueprint
+        )
 
+    def import_memory_deck(
+        self, user_id, name, description, file, count, delimiter=","
+    ):
+        """
+        Import a memory deck from a CSV or TSV file as a new blueprint.
+
+        The file is decoded and parsed row by row while it is read.
+        """
+        error = self._check_new_blueprint_name(user_id, name)
+        if error:
+            return False, error
+
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            if count < 1:
+                raise UserConfigError(
+                    f"Invalid count: {count}"
+                )
+            # The rows are inserted while the file is read
+            items = MemoryQuizUnit.transform_rows_to_items(
+                csv.reader(text, delimiter=delimiter)
+            )
+            return self._store_user_blueprint(
+                user_id,
+                name,
+                description,
+                [({"count": count}, "memory")],
+                {0: items},
+            )
+        except (UserConfigError, csv.Error, UnicodeDecodeError) as e:
+            self.db.session.rollback()
+            return False, f"Invalid deck file: {e}"
+        finally:
+            # The caller owns the file
+            text.detach()
+
+    def _insert_memory_items(self, blueprint_id, block, items):
+        keys = set()
+        chunk = []
+        for position, item in enumerate(items):
+            if item["key"] in keys:
+                raise UserConfigError(
+                    f"Duplicate memory item '{item['key']}'"
+                )
+            keys.add(item["key"])
+            chunk.append(
+                {
+                    "blueprint_id": blueprint_id,
+                    "block": block,
+                    "position": position,
+                    "key": item["key"],
+                    "value": item["value"],
+                    "enable": item["enable"],
+                    "weight": item.get("weight", 1.0),
+                }
+            )
+            if len(chunk) == MEMORY_ITEM_CHUNK_SIZE:
+                self.db.session.bulk_insert_mappings(MemoryItem, chunk)
+                chunk = []
+        self.db.session.bulk_insert_mappings(MemoryItem, chunk)
+        if not keys:
+            raise UserConfigError(
+                "The memory block does not contain any items"
+            )
+
+    def _store_user_blueprint(
+        self, user_id, name, description, blueprint, items_per_block=None
+    ):
+        """
+        Store a new blueprint. The items of its memory blocks are stored as
+        rows of their own, either taken from the blueprint or, for blocks
+        without items, from `items_per_block`.
+        """
+        blueprint, detached = _detach_memory_items(blueprint)
+        items_per_block = {**detached, **(items_per_block or {})}
+        _assign_deck_ids(blueprint, items_per_block)
         new_blueprint = UserBlueprint(
             user_id=user_id,
             name=name,
             description=description,
-            blueprint=blueprint,
+            blueprint=json.dumps(blueprint),
         )
         try:
             self.db.session.add(new_blueprint)
+            self.db.session.flush()
+            for block, items in items_per_block.items():
+                self._insert_memory_items(new_blueprint.id, block, items)
             self.db.session.commit()
             return True, f"Blueprint '{name}' added successfully."
+        except UserConfigError as e:
+            self.db.session.rollback()
+            return False, str(e)
         except IntegrityError:
             self.db.session.rollback()
             return False, "Failed to add blueprint due to integrity error."
@@ -71,14 +198,24 @@ class BlueprintService:
 
         try:
             parsed_blueprint = parse_blueprint_from_text(blueprint_text)
-            blueprint.blueprint = json.dumps(parsed_blueprint)
         except UserConfigError as e:
             return False, str(e)
 
+        stored, items_per_block = _detach_memory_items(parsed_blueprint)
+        _assign_deck_ids(stored, items_per_block)
+        blueprint.blueprint = json.dumps(stored)
         blueprint.description = description
         if new_name:
             blueprint.name = new_name
 
+        MemoryItem.query.filter_by(blueprint_id=blueprint.id).delete()
+        try:
+            for block, items in items_per_block.items():
+                self._insert_memory_items(blueprint.id, block, items)
+        except UserConfigError as e:
+            self.db.session.rollback()
+            return False, str(e)
+
         self.db.session.commit()
         return True, f"Blueprint '{name}' updated successfully."
 
@@ -93,19 +230,108 @@ class BlueprintService:
         self.db.session.commit()
         return True, f"Blueprint '{name}' deleted."
 
-    def get_user_blueprint(self, user_id, name):
+    def get_user_blueprint(self, user_id, name, with_items=False):
+        """
+        Return the blueprint entry of the user with the given name, or None.
+
+        The items of memory blocks are only loaded with `with_items`, use
+        `load_memory_items` to load them later, e.g. at quiz generation.
+        """
         blueprint = UserBlueprint.query.filter_by(
             user_id=user_id, name=name
         ).first()
         if not blueprint:
             return None
         blueprint = {
+            "id": blueprint.id,
             "name": blueprint.name,
             "description": blueprint.description,
             "blueprint": json.loads(blueprint.blueprint),
         }
+        if with_items:
+            blueprint["blueprint"] = self.load_memory_items(
+                blueprint["id"], blueprint["blueprint"]
+            )
         return blueprint
 
+    def load_memory_items(self, blueprint_id, blueprint):
+        """
+        Fill in the items of the memory blocks of a stored blueprint.
+
+        Blocks which already have items are returned unchanged. Loaded
+        blocks get the current deck id of their items, the one of the given
+        blueprint may be outdated (e.g. kept in the session during an edit).
+        """
+        blocks = {
+            block
+            for block, (blueprint_unit, category) in enumerate(blueprint)
+            if category == "memory" and "items" not in blueprint_unit
+        }
+        if not blocks:
+            return blueprint
+
+        stored = self.db.session.get(UserBlueprint, blueprint_id)
+        stored = json.loads(stored.blueprint) if stored else []
+        deck_ids = {
+            block: blueprint_unit.get("deck_id")
+            for block, (blueprint_unit, _) in enumerate(stored)
+        }
+
+        items_per_block = {block: [] for block in blocks}
+        rows = (
+            MemoryItem.query.filter(
+                MemoryItem.blueprint_id == blueprint_id,
+                MemoryItem.block.in_(blocks),
+            )
+            .order_by(MemoryItem.block, MemoryItem.position)
+            .all()
+        )
+        for row in rows:
+            items_per_block[row.block].append(row.as_item())
+        loaded = []
+        for block, (blueprint_unit, category) in enumerate(blueprint):
+            if block in blocks:
+                blueprint_unit = {
+                    key: value
+                    for key, value in blueprint_unit.items()
+                    if key != "deck_id"
+                }
+                blueprint_unit["items"] = items_per_block[block]
+                if deck_ids.get(block) is not None:
+                    blueprint_unit["deck_id"] = deck_ids[block]
+            loaded.append((blueprint_unit, category))
+        return loaded
+
+    def set_memory_item_enabled(self, user_id, name, key, enable):
+        """
+        Enable or disable a memory item of a blueprint, in all of its memory
+        blocks, with a single row update.
+        """
+        blueprint = UserBlueprint.query.filter_by(
+            user_id=user_id, name=name
+        ).first()
+        if not blueprint:
+            return False, f"No blueprint named '{name}' found."
+
+        updated = MemoryItem.query.filter_by(
+            blueprint_id=blueprint.id, key=key
+        ).update({"enable": enable})
+        if not updated:
+            self.db.session.rollback()
+            return False, f"No memory item '{key}' found."
+        stored = json.loads(blueprint.blueprint)
+        blocks = {
+            row.block
+            for row in MemoryItem.query.with_entities(MemoryItem.block)
+            .filter_by(blueprint_id=blueprint.id, key=key)
+            .distinct()
+        }
+        _assign_deck_ids(stored, blocks)
+        blueprint.blueprint = json.dumps(stored)
+        self.db.session.commit()
+        state = "enabled" if enable else "disabled"
+        return True, f"Memory item '{key}' {state}."
+
     def get_user_blueprints_list(self, user_id):
         blueprints = UserBlueprint.query.filter_by(user_id=user_id).all()
         blueprint_list = []
@@ -1,12 +1,15 @@
 import sqlite3
 
 from sqlalchemy import (
+    Boolean,
     Column,
+    Float,
     Integer,
     String,
     LargeBinary,
     DateTime,
     ForeignKey,
+    Index,
     Text,
     event,
     UniqueConstraint,
@@ -64,6 +67,80 @@ class UserBlueprint(db.Model):
     description = Column(String(255), nullable=True)
     blueprint = Column(Text, nullable=False)
 
+    memory_items = relationship(
+        "MemoryItem",
+        backref=backref("user_blueprint", passive_deletes=True),
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    review_states = relationship(
+        "MemoryReviewState",
+        backref=backref("user_blueprint", passive_deletes=True),
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="_user_blueprint_uc"),
     )
+
+
+class MemoryItem(db.Model):
+    """
+    Item of a memory block, stored outside of the blueprint JSON. `block` is
+    the index of the memory block in the blueprint and `position` the order
+    of the item in its block.
+    """
+
+    __tablename__ = "memory_items"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    blueprint_id = Column(
+        Integer,
+        ForeignKey("user_blueprints.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    block = Column(Integer, nullable=False)
+    position = Column(Integer, nullable=False)
+    key = Column(String(255), nullable=False)
+    value = Column(Text, nullable=False)
+    enable = Column(Boolean, default=True, nullable=False)
+    weight = Column(Float, default=1.0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "blueprint_id", "block", "key", name="_memory_item_uc"
+        ),
+        Index(
+            "ix_memory_items_position", "blueprint_id", "block", "position"
+        ),
+    )
+
+    def as_item(self):
+        return {
+            "key": self.key,
+            "value": self.value,
+            "enable": self.enable,
+            "weight": self.weight,
+        }
+
+
+class MemoryReviewState(db.Model):
+    __tablename__ = "memory_review_states"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    blueprint_id = Column(
+        Integer,
+        ForeignKey("user_blueprints.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    item_key = Column(String(255), nullable=False)
+    box = Column(Integer, default=0, nullable=False)
+    due = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "blueprint_id", "item_key", name="_memory_review_state_uc"
+        ),
+        Index("ix_memory_review_states_due", "blueprint_id", "due"),
+    )
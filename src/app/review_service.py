@@ -0,0 +1,213 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_
+
+from app.models import MemoryItem, MemoryReviewState
+
+# Leitner boxes: a correct answer moves an item up one box, a wrong answer
+# back to the first box. Items are due again after the interval of their box.
+BOX_INTERVALS = (
+    timedelta(days=0),
+    timedelta(days=1),
+    timedelta(days=2),
+    timedelta(days=4),
+    timedelta(days=8),
+    timedelta(days=16),
+    timedelta(days=32),
+)
+
+
+def _next_box(box, is_correct):
+    if not is_correct:
+        return 0
+    if box is None:
+        return 1
+    return min(box + 1, len(BOX_INTERVALS) - 1)
+
+
+class ReviewService:
+    """
+    Spaced-repetition scheduling of memory blocks in review mode.
+
+    The state of every reviewed item is stored per blueprint with the date it
+    is due again, so selecting the items of a quiz is an indexed query for
+    the next due items instead of a scan of the whole deck.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._create_review_state_table()
+
+    def _create_review_state_table(self):
+        self.db.create_all()
+
+    def _next_due_items(self, blueprint_id, block, count, now):
+        # Items stored as rows: both selections are indexed queries limited
+        # to the items of the quiz
+        state_of_item = and_(
+            MemoryReviewState.blueprint_id == MemoryItem.blueprint_id,
+            MemoryReviewState.item_key == MemoryItem.key,
+        )
+        block_items = (
+            MemoryItem.blueprint_id == blueprint_id,
+            MemoryItem.block == block,
+            MemoryItem.enable.is_(True),
+        )
+        rows = (
+            MemoryItem.query.join(MemoryReviewState, state_of_item)
+            .filter(*block_items, MemoryReviewState.due <= now)
+            .order_by(MemoryReviewState.due)
+            .limit(count)
+            .all()
+        )
+        if len(rows) < count:
+            rows += (
+                MemoryItem.query.outerjoin(MemoryReviewState, state_of_item)
+                .filter(*block_items, MemoryReviewState.id.is_(None))
+                .order_by(MemoryItem.position)
+                .limit(count - len(rows))
+                .all()
+            )
+        return [row.as_item() for row in rows]
+
+    def _next_due_keys(self, blueprint_id, blueprint_unit, now):
+        # Items inside the blueprint, as stored before memory items had a
+        # table of their own
+        count = blueprint_unit["count"]
+        enabled = [
+            item["key"] for item in blueprint_unit["items"] if item["enable"]
+        ]
+        enabled_set = set(enabled)
+
+        # Due items first, the ones overdue longest at the front
+        keys = []
+        due_states = (
+            MemoryReviewState.query.with_entities(MemoryReviewState.item_key)
+            .filter(
+                MemoryReviewState.blueprint_id == blueprint_id,
+                MemoryReviewState.due <= now,
+            )
+            .order_by(MemoryReviewState.due)
+            .yield_per(max(count, 100))
+        )
+        for (key,) in due_states:
+            if key in enabled_set:
+                keys.append(key)
+                if len(keys) == count:
+                    return keys
+
+        # Then items never reviewed, in the order of the deck
+        known = {
+            key
+            for (key,) in MemoryReviewState.query.with_entities(
+                MemoryReviewState.item_key
+            ).filter(MemoryReviewState.blueprint_id == blueprint_id)
+        }
+        for key in enabled:
+            if key not in known:
+                keys.append(key)
+                if len(keys) == count:
+                    break
+        return keys
+
+    def schedule_blueprint(self, blueprint_id, blueprint, now=None):
+        """
+        Restrict the memory blocks in review mode to their due items.
+
+        Parameters
+        ----------
+        blueprint_id : int
+            The id of the stored blueprint.
+        blueprint : list
+            The parsed blueprint, as (blueprint_unit, category) pairs.
+        now : datetime, optional
+            The time of the review, defaults to the current time.
+
+        Returns
+        -------
+        list
+            The blueprint with the review blocks restricted to at most
+            `count` due items each, with their items loaded. Other blocks
+            are returned unchanged.
+        """
+        now = now or datetime.utcnow()
+        scheduled = []
+        for block, (blueprint_unit, category) in enumerate(blueprint):
+            if category != "memory" or not blueprint_unit.get("review"):
+                scheduled.append((blueprint_unit, category))
+                continue
+            if "items" in blueprint_unit:
+                keys = set(
+                    self._next_due_keys(blueprint_id, blueprint_unit, now)
+                )
+                items = [
+                    item
+                    for item in blueprint_unit["items"]
+                    if item["key"] in keys
+                ]
+            else:
+                items = self._next_due_items(
+                    blueprint_id, block, blueprint_unit["count"], now
+                )
+            # The due items are not the deck, they never share its sampler
+            blueprint_unit = {
+                key: value
+                for key, value in blueprint_unit.items()
+                if key != "deck_id"
+            }
+            blueprint_unit.update({"items": items, "count": len(items)})
+            scheduled.append((blueprint_unit, category))
+        return scheduled
+
+    def record_results(self, blueprint_id, quiz, results, now=None):
+        """
+        Update the schedule of the reviewed items with one bulk write.
+
+        Parameters
+        ----------
+        blueprint_id : int
+            The id of the stored blueprint.
+        quiz : list of dict
+            The quiz questions. Only memory questions with an `item_key`,
+            i.e. generated in review mode, are recorded.
+        results : list of dict
+            The results of `compute_quiz_results` for the quiz.
+        now : datetime, optional
+            The time of the review, defaults to the current time.
+        """
+        now = now or datetime.utcnow()
+        grades = {}
+        for question, result in zip(quiz, results):
+            key = question.get("item_key")
+            if question["category"] == "memory" and key is not None:
+                grades[key] = grades.get(key, True) and result["is_correct"]
+        if not grades:
+            return
+
+        states = {
+            state.item_key: state
+            for state in MemoryReviewState.query.filter(
+                MemoryReviewState.blueprint_id == blueprint_id,
+                MemoryReviewState.item_key.in_(list(grades)),
+            )
+        }
+        updates = []
+        inserts = []
+        for key, is_correct in grades.items():
+            state = states.get(key)
+            box = _next_box(state.box if state else None, is_correct)
+            due = now + BOX_INTERVALS[box]
+            if state:
+                updates.append({"id": state.id, "box": box, "due": due})
+            else:
+                inserts.append(
+                    {
+                        "blueprint_id": blueprint_id,
+                        "item_key": key,
+                        "box": box,
+                        "due": due,
+                    }
+                )
+        self.db.session.bulk_update_mappings(MemoryReviewState, updates)
+        self.db.session.bulk_insert_mappings(MemoryReviewState, inserts)
+        self.db.session.commit()
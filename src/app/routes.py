@@ -214,6 +214,7 @@ def _register_blueprint_management_routes(app):
                     user_id, blueprint_name
                 )
                 session["blueprint"] = blueprint_entry["blueprint"]
+                session["blueprint_id"] = blueprint_entry["id"]
                 return redirect(url_for("quiz"))
 
             else:
@@ -259,6 +260,48 @@ def _register_blueprint_management_routes(app):
             "create_blueprint.html", name="", description="", blueprint=""
         )
 
+    @app.route("/import_deck", methods=["GET", "POST"])
+    @_login_required
+    def import_deck():
+        if request.method == "POST":
+            name = request.form["name"]
+            description = request.form["description"].strip()
+            deck_file = request.files.get("deck")
+
+            try:
+                count = int(request.form["count"])
+            except ValueError:
+                count = 0
+            if not name or not deck_file or not deck_file.filename:
+                flash("Name and deck file cannot be empty.", "error")
+            elif count < 1:
+                flash("Questions per quiz must be a positive number.", "error")
+            else:
+                delimiter = (
+                    "\t" if deck_file.filename.lower().endswith(".tsv") else ","
+                )
+                success, message = app.bp_service.import_memory_deck(
+                    user_id=session["user_id"],
+                    name=name,
+                    description=description,
+                    file=deck_file.stream,
+                    count=count,
+                    delimiter=delimiter,
+                )
+                if success:
+                    return redirect(url_for("index"))
+                flash(message, "error")
+            return render_template(
+                "import_deck.html",
+                name=name,
+                description=description,
+                count=request.form["count"],
+            )
+
+        return render_template(
+            "import_deck.html", name="", description="", count="10"
+        )
+
     @app.route("/edit_blueprint", methods=["GET", "POST"])
     @_login_required
     def edit_blueprint():
@@ -296,13 +339,17 @@ def _register_blueprint_management_routes(app):
 
         name = request.args["name"]
         blueprint_entry = app.bp_service.get_user_blueprint(
-            user_id=user_id, name=name
+            user_id=user_id, name=name, with_items=True
         )
         if not blueprint_entry:
             raise ValueError(
                 f"No blueprint found with name '{name}'."
             )
 
+        has_memory = any(
+            category == "memory"
+            for _, category in blueprint_entry["blueprint"]
+        )
         blueprint = unparse_blueprint_to_text(blueprint_entry["blueprint"])
         return render_template(
             "edit_blueprint.html",
@@ -310,8 +357,27 @@ def _register_blueprint_management_routes(app):
             description=blueprint_entry["description"],
             blueprint=blueprint,
             original_name=blueprint_entry["name"],
+            has_memory=has_memory,
         )
 
+    @app.route("/toggle_memory_item", methods=["POST"])
+    @_login_required
+    def toggle_memory_item():
+        # Updates the row of a single item instead of saving the whole deck
+        name = request.form["name"]
+        key = request.form["key"].strip()
+        if not key:
+            flash("Key of the memory item cannot be empty.", "error")
+        else:
+            success, message = app.bp_service.set_memory_item_enabled(
+                user_id=session["user_id"],
+                name=name,
+                key=key,
+                enable=request.form["enable"] == "on",
+            )
+            flash(message, "success" if success else "error")
+        return redirect(url_for("edit_blueprint", name=name))
+
 
 def _register_quiz_routes(app):
     @app.route("/quiz", methods=["GET", "POST"])
@@ -324,7 +390,19 @@ def _register_quiz_routes(app):
             return render_template("quiz.html", quiz=session["quiz"])
 
         blueprint = session["blueprint"]
+        if session.get("blueprint_id") is not None:
+            # Memory items are only loaded from their table at this point
+            blueprint = app.review_service.schedule_blueprint(
+                session["blueprint_id"], blueprint
+            )
+            blueprint = app.bp_service.load_memory_items(
+                session["blueprint_id"], blueprint
+            )
         quiz = generate_quiz(blueprint)
+        if not quiz and session.get("blueprint_id") is not None:
+            # Review blocks are scheduled down to zero questions
+            flash("Nothing is due for review right now.", "info")
+            return redirect(url_for("index"))
         session["quiz"] = quiz
         session["start_time"] = datetime.utcnow().isoformat()
         return render_template("quiz.html", quiz=quiz)
@@ -362,6 +440,10 @@ def _register_quiz_routes(app):
                 previous_answers=previous_answers,
             )
 
+        if session.get("blueprint_id") is not None:
+            app.review_service.record_results(
+                session["blueprint_id"], quiz, results
+            )
         session["results"] = _convert_is_correct_flag(results, type_= str)
         return redirect(url_for("result"))
 
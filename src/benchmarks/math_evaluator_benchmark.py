@@ -0,0 +1,94 @@
+"""
+Benchmark of the eval-free math evaluator against the former `eval` path.
+
+Run from the `src` directory:
+
+    python -m benchmarks.math_evaluator_benchmark [--count N]
+"""
+
+import argparse
+import timeit
+
+from quiz.units.math_quiz_unit import (
+    CONSTANT_TABLE,
+    FUNCTION_TABLE,
+    MathQuizUnit,
+)
+
+BLUEPRINTS = {
+    "int + int": [
+        {"type": "int", "start": 1, "end": 100},
+        {"type": "operator", "value": ["+"]},
+        {"type": "int", "start": 1, "end": 100},
+    ],
+    "mixed operators": [
+        {"type": "int", "start": -50, "end": 50},
+        {"type": "operator", "value": ["+", "-", "*", "/", "//", "%"]},
+        {"type": "float.2", "start": 1.0, "end": 10.0},
+        {"type": "operator", "value": ["+", "-", "*"]},
+        {"type": "int", "start": 1, "end": 9},
+    ],
+    "function and constant": [
+        {"type": "function", "value": "sqrt"},
+        {"type": "bracket", "value": "("},
+        {"type": "int", "start": 1, "end": 100},
+        {"type": "operator", "value": ["*"]},
+        {"type": "constant", "value": "pi"},
+        {"type": "bracket", "value": ")"},
+        {"type": "operator", "value": ["+"]},
+        {"type": "float", "start": 0.0, "end": 1.0},
+    ],
+}
+
+_EVAL_NAMESPACE = {**FUNCTION_TABLE, **CONSTANT_TABLE}
+
+
+def _evaluate_with_eval(expr):
+    try:
+        res = eval(expr, _EVAL_NAMESPACE)
+        float(res)
+    except ZeroDivisionError:
+        res = float("nan")
+    return str(res)
+
+
+def run_benchmark(count):
+    for name, elements in BLUEPRINTS.items():
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        questions = [
+            MathQuizUnit._generate_question(plan) for _ in range(count)
+        ]
+
+        for expr, slots in questions:
+            expected = _evaluate_with_eval(expr)
+            actual = MathQuizUnit._envaluate_question(plan, slots)
+            assert actual == expected, f"{expr}: {actual} != {expected}"
+
+        eval_time = min(
+            timeit.repeat(
+                lambda: [_evaluate_with_eval(expr) for expr, _ in questions],
+                number=1,
+                repeat=5,
+            )
+        )
+        rpn_time = min(
+            timeit.repeat(
+                lambda: [
+                    MathQuizUnit._envaluate_question(plan, slots)
+                    for _, slots in questions
+                ],
+                number=1,
+                repeat=5,
+            )
+        )
+        print(
+            f"{name:<24} eval: {eval_time * 1e6 / count:7.2f} us/question  "
+            f"rpn: {rpn_time * 1e6 / count:7.2f} us/question  "
+            f"speedup: {eval_time / rpn_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    run_benchmark(parser.parse_args().count)
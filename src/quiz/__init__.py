@@ -1,8 +1,12 @@
 from quiz.quiz_engine import QuizEngine
+from quiz.units import QUIZ_UNIT_MAPPING
+from quiz.units.exceptions import UserConfigError
 
 __all__ = [
     "parse_blueprint_from_text",
+    "parse_memory_blueprint_from_rows",
     "generate_quiz",
+    "iter_quiz",
     "compute_quiz_results",
 ]
 
@@ -17,7 +21,8 @@ def parse_blueprint_from_text(blueprint_text):
 
     <category>: <count>
 
-    - <category>: 'math', 'date', or 'memory'
+    - <category>: 'math', 'date', 'datediff', 'factor', 'tables',
+      'convert', 'fraction', or 'memory'
     - <count>: number of expressions to generate
 
     For 'math', the block must include indented lines specifying elements:
@@ -29,21 +34,92 @@ def parse_blueprint_from_text(blueprint_text):
         - (                         # Open bracket
         - )                         # Close bracket
         - func <function_name>      # Valid: abs, ceil, floor, round,
-                                    # exp, log, log10, sqrt, sin, cos, tan (uses
-                                    # numpy functions)
+                                    # exp, log, log10, sqrt, sin, cos, tan
+                                    # (behave like the numpy functions)
         - const <constant_name>     # Valid: c, h, hbar, G, e, k, N_A,
                                     # R, alpha, mu_0, epsilon_0, sigma,
                                     # zero_Celsius, pi, Avogadro, Boltzmann,
                                     # Planck, speed_of_light, elementary_charge,
-                                    # gravitational_constant (uses scipy
-                                    # constants), or any number as a string
+                                    # gravitational_constant (values of
+                                    # scipy.constants), or any number as a
+                                    # string
+        - exact                     # Optional, divisions of two integers
+                                    # are built from their quotient, so
+                                    # they divide evenly and never by zero
+                                    # (requires a '/' or '//' operator)
+        - unique                    # Optional, ask every expression once
+                                    # before repeating any (cannot be
+                                    # combined with exact)
+        - tree <depth> [<operands>] # Optional, build random expression
+                                    # trees of at most <depth> levels
+                                    # (1 to MAX_TREE_DEPTH = 6) with 2 to
+                                    # <operands> leaves
+                                    # (default 2**depth), drawing operands
+                                    # from the other lines and combining
+                                    # them with all listed operators
+                                    # (cannot be combined with unique)
 
     For 'date', valid indented lines include:
-        - start <year>              # Optional, default = 1900
-        - end <year>                # Optional, default = 2050
+        - start <year>              # Optional, default = 1900, at least 1
+        - end <year>                # Optional, default = 2050, at most 9999
+        - unique                    # Optional, ask every date of the range
+                                    # once before repeating any
+
+    For 'datediff', valid indented lines include:
+        - start <year>              # Optional, default = 1900, at least 1
+        - end <year>                # Optional, default = 2050, at most 9999
+        - between                   # Ask for the days between two dates
+        - after                     # Ask for the date N days after a date
+                                    # (default: both kinds of questions)
+
+    For 'factor', valid indented lines include:
+        - start <n>                 # Optional, default = 2
+        - end <n>                   # Optional, default = 100, at most 10**7
+        - factorize                 # Ask for prime factorizations
+        - prime                     # Ask whether a number is prime
+        - gcd                       # Ask for greatest common divisors
+        - lcm                       # Ask for least common multiples
+                                    # (default: all kinds of questions)
+
+    For 'tables', valid indented lines include:
+        - start <n>                 # Optional, default = 1
+        - end <n>                   # Optional, default = 12
+        - multiply                  # Ask the products of the tables
+        - square                    # Ask squares
+        - cube                      # Ask cubes
+        - sqrt                      # Ask square roots of perfect squares
+                                    # (default: all kinds of questions)
+        - unique                    # Optional, ask every fact once before
+                                    # repeating any
+
+    For 'convert', valid indented lines include:
+        - <from> <to> [[<start>] <end>]
+                                    # Convert integers from [start, end]
+                                    # (default 0 to 100) between km and mi,
+                                    # C, F and K, or kg and lb
+                                    # (default: km/mi, C/F and kg/lb in both
+                                    # directions)
+        - precision <digits>        # Optional, default = 2, answers within
+                                    # 0.5% are accepted
+
+    For 'fraction', valid indented lines include:
+        - denominator <max>         # Optional, default = 12, at most 100
+        - amount <max>              # Optional, default = 200
+        - add                       # Add two fractions
+        - subtract                  # Subtract two fractions
+        - multiply                  # Multiply two fractions
+        - percent                   # Ask percentages of amounts
+                                    # (default: all kinds of questions,
+                                    # answers like 3/4, 0.75 or 75%)
 
     For 'memory', valid indented lines include:
-        - <key> <value> [on|off]   # Optional, default = on
+        - <key> <value> [on|off] [<weight>]
+                                    # Optional, default = on, weight = 1
+                                    # (items are drawn proportionally to
+                                    # their weights, from 0.001 to 1000)
+        - review                    # Optional, spaced-repetition mode: ask
+                                    # the due items of the deck (scheduled
+                                    # by the app with Leitner boxes)
 
     Lines may be indented using spaces or tabs. Blank lines are allowed.
     Malformed input will raise a UserConfigError.
@@ -74,10 +150,43 @@ def parse_blueprint_from_text(blueprint_text):
                     - {"type": "bracket", "value": "(" or ")"}
                     - {"type": "function", "value": str}
                     - {"type": "constant", "value": str}
+                - "exact_division": bool
+                - "unique": bool
+                - "tree": {"depth": int, "operands": int}
 
             If "category" == "date":
                     - "start_year": int
                     - "end_year": int
+                    - "unique": bool
+
+            If "category" == "datediff":
+                    - "start_year": int
+                    - "end_year": int
+                    - "kinds": list of str, from {"between", "after"}
+
+            If "category" == "factor":
+                    - "start": int
+                    - "end": int
+                    - "kinds": list of str, from {"factorize", "prime",
+                      "gcd", "lcm"}
+
+            If "category" == "tables":
+                    - "start": int
+                    - "end": int
+                    - "kinds": list of str, from {"multiply", "square",
+                      "cube", "sqrt"}
+                    - "unique": bool
+
+            If "category" == "convert":
+                    - "conversions": list of dicts, each with:
+                        {"from": str, "to": str, "start": int, "end": int}
+                    - "precision": int
+
+            If "category" == "fraction":
+                    - "max_denominator": int
+                    - "max_amount": int
+                    - "kinds": list of str, from {"add", "subtract",
+                      "multiply", "percent"}
 
     count : int Number of expressions to generate with the given blueprint.
 
@@ -90,6 +199,46 @@ def parse_blueprint_from_text(blueprint_text):
     return QuizEngine().parse_blueprint_from_text(blueprint_text)
 
 
+def parse_memory_blueprint_from_rows(rows, count):
+    """
+    Build a memory blueprint from table rows, e.g. of an uploaded CSV or TSV
+    deck, without going through the blueprint text.
+
+    Each row is `<key>,<value>[,on|off][,<weight>]`, with the same meaning
+    as the options of a 'memory' block. The rows are consumed lazily, so a
+    CSV reader over a file stream is never held in memory as a whole.
+
+    Parameters
+    ----------
+    rows : iterable of list of str
+        The rows of the deck. Empty rows are skipped.
+    count : int
+        Number of questions per quiz.
+
+    Returns
+    -------
+    list of tuple[dict, str]
+        A blueprint with one 'memory' block, as returned by
+        `parse_blueprint_from_text`.
+
+    Raises
+    ------
+    UserConfigError
+        If a row is invalid, the deck is empty or the count is not positive.
+    """
+    if count < 1:
+        raise UserConfigError(
+            f"Invalid count: {count}"
+        )
+    memory_unit = QUIZ_UNIT_MAPPING["memory"]
+    items = list(memory_unit.transform_rows_to_items(rows))
+    if not items:
+        raise UserConfigError(
+            "The deck does not contain any items"
+        )
+    return [({"items": items, "count": count}, "memory")]
+
+
 def unparse_blueprint_to_text(blueprint):
     """
     Converts parsed blueprint data back to the original raw blueprint text
@@ -109,7 +258,7 @@ def unparse_blueprint_to_text(blueprint):
     return QuizEngine().unparse_blueprint_to_text(blueprint)
 
 
-def generate_quiz(blueprint):
+def generate_quiz(blueprint, workers=None):
     """
     Generate a quiz based on the provided blueprint.
 
@@ -118,6 +267,11 @@ def generate_quiz(blueprint):
     blueprint : list of tuple
         A list of tuples where each tuple is (blueprint_unit : dict, count :
         int).
+    workers : int, optional
+        Number of worker processes. If greater than 1, blocks with large
+        counts are split into chunks generated in a process pool, each with
+        its own random stream. Small blocks are still generated inline. By
+        default, the quiz is generated in the current process.
 
     Returns
     -------
@@ -125,7 +279,30 @@ def generate_quiz(blueprint):
         A list containing generated quiz questions.
     """
     engine = QuizEngine()
-    return engine.generate_quiz(blueprint)
+    return engine.generate_quiz(blueprint, workers)
+
+
+def iter_quiz(blueprint):
+    """
+    Lazily generate a quiz based on the provided blueprint.
+
+    Questions are yielded block by block as they are generated, so memory
+    stays constant regardless of the counts and the first question is
+    available immediately, e.g. for exporters or streaming responses.
+
+    Parameters
+    ----------
+    blueprint : list of tuple
+        A list of tuples where each tuple is (blueprint_unit : dict, count :
+        int).
+
+    Yields
+    ------
+    dict
+        The generated quiz questions, in the same order as `generate_quiz`.
+    """
+    engine = QuizEngine()
+    yield from engine.iter_quiz(blueprint)
 
 
 def compute_quiz_results(quiz, user_answers):
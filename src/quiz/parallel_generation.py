@@ -0,0 +1,104 @@
+"""
+Parallel generation of very large quizzes.
+
+Blueprint blocks with large counts are split into chunks which are generated
+in a process pool. Every chunk is generated with its own RNG stream: the
+worker seeds `random` with a seed drawn in the parent process, so chunks are
+independent of each other and of the worker they run on, and a seeded parent
+process still generates reproducible quizzes.
+
+Blocks below `MIN_CHUNK_COUNT` are generated inline, where the pool overhead
+would dominate. Blocks whose questions are drawn without repetition (see
+`QuizUnitBase.has_distinct_draws`, e.g. `unique` blocks and memory decks)
+are never split, since the draws are only distinct within a single
+generation call.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from quiz.units import QUIZ_UNIT_MAPPING
+
+# Smallest number of questions generated by one pool task
+MIN_CHUNK_COUNT = 5000
+
+
+def _generate_chunk(category, blueprint_unit, seed):
+    random.seed(seed)
+    return QUIZ_UNIT_MAPPING[category].generate_quiz(blueprint_unit)
+
+
+def _split_count(count, workers):
+    chunks = max(1, min(workers, count // MIN_CHUNK_COUNT))
+    size, rest = divmod(count, chunks)
+    return [size + 1] * rest + [size] * (chunks - rest)
+
+
+def generate_quiz_parallel(blueprint, workers):
+    """
+    Generate a quiz with a pool of worker processes.
+
+    Parameters
+    ----------
+    blueprint : list of tuple
+        A list of (blueprint_unit, category) tuples.
+    workers : int
+        Number of worker processes.
+
+    Returns
+    -------
+    list
+        The generated questions, in the order of the blueprint blocks.
+    """
+    tasks = []  # Per block, the chunk counts or None to generate inline
+    for blueprint_unit, category in blueprint:
+        count = blueprint_unit["count"]
+        if count < MIN_CHUNK_COUNT:
+            tasks.append(None)
+        elif QUIZ_UNIT_MAPPING[category].has_distinct_draws(blueprint_unit):
+            tasks.append([count])
+        else:
+            tasks.append(_split_count(count, workers))
+
+    if all(chunks is None for chunks in tasks):
+        return _generate_inline(blueprint)
+
+    quiz = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for (blueprint_unit, category), chunks in zip(blueprint, tasks):
+            if chunks is None:
+                futures.append(None)
+                continue
+            futures.append(
+                [
+                    executor.submit(
+                        _generate_chunk,
+                        category,
+                        {**blueprint_unit, "count": count},
+                        random.getrandbits(128),
+                    )
+                    for count in chunks
+                ]
+            )
+
+        # Small blocks are generated while the pool works on the large ones
+        inline_quizzes = {
+            i: _generate_inline([blueprint[i]])
+            for i, block_futures in enumerate(futures)
+            if block_futures is None
+        }
+        for i, block_futures in enumerate(futures):
+            if block_futures is None:
+                quiz.extend(inline_quizzes[i])
+            else:
+                for future in block_futures:
+                    quiz.extend(future.result())
+    return quiz
+
+
+def _generate_inline(blueprint):
+    quiz = []
+    for blueprint_unit, category in blueprint:
+        quiz.extend(QUIZ_UNIT_MAPPING[category].generate_quiz(blueprint_unit))
+    return quiz
@@ -12,7 +12,7 @@ class QuizEngine:
     `QuizUnitBase`), and computes final quiz results.
 
     The engine is designed to work with a pluggable set of unit types defined
-    in `QUIZ_UNIT_MAPPING`.
+    in `QUIZ_UNIT_MAPPING`, which imports every unit on its first lookup.
     """
 
     def __init__(self):
@@ -78,16 +78,16 @@ class QuizEngine:
             i += 1
 
             # Parse the block body
-            block_text = ""
+            block_lines = []
             while i < len(lines) and (
                 lines[i].startswith(" ") or not lines[i]
             ):
                 if not lines[i].strip():
                     i += 1
                     continue
-                block_text += lines[i].rstrip() + "\n"
+                block_lines.append(lines[i].rstrip())
                 i += 1
-            options = self._parse_options(block_text)
+            options = self._parse_options("\n".join(block_lines))
             blueprint_unit = quiz_unit.transform_options_to_blueprint_unit(
                 options
             )
@@ -111,20 +111,28 @@ class QuizEngine:
             text += "\n\n"
         return text.strip()
 
-    def generate_quiz(self, blueprint):
+    def generate_quiz(self, blueprint, workers=None):
+        if workers is not None and workers > 1:
+            # Only offline generation of very large quizzes needs a pool
+            from quiz.parallel_generation import generate_quiz_parallel
+
+            return generate_quiz_parallel(blueprint, workers)
         quiz = []
         for blueprint_unit, category in blueprint:
             q_unit = self._get_quiz_unit(category)
             quiz.extend(q_unit.generate_quiz(blueprint_unit))
         return quiz
 
+    def iter_quiz(self, blueprint):
+        for blueprint_unit, category in blueprint:
+            q_unit = self._get_quiz_unit(category)
+            yield from q_unit.iter_questions(blueprint_unit)
+
     def _focus_on_category(self, category):
         self._active_unit = self._get_quiz_unit(category)
 
-    def _compare_answers(self, answer_a, answer_b):
-        if not answer_a or not answer_b:
-            return False
-        return self._active_unit.compare_answers(answer_a, answer_b)
+    def _derive_grading_key(self, correct_answer):
+        return self._active_unit.derive_grading_key(correct_answer)
 
     def _parse_user_answer(self, user_answer):
         try:
@@ -139,26 +147,61 @@ class QuizEngine:
     def _prettify_answer(self, answer):
         return self._active_unit.prettify_answer(answer)
 
+    def _grade_answers(
+        self, category, user_answers, correct_answers, grading_keys
+    ):
+        self._focus_on_category(category)
+        return self._active_unit.grade_answers(
+            user_answers, correct_answers, grading_keys
+        )
+
     def compute_quiz_results(self, quiz, user_answers):
-        quiz = [(q["question"], q["answer"], q["category"]) for q in quiz]
-        results = []
+        parsed_answers = []
+        # Answered questions per category, graded together
+        pending = {}
         for quiz_elem, user_answer in zip(quiz, user_answers):
-            question, correct_answer, category = quiz_elem
+            category = quiz_elem["category"]
             self._focus_on_category(category)
             user_answer = self._parse_user_answer(user_answer)
-            correct = self._compare_answers(
-                user_answer,
-                correct_answer,
+            parsed_answers.append(user_answer)
+            correct_answer = quiz_elem["answer"]
+            if not user_answer or not correct_answer:
+                continue
+            # Quizzes generated without a key (e.g. retries built from
+            # results) derive it here
+            if "grading_key" in quiz_elem:
+                grading_key = quiz_elem["grading_key"]
+            else:
+                grading_key = self._derive_grading_key(correct_answer)
+            indices, answers, correct_answers, keys = pending.setdefault(
+                category, ([], [], [], [])
             )
-            user_answer = self._prettify_answer(user_answer)
-            correct_answer = self._prettify_answer(correct_answer)
+            indices.append(len(parsed_answers) - 1)
+            answers.append(user_answer)
+            correct_answers.append(correct_answer)
+            keys.append(grading_key)
+
+        correct = [False] * len(parsed_answers)
+        for category, (indices, *graded) in pending.items():
+            grades = self._grade_answers(category, *graded)
+            for i, grade in zip(indices, grades):
+                correct[i] = grade
+
+        results = []
+        for quiz_elem, user_answer, is_correct in zip(
+            quiz, parsed_answers, correct
+        ):
+            self._focus_on_category(quiz_elem["category"])
+            if user_answer:
+                user_answer = self._prettify_answer(user_answer)
+            correct_answer = self._prettify_answer(quiz_elem["answer"])
             results.append(
                 {
-                    "question": question,
-                    "category": category,
+                    "question": quiz_elem["question"],
+                    "category": quiz_elem["category"],
                     "correct_answer": correct_answer,
                     "user_answer": user_answer or "Not answered",
-                    "is_correct": correct,
+                    "is_correct": is_correct,
                 }
             )
         return results
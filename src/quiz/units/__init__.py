@@ -1,10 +1,16 @@
-from quiz.units.date_quiz_unit import DateQuizUnit
-from quiz.units.math_quiz_unit import MathQuizUnit
-from quiz.units.memory_quiz_unit import MemoryQuizUnit
+from quiz.units.registry import ENTRY_POINT_GROUP, QuizUnitRegistry
 
-QUIZ_UNIT_MAPPING = {
-    "date": DateQuizUnit,
-    "math": MathQuizUnit,
-    "memory": MemoryQuizUnit,
+# Units are imported on first use, see `quiz.units.registry`
+QUIZ_UNIT_PATHS = {
+    "convert": "quiz.units.convert_quiz_unit:ConvertQuizUnit",
+    "date": "quiz.units.date_quiz_unit:DateQuizUnit",
+    "datediff": "quiz.units.datediff_quiz_unit:DateDiffQuizUnit",
+    "factor": "quiz.units.factor_quiz_unit:FactorQuizUnit",
+    "fraction": "quiz.units.fraction_quiz_unit:FractionQuizUnit",
+    "math": "quiz.units.math_quiz_unit:MathQuizUnit",
+    "memory": "quiz.units.memory_quiz_unit:MemoryQuizUnit",
+    "tables": "quiz.units.tables_quiz_unit:TablesQuizUnit",
     # TODO: Add more quiz units as needed
 }
+
+QUIZ_UNIT_MAPPING = QuizUnitRegistry(QUIZ_UNIT_PATHS, ENTRY_POINT_GROUP)
@@ -0,0 +1,65 @@
+"""
+Vectorized batch generation for the unit conversion quiz unit.
+
+Large quizzes draw the conversion and the value of all questions at once as
+integer arrays, gather the factors and shifts of the conversions from the
+conversion matrix by index and convert all values with one array operation.
+The questions and answers are the same as with per-question generation.
+"""
+
+import random
+
+import numpy as np
+
+from quiz.units.convert_quiz_unit import (
+    CONVERSION_MATRIX,
+    _format_value,
+    _prettify_question,
+)
+
+
+def generate_batch(conversions, precision, count):
+    """
+    Generate `count` conversion questions at once.
+
+    Parameters
+    ----------
+    conversions : list of dict
+        The conversions of the blueprint unit, each with the keys `from`,
+        `to`, `start` and `end`.
+    precision : int
+        Number of decimals of the answers.
+    count : int
+        Number of questions to generate.
+
+    Returns
+    -------
+    list of tuple[str, str]
+        The prettified questions and their answers.
+    """
+    rng = np.random.default_rng(random.getrandbits(128))
+    factors, shifts = np.array(
+        [
+            CONVERSION_MATRIX[(conversion["from"], conversion["to"])]
+            for conversion in conversions
+        ]
+    ).T
+    starts = np.array([conversion["start"] for conversion in conversions])
+    ends = np.array([conversion["end"] for conversion in conversions])
+
+    choices = rng.integers(0, len(conversions), size=count)
+    values = rng.integers(starts[choices], ends[choices], endpoint=True)
+    results = values * factors[choices] + shifts[choices]
+
+    questions = []
+    for choice, value, result in zip(
+        choices.tolist(), values.tolist(), results.tolist()
+    ):
+        conversion = conversions[choice]
+        questions.append(
+            (
+                _prettify_question(value, conversion["from"], conversion["to"]),
+                _format_value(result, precision),
+            )
+        )
+    return questions
@@ -0,0 +1,277 @@
+import functools
+import random
+
+from quiz.units.exceptions import UserConfigError
+from quiz.units.math_quiz_unit import MathQuizUnit, _derive_tolerance
+from quiz.units.math_tables import CONSTANT_TABLE
+from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.shared import MappingError, map_args_to_option
+
+DEFAULT_START = 0
+DEFAULT_END = 100
+DEFAULT_PRECISION = 2
+
+# Values are bounded, so that large quizzes can draw them as int64 arrays
+MAX_ABS_VALUE = 10**12
+
+# Answers within this fraction of the correct answer are accepted, on top of
+# the precision of the answers
+RELATIVE_TOLERANCE = 0.005
+
+# Units as (dimension, scale, offset), such that a value in the unit is
+# `value * scale + offset` in the base unit of its dimension (meter,
+# kilogram, kelvin)
+UNITS = {
+    "km": ("length", 1000.0, 0.0),
+    "mi": ("length", 1609.344, 0.0),
+    "kg": ("mass", 1.0, 0.0),
+    "lb": ("mass", 0.45359237, 0.0),
+    "K": ("temperature", 1.0, 0.0),
+    "C": ("temperature", 1.0, CONSTANT_TABLE["zero_Celsius"]),
+    "F": ("temperature", 5 / 9, CONSTANT_TABLE["zero_Celsius"] - 160 / 9),
+}
+
+UNIT_LABELS = {
+    "km": "km",
+    "mi": "mi",
+    "kg": "kg",
+    "lb": "lb",
+    "K": "K",
+    "C": "°C",
+    "F": "°F",
+}
+
+# Conversions asked without a conversion option
+DEFAULT_CONVERSIONS = (
+    ("km", "mi"),
+    ("mi", "km"),
+    ("C", "F"),
+    ("F", "C"),
+    ("kg", "lb"),
+    ("lb", "kg"),
+)
+
+
+def _build_conversion_matrix(units):
+    """
+    Precompute the (factor, shift) of every conversion within a dimension,
+    such that `value * factor + shift` converts a value.
+    """
+    matrix = {}
+    for source, (dimension, scale, offset) in units.items():
+        for target, (target_dimension, target_scale, target_offset) in (
+            units.items()
+        ):
+            if source == target or dimension != target_dimension:
+                continue
+            matrix[(source, target)] = (
+                scale / target_scale,
+                (offset - target_offset) / target_scale,
+            )
+    return matrix
+
+
+CONVERSION_MATRIX = _build_conversion_matrix(UNITS)
+
+
+def _format_value(value, precision):
+    """
+    Format a converted value with `precision` decimals.
+    """
+    text = f"{value:.{precision}f}"
+    # Avoid answers like '-0.00'
+    if text.startswith("-") and not text.strip("-0."):
+        return text[1:]
+    return text
+
+
+def _prettify_question(value, source, target):
+    return f"{value} {UNIT_LABELS[source]} in {UNIT_LABELS[target]}"
+
+
+class ConvertQuizUnit(QuizUnitBase):
+    """
+    Quiz unit for generating unit conversion quizzes, e.g. kilometers to
+    miles, degrees Celsius to Fahrenheit or kilograms to pounds.
+    """
+
+    @classmethod
+    def _parse_conversion(cls, source, args):
+        """
+        Parse a conversion option `<from> <to> [[<start>] <end>]`.
+        """
+        if not args:
+            raise MappingError("Expected a target unit")
+        target, *range_args = args
+        if (source, target) not in CONVERSION_MATRIX:
+            raise MappingError(
+                f"Cannot convert '{source}' to '{target}'"
+            )
+        conversion = {"from": source, "to": target}
+        if len(range_args) == 1:
+            range_args = [str(DEFAULT_START)] + range_args
+        map_args_to_option(
+            conversion, range_args, [("start", int), ("end", int)]
+        )
+        conversion.setdefault("start", DEFAULT_START)
+        conversion.setdefault("end", DEFAULT_END)
+        if conversion["start"] > conversion["end"]:
+            raise MappingError("Start > end.")
+        if max(-conversion["start"], conversion["end"]) > MAX_ABS_VALUE:
+            raise MappingError(
+                f"Values must be between -{MAX_ABS_VALUE} and "
+                f"{MAX_ABS_VALUE}."
+            )
+        return conversion
+
+    @classmethod
+    def transform_options_to_blueprint_unit(cls, options):
+        """
+        Convert options to a blueprint unit for the conversion quiz.
+        """
+        unit_bp = {}
+        conversions = []
+        try:
+            for opt in options:
+                key = opt.pop("key")
+                args = opt.pop("args")
+                if key == "precision" and "precision" not in unit_bp:
+                    map_args_to_option(opt, args, [("precision", int)], 1)
+                    if not 0 <= opt["precision"] <= 10:
+                        raise MappingError(
+                            "Precision must be between 0 and 10."
+                        )
+                elif key == "precision":
+                    raise MappingError(
+                        f"Option '{key}' defined multiple times."
+                    )
+                elif key in UNITS:
+                    conversion = cls._parse_conversion(key, args)
+                    if any(
+                        (c["from"], c["to"]) == (key, conversion["to"])
+                        for c in conversions
+                    ):
+                        raise MappingError(
+                            f"Conversion '{key} {conversion['to']}' defined "
+                            "multiple times."
+                        )
+                    conversions.append(conversion)
+                else:
+                    raise UserConfigError(
+                        f"Unknown option key: {key}"
+                    )
+                unit_bp.update(opt)
+        except MappingError as e:
+            raise UserConfigError(
+                f"Invalid option {key}: {e}"
+            ) from e
+        unit_bp.setdefault("precision", DEFAULT_PRECISION)
+        # Without a conversion option, the default conversions are asked
+        unit_bp["conversions"] = conversions or [
+            {
+                "from": source,
+                "to": target,
+                "start": DEFAULT_START,
+                "end": DEFAULT_END,
+            }
+            for source, target in DEFAULT_CONVERSIONS
+        ]
+        return unit_bp
+
+    @classmethod
+    def transform_blueprint_unit_to_options(cls, blueprint_unit):
+        """
+        Convert a blueprint unit back to options for the conversion quiz.
+        """
+        options = []
+        for conversion in blueprint_unit["conversions"]:
+            options.append(
+                {
+                    "key": conversion["from"],
+                    "args": [
+                        conversion["to"],
+                        str(conversion["start"]),
+                        str(conversion["end"]),
+                    ],
+                }
+            )
+        options.append(
+            {"key": "precision", "args": [str(blueprint_unit["precision"])]}
+        )
+        return options
+
+    @classmethod
+    def _generate_questions(cls, blueprint_unit, count):
+        conversions = blueprint_unit["conversions"]
+        precision = blueprint_unit["precision"]
+        convert_batch = cls._vectorized_module("convert_batch", count)
+        if convert_batch is not None:
+            return convert_batch.generate_batch(conversions, precision, count)
+
+        questions = []
+        for conversion in random.choices(conversions, k=count):
+            source, target = conversion["from"], conversion["to"]
+            factor, shift = CONVERSION_MATRIX[(source, target)]
+            value = random.randint(conversion["start"], conversion["end"])
+            questions.append(
+                (
+                    _prettify_question(value, source, target),
+                    _format_value(value * factor + shift, precision),
+                )
+            )
+        return questions
+
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        questions = cls._iter_chunks(
+            functools.partial(cls._generate_questions, blueprint_unit),
+            blueprint_unit["count"],
+        )
+        for question, answer in questions:
+            yield {
+                "question": question,
+                "answer": answer,
+                "category": "convert",
+                "grading_key": cls.derive_grading_key(answer),
+            }
+
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
+
+    @classmethod
+    def parse_user_answer(cls, user_answer):
+        return MathQuizUnit.parse_user_answer(user_answer.strip())
+
+    @classmethod
+    def derive_grading_key(cls, correct_answer):
+        """
+        Precompute the half tolerance of the math unit, widened to the
+        relative tolerance of conversions.
+        """
+        return max(
+            _derive_tolerance(correct_answer) / 2,
+            RELATIVE_TOLERANCE * abs(float(correct_answer)),
+        )
+
+    @classmethod
+    def compare_answer_to_key(cls, user_answer, correct_answer, grading_key):
+        return MathQuizUnit.compare_answer_to_key(
+            user_answer, correct_answer, grading_key
+        )
+
+    @classmethod
+    def grade_answers(cls, user_answers, correct_answers, grading_keys):
+        return MathQuizUnit.grade_answers(
+            user_answers, correct_answers, grading_keys
+        )
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        return cls.compare_answer_to_key(
+            user_answer, correct_answer, cls.derive_grading_key(correct_answer)
+        )
+
+    @classmethod
+    def prettify_answer(cls, answer):
+        return MathQuizUnit.prettify_answer(answer)
@@ -0,0 +1,78 @@
+"""
+Vectorized batch generation for the date quiz unit.
+
+Large quizzes draw all day offsets of a year range at once as one integer
+array, convert them to `numpy.datetime64` days and derive the weekdays with
+modular arithmetic instead of question by question. The questions and
+answers are the same as with per-question generation.
+"""
+
+import datetime
+import random
+
+import numpy as np
+
+from quiz.units.date_quiz_unit import (
+    MONTH_NAMES,
+    WEEKDAY_NAMES,
+    _ordinal_range,
+)
+
+# datetime64 days count from 1970-01-01, which was a Thursday
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_EPOCH_WEEKDAY = 3
+
+
+def ordinals_to_days(ordinals):
+    """
+    Convert an array of date ordinals to datetime64 days.
+    """
+    return (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def prettify_days(days):
+    """
+    Format datetime64 days like `DateQuizUnit._prettify_question`.
+    """
+    year_starts = days.astype("datetime64[Y]")
+    month_starts = days.astype("datetime64[M]")
+    years = year_starts.astype(np.int64) + 1970
+    months = month_starts - year_starts.astype("datetime64[M]")
+    month_days = days - month_starts.astype("datetime64[D]") + 1
+    return [
+        f"{MONTH_NAMES[month]} {day:02d}, {year:04d}"
+        for year, month, day in zip(
+            years.tolist(),
+            months.astype(np.int64).tolist(),
+            month_days.astype(np.int64).tolist(),
+        )
+    ]
+
+
+def generate_batch(start_year, end_year, count):
+    """
+    Generate `count` date questions between start_year and end_year at once.
+
+    Parameters
+    ----------
+    start_year : int
+        First year of the date range.
+    end_year : int
+        Last year of the date range.
+    count : int
+        Number of questions to generate.
+
+    Returns
+    -------
+    list of tuple[str, str]
+        The prettified questions and their weekday answers.
+    """
+    rng = np.random.default_rng(random.getrandbits(128))
+    first, last = _ordinal_range(start_year, end_year)
+    ordinals = rng.integers(first, last, size=count, endpoint=True)
+    days = ordinals_to_days(ordinals)
+
+    weekdays = (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+    questions = prettify_days(days)
+    answers = [WEEKDAY_NAMES[weekday] for weekday in weekdays.tolist()]
+    return list(zip(questions, answers))
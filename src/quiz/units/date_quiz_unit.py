@@ -1,81 +1,116 @@
 import calendar
+import datetime
+import functools
 import random
 
 from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.permutation import unique_indices
 from quiz.units.quiz_unit_base import QuizUnitBase
 from quiz.units.shared import MappingError, map_args_to_option
 
 DEFAULT_START_YEAR = 1900
 DEFAULT_END_YEAR = 2050
 
+# Range of the years datetime.date supports
+MIN_YEAR = datetime.MINYEAR
+MAX_YEAR = datetime.MAXYEAR
+
+MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+WEEKDAY_NAMES = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def _build_weekday_prefix_index(weekday_names):
+    """
+    Map every prefix of at least two characters of the weekday names to its
+    weekday. Prefixes shared by several weekdays map to None.
+    """
+    index = {}
+    for name in weekday_names:
+        for end in range(2, len(name) + 1):
+            prefix = name[:end]
+            index[prefix] = name if index.get(prefix, name) == name else None
+    return index
+
+
+WEEKDAY_PREFIX_INDEX = _build_weekday_prefix_index(WEEKDAY_NAMES)
+
 
 def _standardize_weekday_string(weekday):
     """
-    Sanitize the weekday string to ensure it is in lowercase and stripped of
-    whitespace.
+    Resolve a weekday string or abbreviation to the lowercase weekday name.
     """
     weekday = weekday.lower().strip()
     assert (
         len(weekday) > 1
     ), "Weekday string must be at least 2 characters long"
-    for sanitized_weekday in [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]:
-        if weekday in sanitized_weekday:
-            break
-    else:
+    if weekday not in WEEKDAY_PREFIX_INDEX:
         raise ValueError(
             f"Invalid weekday string: {weekday}."
         )
+    sanitized_weekday = WEEKDAY_PREFIX_INDEX[weekday]
+    if sanitized_weekday is None:
+        raise ValueError(
+            f"Ambiguous weekday string: {weekday}."
+        )
     return sanitized_weekday
 
 
+@functools.lru_cache(maxsize=None)
+def _ordinal_range(start_year, end_year):
+    """
+    Return the ordinals of the first day of start_year and the last day of
+    end_year.
+    """
+    first = datetime.date(start_year, 1, 1).toordinal()
+    last = datetime.date(end_year, 12, 31).toordinal()
+    return first, last
+
+
 def _random_date(start_year, end_year):
     """
     Generate a random date string (YYYY-MM-DD) between start_year and end_year.
     """
-    total_days = 0
-    year_day_ranges = []
-
-    # Build year-to-day range mapping
-    for current_year in range(start_year, end_year + 1):
-        start_day_index = total_days
-        days_in_year = 366 if calendar.isleap(current_year) else 365
-        total_days += days_in_year
-        end_day_index = total_days
-        year_day_ranges.append(
-            {
-                "year": current_year,
-                "start": start_day_index,
-                "end": end_day_index,
-            }
-        )
+    first, last = _ordinal_range(start_year, end_year)
+    return datetime.date.fromordinal(random.randint(first, last)).isoformat()
 
-    # Choose a random day index within total span
-    random_day_index = random.randint(0, total_days - 1)
 
-    # Determine the corresponding year
-    for entry in year_day_ranges:
-        if entry["start"] <= random_day_index < entry["end"]:
-            year = entry["year"]
-            day_of_year = random_day_index - entry["start"]
-            break
+def _count_days(start_year, end_year):
+    """
+    Count the days from the start of start_year to the end of end_year.
+    """
+    first, last = _ordinal_range(start_year, end_year)
+    return last - first + 1
 
-    # Determine the corresponding month and day
-    for month in range(1, 13):
-        days_in_month = calendar.monthrange(year, month)[1]
-        if day_of_year < days_in_month:
-            day = day_of_year + 1  # adjust since days start at 1
-            break
-        day_of_year -= days_in_month
 
-    return f"{year}-{month:02d}-{day:02d}"
+def _date_from_day_index(start_year, end_year, day_index):
+    """
+    Return the date string (YYYY-MM-DD) of the day_index-th day of the range
+    from start_year to end_year.
+    """
+    first, _ = _ordinal_range(start_year, end_year)
+    return datetime.date.fromordinal(first + day_index).isoformat()
 
 
 def _derive_weekday(date_str):
@@ -83,8 +118,7 @@ def _derive_weekday(date_str):
     Derive the weekday from a date string (YYYY-MM-DD).
     """
     year, month, day = map(int, date_str.split("-"))
-    weekday_index = calendar.weekday(year, month, day)
-    return calendar.day_name[weekday_index].lower()
+    return WEEKDAY_NAMES[calendar.weekday(year, month, day)]
 
 
 class DateQuizUnit(QuizUnitBase):
@@ -111,6 +145,9 @@ class DateQuizUnit(QuizUnitBase):
                     raise MappingError(
                         f"Option '{key}' defined multiple times."
                     )
+                elif key == "unique":
+                    map_args_to_option(opt, args, [])
+                    opt["unique"] = True
                 else:
                     raise UserConfigError(
                         f"Unknown option key: {key}"
@@ -126,6 +163,10 @@ class DateQuizUnit(QuizUnitBase):
             raise UserConfigError(
                 "Start year > end year."
             )
+        if unit_bp["start_year"] < MIN_YEAR or unit_bp["end_year"] > MAX_YEAR:
+            raise UserConfigError(
+                f"Years must be between {MIN_YEAR} and {MAX_YEAR}."
+            )
         return unit_bp
 
     @classmethod
@@ -140,6 +181,8 @@ class DateQuizUnit(QuizUnitBase):
         options.append(
             {"key": "end", "args": [str(blueprint_unit["end_year"])]}
         )
+        if blueprint_unit.get("unique"):
+            options.append({"key": "unique", "args": []})
         return options
 
     @classmethod
@@ -155,38 +198,59 @@ class DateQuizUnit(QuizUnitBase):
     @classmethod
     def _prettify_question(cls, date_str):
         year, month, day = date_str.split("-")
-        month_names = [
-            "January",
-            "February",
-            "March",
-            "April",
-            "May",
-            "June",
-            "July",
-            "August",
-            "September",
-            "October",
-            "November",
-            "December",
-        ]
-        month = month_names[int(month) - 1]
+        month = MONTH_NAMES[int(month) - 1]
         return f"{month} {day}, {year}"
 
     @classmethod
-    def generate_quiz(cls, blueprint_unit):
-        count = blueprint_unit["count"]
-        quiz = []
+    def _generate_questions(cls, blueprint_unit, count):
+        start_year = blueprint_unit["start_year"]
+        end_year = blueprint_unit["end_year"]
+        date_batch = cls._vectorized_module("date_batch", count)
+        if date_batch is not None:
+            return date_batch.generate_batch(start_year, end_year, count)
 
+        questions = []
         for _ in range(count):
             date = cls._generate_question(blueprint_unit)
+            questions.append(
+                (cls._prettify_question(date), cls._envaluate_question(date))
+            )
+        return questions
+
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        count = blueprint_unit["count"]
+
+        if blueprint_unit.get("unique"):
+            start_year = blueprint_unit["start_year"]
+            end_year = blueprint_unit["end_year"]
+            size = _count_days(start_year, end_year)
+            dates = (
+                _date_from_day_index(start_year, end_year, index)
+                for index in unique_indices(size, count)
+            )
+        else:
+            questions = cls._iter_chunks(
+                functools.partial(cls._generate_questions, blueprint_unit),
+                count,
+            )
+            for question, answer in questions:
+                yield {
+                    "question": question,
+                    "answer": answer,
+                    "category": "date",
+                }
+            return
+
+        for date in dates:
             answer = cls._envaluate_question(date)
             question = cls._prettify_question(date)
 
-            quiz.append(
-                {"question": question, "answer": answer, "category": "date"}
-            )
+            yield {"question": question, "answer": answer, "category": "date"}
 
-        return quiz
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
 
     @classmethod
     def compare_answers(cls, user_answer, correct_answer):
@@ -0,0 +1,64 @@
+"""
+Vectorized batch generation for the date difference quiz unit.
+
+Large quizzes draw the ordinals of all date pairs at once as one integer
+array and compute the differences and the answer dates with array
+arithmetic. The questions and answers are the same as with per-question
+generation.
+"""
+
+import random
+
+import numpy as np
+
+from quiz.units.date_batch import ordinals_to_days, prettify_days
+from quiz.units.date_quiz_unit import _ordinal_range
+from quiz.units.datediff_quiz_unit import QUESTION_TEMPLATES
+
+
+def generate_batch(start_year, end_year, kinds, count):
+    """
+    Generate `count` date difference questions at once.
+
+    Parameters
+    ----------
+    start_year : int
+        First year of the date range.
+    end_year : int
+        Last year of the date range.
+    kinds : list of str
+        Kinds of questions to draw from, see `QUESTION_KINDS`.
+    count : int
+        Number of questions to generate.
+
+    Returns
+    -------
+    list of tuple[str, str]
+        The prettified questions and their answers.
+    """
+    rng = np.random.default_rng(random.getrandbits(128))
+    first, last = _ordinal_range(start_year, end_year)
+    pairs = rng.integers(first, last, size=(count, 2), endpoint=True)
+    pairs.sort(axis=1)
+    kind_choices = rng.integers(0, len(kinds), size=count).tolist()
+
+    start_days = ordinals_to_days(pairs[:, 0])
+    end_days = ordinals_to_days(pairs[:, 1])
+    starts = prettify_days(start_days)
+    ends = prettify_days(end_days)
+    differences = (pairs[:, 1] - pairs[:, 0]).tolist()
+    end_dates = np.datetime_as_string(end_days).tolist()
+
+    questions = []
+    for i, choice in enumerate(kind_choices):
+        kind = kinds[choice]
+        if kind == "between":
+            question = QUESTION_TEMPLATES[kind].format(starts[i], ends[i])
+            answer = str(differences[i])
+        else:
+            question = QUESTION_TEMPLATES[kind].format(
+                starts[i], differences[i]
+            )
+            answer = end_dates[i]
+        questions.append((question, answer))
+    return questions
@@ -0,0 +1,209 @@
+import datetime
+import functools
+import random
+
+from quiz.units.date_quiz_unit import (
+    DEFAULT_END_YEAR,
+    DEFAULT_START_YEAR,
+    MAX_YEAR,
+    MIN_YEAR,
+    MONTH_NAMES,
+    _ordinal_range,
+)
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.shared import (
+    MappingError,
+    add_kind_option,
+    kinds_to_options,
+    map_args_to_option,
+    resolve_kinds,
+)
+
+# Kinds of questions, in the order of the options
+QUESTION_KINDS = ("between", "after")
+
+QUESTION_TEMPLATES = {
+    "between": "How many days are between {} and {}?",
+    "after": "What date is {1} days after {0}?",
+}
+
+# Formats accepted for date answers, the prettified one included
+DATE_ANSWER_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%B %d %Y")
+
+
+def _prettify_ordinal(ordinal):
+    """
+    Format a date ordinal like the questions of the date quiz.
+    """
+    date = datetime.date.fromordinal(ordinal)
+    return f"{MONTH_NAMES[date.month - 1]} {date.day:02d}, {date.year:04d}"
+
+
+def _parse_date_answer(answer):
+    """
+    Parse a date answer to its ISO format (YYYY-MM-DD).
+    """
+    for date_format in DATE_ANSWER_FORMATS:
+        try:
+            date = datetime.datetime.strptime(answer, date_format)
+        except ValueError:
+            continue
+        return date.date().isoformat()
+    raise ValueError(
+        f"Invalid answer: {answer}. Expected a number of days or a date "
+        "(YYYY-MM-DD)."
+    )
+
+
+class DateDiffQuizUnit(QuizUnitBase):
+    """
+    Quiz unit for generating date difference quizzes, asking for the number
+    of days between two random dates or for the date a number of days after a
+    random date.
+    """
+
+    @classmethod
+    def transform_options_to_blueprint_unit(cls, options):
+        """
+        Convert options to a blueprint unit for the date difference quiz.
+        """
+        unit_bp = {}
+        kinds = set()
+        try:
+            for opt in options:
+                key = opt.pop("key")
+                args = opt.pop("args")
+                if key == "start" and "start_year" not in unit_bp:
+                    map_args_to_option(opt, args, [("start_year", int)], 1)
+                elif key == "end" and "end_year" not in unit_bp:
+                    map_args_to_option(opt, args, [("end_year", int)], 1)
+                elif key in ["start", "end"]:
+                    raise MappingError(
+                        f"Option '{key}' defined multiple times."
+                    )
+                elif key in QUESTION_KINDS:
+                    add_kind_option(kinds, key, args)
+                else:
+                    raise UserConfigError(
+                        f"Unknown option key: {key}"
+                    )
+                unit_bp.update(opt)
+        except MappingError as e:
+            raise UserConfigError(
+                f"Invalid option {key}: {e}"
+            ) from e
+        unit_bp.setdefault("start_year", DEFAULT_START_YEAR)
+        unit_bp.setdefault("end_year", DEFAULT_END_YEAR)
+        if unit_bp["start_year"] > unit_bp["end_year"]:
+            raise UserConfigError(
+                "Start year > end year."
+            )
+        if unit_bp["start_year"] < MIN_YEAR or unit_bp["end_year"] > MAX_YEAR:
+            raise UserConfigError(
+                f"Years must be between {MIN_YEAR} and {MAX_YEAR}."
+            )
+        unit_bp["kinds"] = resolve_kinds(kinds, QUESTION_KINDS)
+        return unit_bp
+
+    @classmethod
+    def transform_blueprint_unit_to_options(cls, blueprint_unit):
+        """
+        Convert a blueprint unit back to options for the date difference
+        quiz.
+        """
+        options = []
+        options.append(
+            {"key": "start", "args": [str(blueprint_unit["start_year"])]}
+        )
+        options.append(
+            {"key": "end", "args": [str(blueprint_unit["end_year"])]}
+        )
+        options += kinds_to_options(blueprint_unit["kinds"], QUESTION_KINDS)
+        return options
+
+    @classmethod
+    def _generate_question(cls, blueprint_unit):
+        first, last = _ordinal_range(
+            blueprint_unit["start_year"], blueprint_unit["end_year"]
+        )
+        start = random.randint(first, last)
+        end = random.randint(first, last)
+        kind = random.choice(blueprint_unit["kinds"])
+        return kind, min(start, end), max(start, end)
+
+    @classmethod
+    def _envaluate_question(cls, kind, start, end):
+        if kind == "between":
+            return str(end - start)
+        return datetime.date.fromordinal(end).isoformat()
+
+    @classmethod
+    def _prettify_question(cls, kind, start, end):
+        if kind == "between":
+            args = (_prettify_ordinal(start), _prettify_ordinal(end))
+        else:
+            args = (_prettify_ordinal(start), end - start)
+        return QUESTION_TEMPLATES[kind].format(*args)
+
+    @classmethod
+    def _generate_questions(cls, blueprint_unit, count):
+        datediff_batch = cls._vectorized_module("datediff_batch", count)
+        if datediff_batch is not None:
+            return datediff_batch.generate_batch(
+                blueprint_unit["start_year"],
+                blueprint_unit["end_year"],
+                blueprint_unit["kinds"],
+                count,
+            )
+
+        questions = []
+        for _ in range(count):
+            question = cls._generate_question(blueprint_unit)
+            questions.append(
+                (
+                    cls._prettify_question(*question),
+                    cls._envaluate_question(*question),
+                )
+            )
+        return questions
+
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        questions = cls._iter_chunks(
+            functools.partial(cls._generate_questions, blueprint_unit),
+            blueprint_unit["count"],
+        )
+        for question, answer in questions:
+            yield {
+                "question": question,
+                "answer": answer,
+                "category": "datediff",
+            }
+
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
+
+    @classmethod
+    def parse_user_answer(cls, user_answer):
+        user_answer = user_answer.strip()
+        try:
+            return str(int(user_answer))
+        except ValueError:
+            pass
+        try:
+            return _parse_date_answer(user_answer)
+        except ValueError as e:
+            raise UserResponseError(str(e)) from e
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        return user_answer == correct_answer
+
+    @classmethod
+    def prettify_answer(cls, answer):
+        if "-" in answer[1:]:
+            ordinal = datetime.date.fromisoformat(answer).toordinal()
+            return _prettify_ordinal(ordinal)
+        return answer
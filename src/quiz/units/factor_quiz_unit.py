@@ -0,0 +1,240 @@
+import math
+import random
+import re
+from array import array
+
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.shared import (
+    MappingError,
+    add_kind_option,
+    kinds_to_options,
+    map_args_to_option,
+    resolve_kinds,
+)
+
+DEFAULT_START = 2
+DEFAULT_END = 100
+
+# The sieve holds one 4 byte entry per number up to the largest bound
+MAX_END = 10**7
+
+# Kinds of questions, in the order of the options
+QUESTION_KINDS = ("factorize", "prime", "gcd", "lcm")
+
+YES_ANSWERS = {"yes", "y", "true"}
+NO_ANSWERS = {"no", "n", "false"}
+
+FACTOR_SEPARATOR_PATTERN = re.compile(r"\s*[*x×·,]\s*|\s+")
+
+# Smallest prime factor of every number below len(_smallest_factors), grown
+# on demand and shared by all quizzes of the process
+_smallest_factors = array("I", [0, 1])
+
+
+def _sieve_smallest_factors(bound):
+    """
+    Return the smallest prime factors of all numbers up to at least bound.
+    """
+    global _smallest_factors
+    if bound < len(_smallest_factors):
+        return _smallest_factors
+
+    # Grow geometrically, so that increasing bounds sieve only a few times,
+    # but never beyond the largest allowed bound
+    size = max(bound + 1, min(2 * len(_smallest_factors), MAX_END + 1))
+    is_prime = bytearray([1]) * size
+    is_prime[:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(size - 1) + 1):
+        if is_prime[p]:
+            is_prime[p * p :: p] = bytes(len(range(p * p, size, p)))
+
+    factors = array("I", range(size))
+    # Larger primes first, so that the smallest prime is written last
+    for p in reversed(range(2, math.isqrt(size - 1) + 1)):
+        if is_prime[p]:
+            multiples = range(p * p, size, p)
+            factors[p * p :: p] = array("I", [p]) * len(multiples)
+    _smallest_factors = factors
+    return factors
+
+
+def _prime_factors(n):
+    """
+    Return the prime factors of n in ascending order, with multiplicity.
+    """
+    smallest_factors = _sieve_smallest_factors(n)
+    factors = []
+    while n > 1:
+        factor = smallest_factors[n]
+        factors.append(factor)
+        n //= factor
+    return factors
+
+
+def _format_factors(factors):
+    """
+    Format a factor multiset canonically, e.g. [3, 2, 2] as '2*2*3'.
+    """
+    return "*".join(str(factor) for factor in sorted(factors))
+
+
+def _parse_factors(answer):
+    """
+    Parse factors like '2*2*3', '2 x 2 x 3' or '2^2 * 3' to a list of ints.
+    """
+    factors = []
+    for term in FACTOR_SEPARATOR_PATTERN.split(answer):
+        base, _, exponent = term.partition("^")
+        base = int(base)
+        exponent = int(exponent) if exponent else 1
+        if base < 1 or exponent < 1:
+            raise ValueError("factors must be positive")
+        if exponent > 64:
+            raise ValueError("exponent is too large")
+        factors += [base] * exponent
+    return factors
+
+
+class FactorQuizUnit(QuizUnitBase):
+    """
+    Quiz unit for generating number theory quizzes: prime factorizations,
+    primality, and greatest common divisors and least common multiples.
+    """
+
+    @classmethod
+    def transform_options_to_blueprint_unit(cls, options):
+        """
+        Convert options to a blueprint unit for the factor quiz.
+        """
+        unit_bp = {}
+        kinds = set()
+        try:
+            for opt in options:
+                key = opt.pop("key")
+                args = opt.pop("args")
+                if key == "start" and "start" not in unit_bp:
+                    map_args_to_option(opt, args, [("start", int)], 1)
+                elif key == "end" and "end" not in unit_bp:
+                    map_args_to_option(opt, args, [("end", int)], 1)
+                elif key in ["start", "end"]:
+                    raise MappingError(
+                        f"Option '{key}' defined multiple times."
+                    )
+                elif key in QUESTION_KINDS:
+                    add_kind_option(kinds, key, args)
+                else:
+                    raise UserConfigError(
+                        f"Unknown option key: {key}"
+                    )
+                unit_bp.update(opt)
+        except MappingError as e:
+            raise UserConfigError(
+                f"Invalid option {key}: {e}"
+            ) from e
+        unit_bp.setdefault("start", DEFAULT_START)
+        unit_bp.setdefault("end", DEFAULT_END)
+        if unit_bp["start"] < 2:
+            raise UserConfigError(
+                "Start must be at least 2."
+            )
+        if unit_bp["start"] > unit_bp["end"]:
+            raise UserConfigError(
+                "Start > end."
+            )
+        if unit_bp["end"] > MAX_END:
+            raise UserConfigError(
+                f"End must not exceed {MAX_END}."
+            )
+        unit_bp["kinds"] = resolve_kinds(kinds, QUESTION_KINDS)
+        return unit_bp
+
+    @classmethod
+    def transform_blueprint_unit_to_options(cls, blueprint_unit):
+        """
+        Convert a blueprint unit back to options for the factor quiz.
+        """
+        options = []
+        options.append(
+            {"key": "start", "args": [str(blueprint_unit["start"])]}
+        )
+        options.append(
+            {"key": "end", "args": [str(blueprint_unit["end"])]}
+        )
+        options += kinds_to_options(blueprint_unit["kinds"], QUESTION_KINDS)
+        return options
+
+    @classmethod
+    def _generate_question(cls, kind, start, end):
+        if kind in ("gcd", "lcm"):
+            a = random.randint(start, end)
+            b = random.randint(start, end)
+            if kind == "gcd":
+                question = f"What is the GCD of {a} and {b}?"
+                answer = math.gcd(a, b)
+            else:
+                question = f"What is the LCM of {a} and {b}?"
+                answer = math.lcm(a, b)
+            return question, str(answer)
+
+        n = random.randint(start, end)
+        factors = _prime_factors(n)
+        if kind == "factorize":
+            question = f"What is the prime factorization of {n}?"
+            return question, _format_factors(factors)
+        return f"Is {n} prime?", "yes" if factors == [n] else "no"
+
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        start = blueprint_unit["start"]
+        end = blueprint_unit["end"]
+        kinds = blueprint_unit["kinds"]
+        if "factorize" in kinds or "prime" in kinds:
+            # Sieve once for the whole quiz
+            _sieve_smallest_factors(end)
+
+        quiz = []
+        for _ in range(blueprint_unit["count"]):
+            kind = random.choice(kinds)
+            question, answer = cls._generate_question(kind, start, end)
+            quiz.append(
+                {"question": question, "answer": answer, "category": "factor"}
+            )
+        return quiz
+
+    @classmethod
+    def parse_user_answer(cls, user_answer):
+        """
+        Canonicalize the answer: 'yes'/'no' for primality questions,
+        otherwise the sorted factors, e.g. '2^2 x 3' becomes '2*2*3'.
+        """
+        user_answer = user_answer.strip().lower()
+        if user_answer in YES_ANSWERS:
+            return "yes"
+        if user_answer in NO_ANSWERS:
+            return "no"
+        try:
+            return _format_factors(_parse_factors(user_answer))
+        except ValueError as e:
+            raise UserResponseError(
+                f"Invalid answer '{user_answer}'. Answer must be a number, "
+                "a product of factors like 2^2*3, or yes/no."
+            ) from e
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        # Both answers are canonical
+        return user_answer == correct_answer
+
+    @classmethod
+    def prettify_answer(cls, answer):
+        if "*" not in answer:
+            return answer.capitalize()
+        factors = [int(factor) for factor in answer.split("*")]
+        terms = []
+        for factor in sorted(set(factors)):
+            exponent = factors.count(factor)
+            terms.append(
+                f"{factor}^{exponent}" if exponent > 1 else str(factor)
+            )
+        return " * ".join(terms)
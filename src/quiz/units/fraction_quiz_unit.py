@@ -0,0 +1,206 @@
+import functools
+import random
+import re
+from fractions import Fraction
+
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.shared import (
+    MappingError,
+    add_kind_option,
+    kinds_to_options,
+    map_args_to_option,
+    resolve_kinds,
+)
+
+DEFAULT_MAX_DENOMINATOR = 12
+MAX_DENOMINATOR = 100
+DEFAULT_MAX_AMOUNT = 200
+
+# Longer answers, and answers in exponent notation, are rejected before they
+# are parsed, since huge exponents take seconds to convert to a Fraction
+MAX_ANSWER_LENGTH = 32
+
+SEPARATOR_SPACES_PATTERN = re.compile(r"\s*([/%])\s*")
+
+# Percentages are asked in steps of 5%
+PERCENTAGES = tuple(range(5, 101, 5))
+
+# Kinds of questions, in the order of the options
+QUESTION_KINDS = ("add", "subtract", "multiply", "percent")
+
+OPERATOR_SYMBOLS = {"add": "+", "subtract": "-", "multiply": "*"}
+
+
+@functools.lru_cache(maxsize=None)
+def _proper_fractions(max_denominator):
+    """
+    Return all distinct proper fractions between 0 and 1 with denominators
+    up to `max_denominator`, in reduced form.
+
+    Reducing the operands of a quiz only takes gcd computations once per
+    denominator bound, drawing an operand is then a choice from the table.
+    """
+    return tuple(
+        sorted(
+            {
+                Fraction(numerator, denominator)
+                for denominator in range(2, max_denominator + 1)
+                for numerator in range(1, denominator)
+            }
+        )
+    )
+
+
+def _parse_fraction(answer):
+    """
+    Parse answers like '3/4', '0.75' or '75%' to a Fraction.
+    """
+    answer = answer.strip()
+    if len(answer) > MAX_ANSWER_LENGTH:
+        raise ValueError("answer is too long")
+    # Spaces are only allowed around the slash and the percent sign, so
+    # mixed numbers like '1 1/2' are not read as '11/2'
+    answer = SEPARATOR_SPACES_PATTERN.sub(r"\1", answer)
+    if any(char.isspace() for char in answer):
+        raise ValueError("answer contains whitespace")
+    if "e" in answer.lower():
+        raise ValueError("exponent notation is not supported")
+    if answer.endswith("%"):
+        return Fraction(answer[:-1]) / 100
+    return Fraction(answer)
+
+
+class FractionQuizUnit(QuizUnitBase):
+    """
+    Quiz unit for generating fraction quizzes, adding, subtracting and
+    multiplying fractions or taking percentages of amounts, evaluated with
+    exact rational arithmetic.
+    """
+
+    @classmethod
+    def transform_options_to_blueprint_unit(cls, options):
+        """
+        Convert options to a blueprint unit for the fraction quiz.
+        """
+        unit_bp = {}
+        kinds = set()
+        try:
+            for opt in options:
+                key = opt.pop("key")
+                args = opt.pop("args")
+                if key == "denominator" and "max_denominator" not in unit_bp:
+                    map_args_to_option(
+                        opt, args, [("max_denominator", int)], 1
+                    )
+                elif key == "amount" and "max_amount" not in unit_bp:
+                    map_args_to_option(opt, args, [("max_amount", int)], 1)
+                elif key in ["denominator", "amount"]:
+                    raise MappingError(
+                        f"Option '{key}' defined multiple times."
+                    )
+                elif key in QUESTION_KINDS:
+                    add_kind_option(kinds, key, args)
+                else:
+                    raise UserConfigError(
+                        f"Unknown option key: {key}"
+                    )
+                unit_bp.update(opt)
+        except MappingError as e:
+            raise UserConfigError(
+                f"Invalid option {key}: {e}"
+            ) from e
+        unit_bp.setdefault("max_denominator", DEFAULT_MAX_DENOMINATOR)
+        unit_bp.setdefault("max_amount", DEFAULT_MAX_AMOUNT)
+        if not 2 <= unit_bp["max_denominator"] <= MAX_DENOMINATOR:
+            raise UserConfigError(
+                f"Denominator must be between 2 and {MAX_DENOMINATOR}."
+            )
+        if unit_bp["max_amount"] < 1:
+            raise UserConfigError(
+                "Amount must be at least 1."
+            )
+        unit_bp["kinds"] = resolve_kinds(kinds, QUESTION_KINDS)
+        return unit_bp
+
+    @classmethod
+    def transform_blueprint_unit_to_options(cls, blueprint_unit):
+        """
+        Convert a blueprint unit back to options for the fraction quiz.
+        """
+        options = []
+        options.append(
+            {
+                "key": "denominator",
+                "args": [str(blueprint_unit["max_denominator"])],
+            }
+        )
+        options.append(
+            {"key": "amount", "args": [str(blueprint_unit["max_amount"])]}
+        )
+        options += kinds_to_options(blueprint_unit["kinds"], QUESTION_KINDS)
+        return options
+
+    @classmethod
+    def _generate_question(cls, kind, fractions, max_amount):
+        if kind == "percent":
+            percentage = random.choice(PERCENTAGES)
+            amount = random.randint(1, max_amount)
+            question = f"{percentage}% of {amount}"
+            return question, Fraction(percentage * amount, 100)
+
+        a = random.choice(fractions)
+        b = random.choice(fractions)
+        if kind == "subtract":
+            # No negative differences
+            a, b = max(a, b), min(a, b)
+            answer = a - b
+        elif kind == "add":
+            answer = a + b
+        else:
+            answer = a * b
+        return f"{a} {OPERATOR_SYMBOLS[kind]} {b}", answer
+
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        fractions = _proper_fractions(blueprint_unit["max_denominator"])
+        max_amount = blueprint_unit["max_amount"]
+        kinds = blueprint_unit["kinds"]
+        for _ in range(blueprint_unit["count"]):
+            kind = random.choice(kinds)
+            question, answer = cls._generate_question(
+                kind, fractions, max_amount
+            )
+            # Fractions are always reduced, their string is canonical
+            yield {
+                "question": question,
+                "answer": str(answer),
+                "category": "fraction",
+            }
+
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
+
+    @classmethod
+    def parse_user_answer(cls, user_answer):
+        """
+        Parse the answer to the canonical string of its reduced fraction, so
+        '3/4', '6/8', '0.75' and '75%' all become '3/4'.
+        """
+        try:
+            return str(_parse_fraction(user_answer))
+        except (ValueError, ZeroDivisionError) as e:
+            raise UserResponseError(
+                f"Invalid answer '{user_answer}'. Answer must be a fraction, "
+                "a decimal or a percentage, e.g. 3/4, 0.75 or 75%."
+            ) from e
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        # Both answers are canonical
+        return user_answer == correct_answer
+
+    @classmethod
+    def prettify_answer(cls, answer):
+        return answer
@@ -0,0 +1,343 @@
+"""
+Vectorized batch generation for the math quiz unit.
+
+Large quizzes draw all operands of a generation plan at once as NumPy arrays
+and run the compiled RPN program over whole columns instead of question by
+question.
+
+Operands are evaluated as float64 together with a mask tracking which values
+Python would keep as `int`. Questions leaving the range in which this
+reproduces Python's semantics (division by zero, non-finite values, integers
+beyond 2**53) are flagged and re-evaluated with the scalar evaluator, so the
+answers are the same as with per-question generation.
+"""
+
+import math
+import numbers
+import random
+
+import numpy as np
+
+from quiz.units.math_evaluator import (
+    BINARY,
+    CALL,
+    PRECEDENCE,
+    PUSH_SLOT,
+    PUSH_VALUE,
+    UNARY,
+)
+from quiz.units.math_quiz_unit import (
+    CHOOSE,
+    DIVISION_OPERATORS,
+    LITERAL,
+    SAMPLE_FLOAT,
+    SAMPLE_INT,
+    MathQuizUnit,
+)
+from quiz.units.math_tables import FUNCTION_TABLE, INT_PRESERVING_FUNCTIONS
+
+MAX_EXACT_INT = 2**53
+
+
+def _python_pow(base, exponent):
+    try:
+        return math.pow(base, exponent)
+    except (ValueError, OverflowError):
+        return math.nan
+
+
+# NumPy's vectorized power may round differently from Python's
+_power = np.frompyfunc(_python_pow, 2, 1)
+
+# Array versions of the blueprint functions. NumPy's exactly rounded
+# functions are used directly, the others are applied element-wise since
+# NumPy may round them differently from the scalar table.
+_EXACT_NUMPY_FUNCTIONS = {
+    "abs": np.abs,
+    "ceil": np.ceil,
+    "floor": np.floor,
+    "round": np.round,
+    "sqrt": np.sqrt,
+}
+_ARRAY_FUNCTIONS = {
+    fn: _EXACT_NUMPY_FUNCTIONS.get(name, np.frompyfunc(fn, 1, 1))
+    for name, fn in FUNCTION_TABLE.items()
+}
+_INT_PRESERVING_FUNCTIONS = {
+    FUNCTION_TABLE[name] for name in INT_PRESERVING_FUNCTIONS
+}
+
+
+def is_vectorizable(plan):
+    """
+    Check whether all integer ranges of the plan fit into exact float64.
+    """
+    for kind, start, end, _, _ in plan.steps:
+        if kind == SAMPLE_INT and max(abs(start), abs(end)) > MAX_EXACT_INT:
+            return False
+    return True
+
+
+def _apply_binary(op, left, right, left_bare):
+    l_val, l_int = left
+    r_val, r_int = right
+    unsafe = None
+    if op == "+":
+        val, is_int = l_val + r_val, l_int & r_int
+    elif op == "-":
+        val, is_int = l_val - r_val, l_int & r_int
+    elif op == "*":
+        val, is_int = l_val * r_val, l_int & r_int
+    elif op == "/":
+        val, is_int = l_val / r_val, np.zeros_like(l_int)
+        unsafe = r_val == 0
+    elif op == "//":
+        val, is_int = np.floor_divide(l_val, r_val), l_int & r_int
+        unsafe = r_val == 0
+    elif op == "%":
+        val, is_int = np.mod(l_val, r_val), l_int & r_int
+        unsafe = r_val == 0
+    elif op == "**":
+        if left_bare:
+            # The sign of a bare number binds weaker than the power
+            negative = np.signbit(l_val)
+            val = np.where(
+                negative,
+                -_power(np.abs(l_val), r_val).astype(float),
+                _power(l_val, r_val).astype(float),
+            )
+        else:
+            val = _power(l_val, r_val).astype(float)
+        is_int = l_int & r_int & (r_val >= 0)
+    else:
+        raise ValueError(f"invalid operator '{op}'")
+    return val, is_int, unsafe
+
+
+def _evaluate_program(program, slots, rows):
+    """
+    Evaluate an RPN program for the given rows of the drawn columns.
+
+    Returns the values, the int mask and the mask of rows that need to be
+    re-evaluated with the scalar evaluator.
+    """
+    size = len(rows)
+    unsafe = np.zeros(size, dtype=bool)
+    stack = []
+    for kind, arg, bare_base in program:
+        if kind == PUSH_SLOT:
+            values, is_int = slots[arg]
+            stack.append((values[rows], is_int[rows]))
+            continue
+        if kind == PUSH_VALUE:
+            val = np.full(size, float(arg))
+            is_int = np.full(size, isinstance(arg, numbers.Integral))
+            stack.append((val, is_int))
+            continue
+
+        if kind == BINARY:
+            right = stack.pop()
+            left = stack.pop()
+            ops, choices = slots[arg]
+            choices = choices[rows]
+            val = np.empty(size)
+            is_int = np.empty(size, dtype=bool)
+            for i, op in enumerate(ops):
+                mask = choices == i
+                if not mask.any():
+                    continue
+                sub_val, sub_int, sub_unsafe = _apply_binary(
+                    op,
+                    (left[0][mask], left[1][mask]),
+                    (right[0][mask], right[1][mask]),
+                    bare_base,
+                )
+                val[mask] = sub_val
+                is_int[mask] = sub_int
+                if sub_unsafe is not None:
+                    unsafe[mask] |= sub_unsafe
+        elif kind == UNARY:
+            operand_val, is_int = stack.pop()
+            ops, choices = slots[arg]
+            signs = np.array([-1.0 if op == "-" else 1.0 for op in ops])
+            val = operand_val * signs[choices[rows]]
+        elif kind == CALL:
+            operand_val, operand_int = stack.pop()
+            val = _ARRAY_FUNCTIONS[arg](operand_val).astype(float)
+            is_int = operand_int & (arg in _INT_PRESERVING_FUNCTIONS)
+        else:
+            raise ValueError(f"Invalid instruction kind '{kind}'")
+
+        # Python ints have no negative zero
+        val = np.where(is_int, val + 0.0, val)
+        unsafe |= ~np.isfinite(val)
+        unsafe |= is_int & (np.abs(val) >= MAX_EXACT_INT)
+        stack.append((val, is_int))
+
+    val, is_int = stack.pop()
+    return val, is_int, unsafe
+
+
+def _program_groups(plan, slots, count):
+    """
+    Yield (program, rows) pairs grouping rows by the precedence of their
+    drawn operators.
+    """
+    all_rows = np.arange(count)
+    if not plan.mixed_slots:
+        template = [None] * len(slots)
+        for i in plan.operator_slots:
+            ops, choices = slots[i]
+            template[i] = ops[choices[0]]
+        yield plan.program_for(template), all_rows
+        return
+
+    keys = np.stack(
+        [
+            np.array([PRECEDENCE.get(op, 0) for op in slots[i][0]])[
+                slots[i][1]
+            ]
+            for i in plan.mixed_slots
+        ],
+        axis=1,
+    )
+    _, group_ids = np.unique(keys, axis=0, return_inverse=True)
+    group_ids = group_ids.reshape(-1)
+    for group in range(group_ids.max() + 1):
+        rows = all_rows[group_ids == group]
+        first = rows[0]
+        template = [None] * len(slots)
+        for i in plan.operator_slots:
+            ops, choices = slots[i]
+            template[i] = ops[choices[first]]
+        yield plan.program_for(template), rows
+
+
+def _apply_exact_division(plan, program, slots, rows, rng):
+    """
+    Vectorized counterpart of `MathQuizUnit._apply_exact_division` for the
+    given rows of the drawn columns.
+    """
+    for op_slot, dividend, divisor in plan.divisions_in(program):
+        ops, choices = slots[op_slot]
+        is_division = np.array([op in DIVISION_OPERATORS for op in ops])
+        division_rows = rows[is_division[choices[rows]]]
+        size = len(division_rows)
+        _, start, end, _, _ = plan.sample_steps[divisor]
+        if not size or start == end == 0:
+            continue
+        if start > 0 or end < 0:
+            values = rng.integers(start, end, size=size, endpoint=True)
+        else:
+            values = rng.integers(start, end, size=size)
+            values[values >= 0] += 1
+
+        _, start, end, _, _ = plan.sample_steps[dividend]
+        positive = values > 0
+        low = np.where(positive, start, -end)
+        high = np.where(positive, end, -start)
+        magnitude = np.abs(values)
+        low, high = -(-low // magnitude), high // magnitude
+        valid = low <= high
+        if not valid.any():
+            continue
+        values = values[valid]
+        division_rows = division_rows[valid]
+        quotients = rng.integers(low[valid], high[valid], endpoint=True)
+        slots[divisor][division_rows] = values
+        slots[dividend][division_rows] = quotients * values
+
+
+def generate_batch(plan, count):
+    """
+    Generate `count` questions of a compiled math generation plan at once.
+
+    Parameters
+    ----------
+    plan : _GenerationPlan
+        The compiled generation plan.
+    count : int
+        Number of questions to generate.
+
+    Returns
+    -------
+    list of tuple[str, str, float]
+        The expressions, their answers and the grading keys of the answers.
+    """
+    rng = np.random.default_rng(random.getrandbits(128))
+    slots = []
+    for kind, a, b, fmt, _ in plan.sample_steps:
+        if kind == SAMPLE_INT:
+            slots.append(rng.integers(a, b, size=count, endpoint=True))
+        elif kind == SAMPLE_FLOAT:
+            draws = rng.uniform(a, b, size=count).tolist()
+            # The rounded text is what the question shows
+            slots.append(np.array([fmt.format(d) for d in draws], dtype=float))
+        else:
+            slots.append((a, rng.integers(0, len(a), size=count)))
+
+    groups = list(_program_groups(plan, slots, count))
+    if plan.exact_division:
+        for program, rows in groups:
+            _apply_exact_division(plan, program, slots, rows, rng)
+
+    columns = []
+    values = iter(slots)
+    for kind, a, _, fmt, sep in plan.steps:
+        if kind == LITERAL:
+            columns.append([a] * count)
+        elif kind == CHOOSE:
+            ops, choices = next(values)
+            labels = [op + sep for op in ops]
+            columns.append([labels[i] for i in choices.tolist()])
+        else:
+            column = next(values).tolist()
+            columns.append([fmt.format(value) + sep for value in column])
+    exprs = ["".join(row) for row in zip(*columns)]
+
+    # Operands are evaluated as float64 with a mask of the int values
+    slots = [
+        (
+            (slot.astype(float), np.full(count, kind == SAMPLE_INT))
+            if kind != CHOOSE
+            else slot
+        )
+        for (kind, *_), slot in zip(plan.sample_steps, slots)
+    ]
+    answers = [None] * count
+    grading_keys = [None] * count
+
+    for program, rows in groups:
+        with np.errstate(all="ignore"):
+            values, is_int, unsafe = _evaluate_program(program, slots, rows)
+        for row, value, int_flag, fallback in zip(
+            rows.tolist(), values.tolist(), is_int.tolist(), unsafe.tolist()
+        ):
+            if fallback:
+                answer = MathQuizUnit._envaluate_question(
+                    plan, _row_slots(slots, row)
+                )
+                grading_key = MathQuizUnit.derive_grading_key(answer)
+            elif int_flag:
+                # Integer answers are exact, their tolerance is 1
+                answer = str(int(value))
+                grading_key = 0.5
+            else:
+                answer = str(value)
+                grading_key = MathQuizUnit.derive_grading_key(answer)
+            answers[row] = answer
+            grading_keys[row] = grading_key
+
+    return list(zip(exprs, answers, grading_keys))
+
+
+def _row_slots(slots, row):
+    row_slots = []
+    for values, flags in slots:
+        if isinstance(values, tuple):
+            row_slots.append(values[flags[row]])
+        elif flags[row]:
+            row_slots.append(int(values[row]))
+        else:
+            row_slots.append(float(values[row]))
+    return row_slots
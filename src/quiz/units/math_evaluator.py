@@ -0,0 +1,225 @@
+"""
+Eval-free evaluation of math quiz expressions.
+
+Math blueprints describe a flat sequence of operands, operators, brackets and
+functions. Instead of joining the drawn values into a string and running it
+through `eval`, the sequence is converted once into a reverse polish notation
+(RPN) program, which is then executed directly on the drawn values.
+
+The evaluator follows Python's operator semantics, so the result is the same
+as evaluating the question text with `eval`.
+"""
+
+import math
+import operator
+
+BINARY_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+}
+UNARY_OPERATORS = {
+    "+": operator.pos,
+    "-": operator.neg,
+}
+PRECEDENCE = {
+    "+": 1,
+    "-": 1,
+    "*": 2,
+    "/": 2,
+    "//": 2,
+    "%": 2,
+    "**": 4,
+}
+UNARY_PRECEDENCE = 3
+
+# Exact integer powers with more bits than this are not computed, e.g. the
+# nested powers of the `tree` option could otherwise take minutes
+MAX_POWER_BITS = 4096
+
+# Token kinds accepted by `compile_program`
+NUMBER, VALUE, OPERATOR, OPEN, CLOSE, FUNCTION = range(6)
+
+# Instruction kinds of a compiled program, `_BRACKET` is only used while
+# compiling
+PUSH_SLOT, PUSH_VALUE, BINARY, UNARY, CALL, _BRACKET = range(6)
+
+
+def _is_negative(value):
+    return value < 0 or (value == 0 and math.copysign(1.0, value) < 0)
+
+
+def _check_power(base, exponent):
+    """
+    Raise OverflowError if `base ** exponent` is an exact integer power with
+    more than `MAX_POWER_BITS` bits.
+    """
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and exponent > 0
+        and abs(base) > 1
+        and exponent > MAX_POWER_BITS / math.log2(abs(base))
+    ):
+        raise OverflowError("integer power too large")
+
+
+def compile_program(tokens, precedences):
+    """
+    Compile an infix token sequence into an RPN program.
+
+    Parameters
+    ----------
+    tokens : sequence of tuple
+        Tokens of the form (kind, arg):
+        - (NUMBER, slot): operand drawn into `slots[slot]`
+        - (VALUE, value): fixed operand, e.g. a resolved constant
+        - (OPERATOR, slot): operator drawn into `slots[slot]`
+        - (OPEN, None) / (CLOSE, None): brackets
+        - (FUNCTION, callable): function applied to the following bracket
+    precedences : mapping
+        Maps the slot of each operator token to the precedence of the
+        operator drawn for it. Only binary operators are looked up.
+
+    Returns
+    -------
+    tuple
+        The RPN program, to be executed with `evaluate_program`.
+
+    Raises
+    ------
+    ValueError
+        If the token sequence is not a valid expression.
+    """
+    program = []
+    pending = []  # (kind, arg, precedence, right_associative)
+    # Tracks for every operand on the runtime stack whether it is a bare
+    # number, which matters for the sign handling of `**`
+    bare_operands = []
+    expect_operand = True
+
+    def emit(kind, arg):
+        if kind == BINARY:
+            if len(bare_operands) < 2:
+                raise ValueError("missing operand")
+            bare_operands.pop()
+            left_bare = bare_operands.pop()
+            program.append((BINARY, arg, left_bare))
+        else:
+            if not bare_operands:
+                raise ValueError("missing operand")
+            bare_operands.pop()
+            program.append((kind, arg, False))
+        bare_operands.append(False)
+
+    for kind, arg in tokens:
+        if kind == NUMBER:
+            program.append((PUSH_SLOT, arg, False))
+            bare_operands.append(True)
+            expect_operand = False
+        elif kind == VALUE:
+            program.append((PUSH_VALUE, arg, False))
+            bare_operands.append(False)
+            expect_operand = False
+        elif kind == FUNCTION:
+            pending.append((CALL, arg, None, False))
+            expect_operand = True
+        elif kind == OPEN:
+            pending.append((_BRACKET, None, None, False))
+            expect_operand = True
+        elif kind == CLOSE:
+            while pending and pending[-1][0] != _BRACKET:
+                emit(*pending.pop()[:2])
+            if not pending:
+                raise ValueError("bracket closed without opening")
+            pending.pop()
+            if pending and pending[-1][0] == CALL:
+                emit(*pending.pop()[:2])
+            if not bare_operands:
+                raise ValueError("empty brackets")
+            # A bracketed operand is no longer subject to sign binding
+            bare_operands[-1] = False
+            expect_operand = False
+        elif kind == OPERATOR:
+            if expect_operand:
+                # Prefix operators never pop pending operators
+                pending.append((UNARY, arg, UNARY_PRECEDENCE, True))
+                continue
+            prec = precedences[arg]
+            right_assoc = prec == PRECEDENCE["**"]
+            while pending and pending[-1][0] in (BINARY, UNARY):
+                top_prec = pending[-1][2]
+                if top_prec > prec or (top_prec == prec and not right_assoc):
+                    emit(*pending.pop()[:2])
+                else:
+                    break
+            pending.append((BINARY, arg, prec, right_assoc))
+            expect_operand = True
+        else:
+            raise ValueError(f"Invalid token kind '{kind}'")
+
+    while pending:
+        kind, arg = pending.pop()[:2]
+        if kind == _BRACKET:
+            raise ValueError("unmatched brackets")
+        emit(kind, arg)
+
+    if len(bare_operands) != 1:
+        raise ValueError("missing operator")
+    return tuple(program)
+
+
+def evaluate_program(program, slots):
+    """
+    Execute an RPN program compiled by `compile_program`.
+
+    Parameters
+    ----------
+    program : tuple
+        The compiled program.
+    slots : sequence
+        Drawn operands and operators, indexed by the slots of the tokens the
+        program was compiled from.
+
+    Returns
+    -------
+    int or float
+        The value of the expression.
+
+    Raises
+    ------
+    ZeroDivisionError
+        If the expression divides by zero.
+    OverflowError
+        If a float result overflows or an integer power would have more than
+        `MAX_POWER_BITS` bits.
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for kind, arg, bare_base in program:
+        if kind == PUSH_SLOT:
+            push(slots[arg])
+        elif kind == PUSH_VALUE:
+            push(arg)
+        elif kind == BINARY:
+            right = pop()
+            left = pop()
+            op = slots[arg]
+            if op == "**":
+                _check_power(left, right)
+            if bare_base and op == "**" and _is_negative(left):
+                # As in Python, the sign of a bare number binds weaker than
+                # the power, i.e. '-2 ** 2' is -(2 ** 2)
+                push(-((-left) ** right))
+            else:
+                push(BINARY_OPERATORS[op](left, right))
+        elif kind == UNARY:
+            push(UNARY_OPERATORS[slots[arg]](pop()))
+        else:
+            push(arg(pop()))
+    return pop()
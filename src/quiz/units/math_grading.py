@@ -0,0 +1,73 @@
+"""
+Vectorized grading for the math quiz unit.
+
+Large submissions are graded in one pass over NumPy arrays instead of one
+`compare_answer_to_key` call per answer. The user answers are parsed into a
+float array, their tolerances are derived from their digits with string
+array operations, and the comparison against the correct answers and the
+tolerances of the grading keys is done for all answers at once. The results
+are the same as with per-answer grading.
+"""
+
+import numpy as np
+
+
+def _derive_tolerances(user_answers, answers):
+    # Array version of `math_quiz_unit._derive_tolerance`
+    lengths = np.strings.str_len(answers)
+    exponent_starts = np.maximum(
+        np.strings.find(answers, "e"), np.strings.find(answers, "E")
+    )
+    mantissa_lengths = np.where(exponent_starts >= 0, exponent_starts, lengths)
+    dots = np.strings.find(answers, ".")
+    decimals = np.where(dots >= 0, mantissa_lengths - dots - 1, 0)
+    powers = -decimals
+    # Few answers have an exponent, those are parsed one by one
+    for i in np.flatnonzero(exponent_starts >= 0).tolist():
+        powers[i] += int(user_answers[i][exponent_starts[i] + 1 :])
+    # Powers of ten are parsed like in the scalar version, since `10.0 ** k`
+    # is not always correctly rounded
+    unique_powers, inverse = np.unique(powers, return_inverse=True)
+    tolerances = np.array([float(f"1e{k}") for k in unique_powers.tolist()])
+    return tolerances[inverse.reshape(-1)]
+
+
+def grade_answers(user_answers, correct_answers, grading_keys):
+    """
+    Grade parsed math answers against the correct answers.
+
+    Parameters
+    ----------
+    user_answers : list of str
+        The parsed user answers.
+    correct_answers : list of str
+        The correct answers of the questions.
+    grading_keys : list of float
+        The half tolerances of the correct answers, as returned by
+        `MathQuizUnit.derive_grading_key`.
+
+    Returns
+    -------
+    list of bool
+        Whether each answer is correct.
+    """
+    count = len(user_answers)
+    if not count:
+        return []
+    answers = np.array(user_answers, dtype=str)
+    user_values = np.fromiter(map(float, user_answers), float, count)
+    user_tolerances = _derive_tolerances(user_answers, answers)
+
+    values = np.fromiter(map(float, correct_answers), float, count)
+    half_tolerances = np.array(grading_keys, dtype=float)
+
+    with np.errstate(invalid="ignore"):
+        diffs = np.abs(user_values - values)
+        tolerances = np.maximum(user_tolerances / 2, half_tolerances)
+        # Comparisons with nan are False, which covers nan answers
+        correct = diffs <= tolerances
+
+    # Answers without a finite value only match their string
+    for i in np.flatnonzero(~np.isfinite(values)).tolist():
+        correct[i] = user_answers[i] == correct_answers[i]
+    return correct.tolist()
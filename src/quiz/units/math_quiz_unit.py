@@ -1,56 +1,48 @@
+import functools
+import math
 import random
 import re
 
-from numpy import (
-    abs, ceil, floor, round, exp,   # noqa: F401
-    log, log10, sqrt, sin, cos, tan  # noqa: F401
-)
-from scipy.constants import (
-    c, h, hbar, G, e, k, N_A, R, alpha, mu_0, epsilon_0,    # noqa: F401
-    sigma, zero_Celsius, pi, Avogadro, Boltzmann, Planck,   # noqa: F401
-    speed_of_light, elementary_charge, gravitational_constant   # noqa: F401
-)
-
 from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.math_evaluator import (
+    BINARY,
+    CLOSE,
+    FUNCTION,
+    NUMBER,
+    OPEN,
+    OPERATOR,
+    PRECEDENCE,
+    PUSH_SLOT,
+    VALUE,
+    compile_program,
+    evaluate_program,
+)
+from quiz.units.math_tables import CONSTANT_TABLE, FUNCTION_TABLE
+from quiz.units.permutation import unique_indices
 from quiz.units.quiz_unit_base import QuizUnitBase
 from quiz.units.shared import MappingError, map_args_to_option
 
 SUPPORTED_OPERATORS = {"+", "-", "*", "/", "//", "%", "**"}
-SUPPORTED_FUNCTIONS = {
-    "abs",
-    "ceil",
-    "floor",
-    "round",
-    "exp",
-    "log",
-    "log10",
-    "sqrt",
-    "sin",
-    "cos",
-    "tan",
-}
-SUPPORTED_CONSTANTS = {
-    "c",
-    "h",
-    "hbar",
-    "G",
-    "e",
-    "k",
-    "N_A",
-    "R",
-    "alpha",
-    "mu_0",
-    "epsilon_0",
-    "sigma",
-    "zero_Celsius",
-    "pi",
-    "Avogadro",
-    "Boltzmann",
-    "Planck",
-    "speed_of_light",
-    "elementary_charge",
-    "gravitational_constant",
-}
+SUPPORTED_FUNCTIONS = set(FUNCTION_TABLE)
+SUPPORTED_CONSTANTS = set(CONSTANT_TABLE)
+
+FLOAT_PRECISION_PATTERN = re.compile(r"float\.(\d+)")
+
+# Operators that may also be used as a sign
+SIGN_OPERATORS = {"+", "-"}
+
+# Operators built backwards from the quotient with the `exact` option
+DIVISION_OPERATORS = {"/", "//"}
+
+# States of the math expression validator
+_EXPECT_OPERAND, _AFTER_OPERAND, _EXPECT_BRACKET = range(3)
+
+# Deepest expression trees of the `tree` option, at most 2**6 operands keep
+# the questions short enough for the session cookie
+MAX_TREE_DEPTH = 6
+
+# Step kinds of a compiled generation plan
+SAMPLE_INT, SAMPLE_FLOAT, CHOOSE, LITERAL = range(4)
 
 KEY_MAPPING = {
     "op": "operator",
@@ -61,27 +53,6 @@ KEY_MAPPING = {
 }
 
 
-def _assert_valid_operators(ops):
-    reminder = set(ops) - SUPPORTED_OPERATORS
-    if len(ops) == 1:
-        msg = f"invalid operator '{ops[0]}'"
-    elif len(ops) > 1:
-        msg = f"invalid operators '{', '.join(ops)}'"
-    assert not reminder, msg
-
-
-def _assert_bracket(bracket):
-    assert bracket in ["(", ")"], f"Invalid bracket '{bracket}'"
-
-
-def _assert_function(func):
-    assert func in SUPPORTED_FUNCTIONS, f"Unsupported function '{func}'"
-
-
-def _assert_constant(const):
-    assert const in SUPPORTED_CONSTANTS, f"Unsupported constant '{const}'"
-
-
 def _is_numeric_type(type_, ignore_constants=False):
     numeric_types = ["int", "float"]
     if not ignore_constants:
@@ -89,108 +60,306 @@ def _is_numeric_type(type_, ignore_constants=False):
     return type_ in numeric_types or re.match(r"float\.(\d+)", type_)
 
 
-def _identify_math_expression_problem(elements):
-    # 1. Check for two consecutive numeric types
-    for i in range(len(elements) - 1):
-        if _is_numeric_type(elements[i]["type"]) and _is_numeric_type(
-            elements[i + 1]["type"]
-        ):
-            return "two consecutive numeric types"
-
-    # 2. Check for two consecutive operators
-    for i in range(len(elements) - 1):
-        if (
-            elements[i]["type"] == "operator"
-            and elements[i + 1]["type"] == "operator"
-        ):
-            return "two consecutive operators"
-
-    # 3. Check for operator followed by a bracket
-    for i in range(len(elements) - 1):
-        if elements[i]["type"] == "function":
-            if (
-                elements[i + 1]["type"] != "bracket"
-                or elements[i + 1]["value"] != "("
-            ):
-                return "function not followed by an opening bracket"
+def _classify_math_element(elem):
+    """
+    Validate a single element and return its grammar class, one of
+    "operand", "operator", "open", "close" or "function".
+    """
+    type_ = elem["type"]
+    if _is_numeric_type(type_, ignore_constants=True):
+        start, end = elem["start"], elem["end"]
+        assert end >= start, f"{end} not greater or equal to {start}"
+        return "operand"
+    if type_ == "constant":
+        const = elem["value"]
+        assert const in SUPPORTED_CONSTANTS, f"Unsupported constant '{const}'"
+        return "operand"
+    if type_ == "operator":
+        ops = elem["value"]
+        ops = [ops] if isinstance(ops, str) else ops
+        invalid = [op for op in ops if op not in SUPPORTED_OPERATORS]
+        if len(invalid) == 1:
+            raise AssertionError(f"invalid operator '{invalid[0]}'")
+        assert not invalid, f"invalid operators '{', '.join(invalid)}'"
+        return "operator"
+    if type_ == "bracket":
+        bracket = elem["value"]
+        assert bracket in ["(", ")"], f"Invalid bracket '{bracket}'"
+        return "open" if bracket == "(" else "close"
+    if type_ == "function":
+        func = elem["value"]
+        assert func in SUPPORTED_FUNCTIONS, f"Unsupported function '{func}'"
+        return "function"
+    raise AssertionError(f"Invalid element type '{type_}'")
+
+
+def _find_math_expression_problem(elements):
+    """
+    Validate a math expression in a single pass over its elements.
 
-    # 4. Check for unmatched brackets
-    brackets_counter = 0
-    for elem in elements:
-        if elem["type"] == "bracket":
-            if elem["value"] == "(":
-                brackets_counter += 1
-            elif elem["value"] == ")":
-                brackets_counter -= 1
-        if brackets_counter < 0:
-            return "bracket closed without opening"
-    if brackets_counter != 0:
-        return "unmatched brackets"
-
-    # 5. Check for expression starting with an operator
-    if elements[0]["type"] == "operator" and elements[0]["value"] not in [
-        "-",
-        "+",
-    ]:
-        return "expression starts with an operator"
-
-    # 6. Check for expression ending with an operator or function
-    if elements[-1]["type"] in ["operator", "function"]:
-        type_ = elements[-1]["type"]
-        type_ = "an operator" if type_ == "operator" else "a function"
-        return f"expression ends with {type_}"
-
-    # 7. Check for function preceded by numeric type
-    for i in range(len(elements) - 1):
-        i = i + 1
-        if elements[i]["type"] == "function" and _is_numeric_type(
-            elements[i - 1]["type"]
-        ):
-            return "function preceded by numeric"
+    The expression is checked with a small state machine, tracking whether
+    an operand, an operator or the bracket of a function is expected next.
+    A leading '+' or '-' (also after an opening bracket) is a sign.
 
+    Returns
+    -------
+    tuple[int, str] or None
+        The index of the first offending element and the reason, or None if
+        the expression is valid.
+    """
+    state = _EXPECT_OPERAND
+    previous = None
+    depth = 0
+    for i, elem in enumerate(elements):
+        try:
+            kind = _classify_math_element(elem)
+        except AssertionError as exc:
+            return i, str(exc)
+
+        if state == _EXPECT_BRACKET and kind != "open":
+            return i, "function not followed by an opening bracket"
+
+        if kind == "operand":
+            if state == _AFTER_OPERAND:
+                if previous == "operand":
+                    return i, "two consecutive numeric types"
+                return i, "operand after closing bracket"
+            state = _AFTER_OPERAND
+        elif kind == "operator":
+            if state == _EXPECT_OPERAND:
+                if previous == "operator":
+                    return i, "two consecutive operators"
+                ops = elem["value"]
+                ops = [ops] if isinstance(ops, str) else ops
+                if not set(ops) <= SIGN_OPERATORS:
+                    if previous is None:
+                        return i, "expression starts with an operator"
+                    return i, "operator after opening bracket"
+            state = _EXPECT_OPERAND
+        elif kind == "open":
+            if state == _AFTER_OPERAND:
+                return i, "opening bracket after an operand"
+            depth += 1
+            state = _EXPECT_OPERAND
+        elif kind == "close":
+            if depth == 0:
+                return i, "bracket closed without opening"
+            if state == _EXPECT_OPERAND:
+                if previous == "open":
+                    return i, "empty brackets"
+                return i, "operator before closing bracket"
+            depth -= 1
+            state = _AFTER_OPERAND
+        else:
+            if state == _AFTER_OPERAND:
+                if previous == "operand":
+                    return i, "function preceded by numeric"
+                return i, "function after closing bracket"
+            state = _EXPECT_BRACKET
+        previous = kind
+
+    last = len(elements) - 1
+    if state == _EXPECT_BRACKET:
+        return last, "expression ends with a function"
+    if previous == "operator":
+        return last, "expression ends with an operator"
+    if depth != 0:
+        return last, "unmatched brackets"
     return None
 
 
 def _assert_math_expression_elements(elements):
     assert len(elements) > 0, "at least one math element must be defined"
+    problem = _find_math_expression_problem(elements)
+    if problem:
+        index, reason = problem
+        raise AssertionError(f"{reason} (element {index + 1})")
+
+
+def _assert_tree_pool_elements(elements):
+    """
+    Assert that the elements form operand and operator pools for the `tree`
+    option.
+    """
+    kinds = [_classify_math_element(elem) for elem in elements]
+    for kind in kinds:
+        assert kind in ["operand", "operator"], (
+            "only numeric, constant and operator elements can be used with"
+            " the 'tree' option"
+        )
+    assert "operand" in kinds, "at least one operand must be defined"
+    assert "operator" in kinds, "at least one operator must be defined"
 
-    expr = ""
+
+def _split_tree_pool(elements):
+    """
+    Split the elements into the operand pool and a single operator element
+    offering all defined operators.
+    """
+    operands = []
+    operators = []
     for elem in elements:
-        type_ = elem["type"]
-        if _is_numeric_type(type_, ignore_constants=True):
-            start, end = elem["start"], elem["end"]
-            assert end >= start, f"{end} not greater or equal to {start}"
-            expr += "1" if not type_.startswith("float") else "1.0"
-        elif type_ == "operator":
-            value = elem["value"]
-            value = list(value) if isinstance(value, str) else value
-            _assert_valid_operators(value)
-            expr += "*"
-        elif type_ in ["bracket", "function", "constant"]:
-            if type_ == "bracket":
-                _assert_bracket(elem["value"])
-            elif type_ == "function":
-                _assert_function(elem["value"])
-            elif type_ == "constant":
-                _assert_constant(elem["value"])
-            expr += elem["value"]
-        else:
-            raise UserConfigError(f"Invalid element type '{type_}'")
-
-        expr += " " if elem["type"] != "function" else ""
-
-    try:
-        float(eval(expr))
-    except ZeroDivisionError:
-        pass
-    except Exception as exc:
-        problem = _identify_math_expression_problem(elements)
-        msg = "Invalid math expression"
-        if problem:
-            msg += ": " + problem
+        if elem["type"] != "operator":
+            operands.append(elem)
+            continue
+        ops = elem["value"]
+        ops = [ops] if isinstance(ops, str) else ops
+        operators += [op for op in ops if op not in operators]
+    return operands, {"type": "operator", "value": operators}
+
+
+def _random_tree_shape(leaves, depth, pool_size):
+    """
+    Draw a random binary tree with the given number of leaves and at most
+    the given depth.
+
+    Internal nodes are pairs of their children and leaves are indices into
+    the operand pool, so equal shapes compare and hash equal.
+    """
+    if leaves == 1:
+        return random.randrange(pool_size)
+    max_leaves = 2 ** (depth - 1)  # Per subtree
+    left = random.randint(
+        max(1, leaves - max_leaves), min(leaves - 1, max_leaves)
+    )
+    return (
+        _random_tree_shape(left, depth - 1, pool_size),
+        _random_tree_shape(leaves - left, depth - 1, pool_size),
+    )
+
+
+def _tree_shape_elements(shape, operands, operator):
+    """
+    Convert a tree shape into the element sequence of a math expression,
+    bracketing every subtree.
+    """
+    if not isinstance(shape, tuple):
+        return [operands[shape]]
+    elements = []
+    for i, child in enumerate(shape):
+        if i > 0:
+            elements.append(operator)
+        child_elements = _tree_shape_elements(child, operands, operator)
+        if isinstance(child, tuple):
+            elements.append({"type": "bracket", "value": "("})
+            elements += child_elements
+            elements.append({"type": "bracket", "value": ")"})
         else:
-            msg += ": " + str(exc)
-        raise UserConfigError(msg) from exc
+            elements += child_elements
+    return elements
+
+
+def _derive_tolerance(answer):
+    """
+    Derive the tolerance of a numeric answer from its last digit, e.g. 0.01
+    for '3.14' and 1000 for '1e3'.
+    """
+    mantissa, _, exponent = answer.lower().partition("e")
+    decimals = 0
+    if "." in mantissa:
+        decimals = len(mantissa) - mantissa.index(".") - 1
+    return float(f"1e{int(exponent or 0) - decimals}")
+
+
+def _draw_nonzero_int(start, end):
+    """
+    Draw an integer from [start, end] other than zero, or None if the range
+    only contains zero.
+    """
+    if start > 0 or end < 0:
+        return random.randint(start, end)
+    if start == end:
+        return None
+    value = random.randint(start, end - 1)
+    return value + 1 if value >= 0 else value
+
+
+def _quotient_bounds(start, end, divisor):
+    """
+    Bounds of the integer quotients q for which q * divisor lies in
+    [start, end].
+    """
+    if divisor < 0:
+        start, end, divisor = -end, -start, -divisor
+    return -(-start // divisor), end // divisor
+
+
+class _GenerationPlan:
+    """
+    Compiled form of the elements of a math blueprint unit.
+
+    The RPN program depends on the precedence of the drawn operators. It is
+    compiled lazily for every precedence combination that occurs and reused
+    afterwards; operator slots whose choices share one precedence do not
+    take part in the lookup.
+
+    For the `unique` option, every slot with finitely many values has a grid
+    (offset, size, scale) enumerating them; the question space is the mixed
+    radix product of these grids. Plain floats have no grid and are drawn
+    freely.
+    """
+
+    def __init__(
+        self,
+        steps,
+        tokens,
+        operator_slots,
+        mixed_slots,
+        grids,
+        exact_division=False,
+    ):
+        self.steps = tuple(steps)
+        self.tokens = tuple(tokens)
+        self.operator_slots = tuple(operator_slots)
+        self.mixed_slots = tuple(mixed_slots)
+        self.grids = tuple(grids)
+        self.exact_division = exact_division
+        # The steps drawing a value, indexed by slot
+        self.sample_steps = tuple(
+            step for step in self.steps if step[0] != LITERAL
+        )
+        self.space_size = 1
+        for grid in self.grids:
+            if grid is not None:
+                self.space_size *= grid[1]
+        self._programs = {}
+        self._divisions = {}
+
+    def program_for(self, slots):
+        key = tuple(PRECEDENCE.get(slots[i]) for i in self.mixed_slots)
+        program = self._programs.get(key)
+        if program is None:
+            precedences = {
+                i: PRECEDENCE.get(slots[i]) for i in self.operator_slots
+            }
+            if None in precedences.values():
+                raise ValueError("invalid operator")
+            program = compile_program(self.tokens, precedences)
+            self._programs[key] = program
+        return program
+
+    def divisions_in(self, program):
+        """
+        Return the (operator, dividend, divisor) slots of the divisions in a
+        program which directly combine two drawn integers.
+        """
+        divisions = self._divisions.get(program)
+        if divisions is None:
+            divisions = []
+            for i in range(2, len(program)):
+                kind, op_slot, _ = program[i]
+                left, right = program[i - 2], program[i - 1]
+                if (
+                    kind == BINARY
+                    and left[0] == right[0] == PUSH_SLOT
+                    and self.sample_steps[left[1]][0] == SAMPLE_INT
+                    and self.sample_steps[right[1]][0] == SAMPLE_INT
+                    and DIVISION_OPERATORS & set(self.sample_steps[op_slot][1])
+                ):
+                    divisions.append((op_slot, left[1], right[1]))
+            divisions = tuple(divisions)
+            self._divisions[program] = divisions
+        return divisions
 
 
 class MathQuizUnit(QuizUnitBase):
@@ -226,6 +395,37 @@ class MathQuizUnit(QuizUnitBase):
                 key = KEY_MAPPING.get(old_key, old_key)
                 opt.update({"type": key})
                 args = opt.pop("args")
+                if key == "exact":
+                    map_args_to_option(opt, args, [])
+                    blueprint_unit["exact_division"] = True
+                    continue
+                if key == "unique":
+                    map_args_to_option(opt, args, [])
+                    blueprint_unit["unique"] = True
+                    continue
+                if key == "tree":
+                    map_args_to_option(
+                        opt,
+                        args,
+                        [
+                            ("depth", int),
+                            ("operands", int),
+                        ],
+                        1,
+                    )
+                    depth = opt["depth"]
+                    assert 1 <= depth <= MAX_TREE_DEPTH, (
+                        f"depth must be between 1 and {MAX_TREE_DEPTH}"
+                    )
+                    operands = opt.get("operands", 2**depth)
+                    assert 2 <= operands <= 2**depth, (
+                        f"operands must be between 2 and {2**depth}"
+                    )
+                    blueprint_unit["tree"] = {
+                        "depth": depth,
+                        "operands": operands,
+                    }
+                    continue
                 if key == "int":
                     args.reverse()
                     map_args_to_option(
@@ -287,10 +487,32 @@ class MathQuizUnit(QuizUnitBase):
             raise UserConfigError(f"Invalid option '{key}': {e}") from e
 
         try:
-            _assert_math_expression_elements(elems)
+            if "tree" in blueprint_unit:
+                _assert_tree_pool_elements(elems)
+            else:
+                _assert_math_expression_elements(elems)
         except AssertionError as exc:
             raise UserConfigError(f"Invalid math expression: {exc}") from exc
 
+        if blueprint_unit.get("exact_division") and not any(
+            elem["type"] == "operator"
+            and DIVISION_OPERATORS & set(elem["value"])
+            for elem in elems
+        ):
+            raise UserConfigError(
+                "Invalid option 'exact': requires a '/' or '//' operator"
+            )
+        if blueprint_unit.get("exact_division") and blueprint_unit.get(
+            "unique"
+        ):
+            raise UserConfigError(
+                "Options 'exact' and 'unique' cannot be combined"
+            )
+        if "tree" in blueprint_unit and blueprint_unit.get("unique"):
+            raise UserConfigError(
+                "Options 'tree' and 'unique' cannot be combined"
+            )
+
         return blueprint_unit
 
     @classmethod
@@ -322,77 +544,272 @@ class MathQuizUnit(QuizUnitBase):
             args = list(map(str, args))
             opt.update({"args": args})
             options.append(opt)
+        if blueprint_unit.get("exact_division"):
+            options.append({"key": "exact", "args": []})
+        if blueprint_unit.get("unique"):
+            options.append({"key": "unique", "args": []})
+        if "tree" in blueprint_unit:
+            tree = blueprint_unit["tree"]
+            args = [str(tree["depth"]), str(tree["operands"])]
+            options.append({"key": "tree", "args": args})
         return options
 
     @classmethod
-    def _generate_question(cls, elements):
-        expr = ""
-        for elem in elements:
-            elem_type = elem["type"]
-            float_precision_match = re.match(r"float\.(\d+)", elem_type)
-
-            if elem_type == "bracket":
-                expr += elem["value"]
-            elif elem_type in ["int", "float"] or float_precision_match:
-                start = elem["start"]
-                end = elem["end"]
+    def _compile_generation_plan(cls, elements, exact_division=False):
+        """
+        Compile the blueprint elements into a generation plan.
 
-                if elem_type == "int":
-                    expr += str(random.randint(start, end))
+        Everything that does not depend on the random draw (precision, format
+        strings, operator choices, constants and the expression structure) is
+        resolved once, so generating a question only has to draw values.
+        """
+        steps = []
+        tokens = []
+        operator_slots = []
+        mixed_slots = []
+        grids = []
+        slot = 0  # Index of the next drawn value
+        for i, elem in enumerate(elements):
+            elem_type = elem["type"]
+            float_precision_match = FLOAT_PRECISION_PATTERN.match(elem_type)
+            # No space after a function name or an opening bracket, before a
+            # closing bracket or at the end of the expression
+            following = elements[i + 1] if i + 1 < len(elements) else None
+            if (
+                elem_type == "function"
+                or (elem_type == "bracket" and elem["value"] == "(")
+                or following is None
+                or (
+                    following["type"] == "bracket"
+                    and following["value"] == ")"
+                )
+            ):
+                sep = ""
+            else:
+                sep = " "
+
+            if elem_type == "int":
+                steps.append(
+                    (SAMPLE_INT, elem["start"], elem["end"], "{}", sep)
+                )
+                grids.append(
+                    (elem["start"], elem["end"] - elem["start"] + 1, None)
+                )
+                tokens.append((NUMBER, slot))
+                slot += 1
+            elif elem_type == "float" or float_precision_match:
+                fmt = (
+                    f"{{:.{int(float_precision_match.group(1))}f}}"
+                    if float_precision_match
+                    else "{}"
+                )
+                steps.append(
+                    (SAMPLE_FLOAT, elem["start"], elem["end"], fmt, sep)
+                )
+                if float_precision_match:
+                    # The values shown with the given number of decimals
+                    scale = 10 ** int(float_precision_match.group(1))
+                    low = round(elem["start"] * scale)
+                    high = round(elem["end"] * scale)
+                    grids.append((low, high - low + 1, scale))
                 else:
-                    prec = (
-                        int(float_precision_match.group(1))
-                        if float_precision_match
-                        else None
-                    )
-                    d = random.uniform(start, end)
-                    expr += f"{d:.{prec}f}" if prec is not None else str(d)
-
+                    grids.append(None)
+                tokens.append((NUMBER, slot))
+                slot += 1
             elif elem_type == "operator":
-                op = elem["value"]
-                op = random.choice(op)
-                expr += op
-            elif elem_type in ["function", "constant"]:
-                expr += elem["value"]
+                ops = elem["value"]
+                ops = (ops,) if isinstance(ops, str) else tuple(ops)
+                steps.append((CHOOSE, ops, None, "{}", sep))
+                grids.append((0, len(ops), None))
+                tokens.append((OPERATOR, slot))
+                operator_slots.append(slot)
+                if len({PRECEDENCE.get(op) for op in ops}) > 1:
+                    mixed_slots.append(slot)
+                slot += 1
+            elif elem_type in ["bracket", "function", "constant"]:
+                value = elem["value"]
+                steps.append((LITERAL, value + sep, None, None, None))
+                if elem_type == "bracket":
+                    tokens.append((OPEN if value == "(" else CLOSE, None))
+                elif elem_type == "function":
+                    if value not in FUNCTION_TABLE:
+                        raise ValueError(f"Unsupported function '{value}'")
+                    tokens.append((FUNCTION, FUNCTION_TABLE[value]))
+                else:
+                    if value not in CONSTANT_TABLE:
+                        raise ValueError(f"Unsupported constant '{value}'")
+                    tokens.append((VALUE, CONSTANT_TABLE[value]))
             else:
                 raise ValueError(f"Invalid element type '{elem_type}'")
-            expr += " " if elem_type != "function" else ""
+        return _GenerationPlan(
+            steps, tokens, operator_slots, mixed_slots, grids, exact_division
+        )
 
-        return expr.rstrip()
+    @classmethod
+    def _apply_exact_division(cls, plan, slots):
+        """
+        Redraw the operands of divisions backwards: draw a nonzero divisor
+        and a quotient and derive the dividend from them, so the division is
+        exact and the dividend stays in its range. Operands for which no such
+        dividend exists keep their plain draw.
+        """
+        program = plan.program_for(slots)
+        for op_slot, dividend, divisor in plan.divisions_in(program):
+            if slots[op_slot] not in DIVISION_OPERATORS:
+                continue
+            _, start, end, _, _ = plan.sample_steps[divisor]
+            value = _draw_nonzero_int(start, end)
+            if value is None:
+                continue
+            _, start, end, _, _ = plan.sample_steps[dividend]
+            low, high = _quotient_bounds(start, end, value)
+            if low > high:
+                continue
+            slots[divisor] = value
+            slots[dividend] = random.randint(low, high) * value
 
     @classmethod
-    def _envaluate_question(cls, expr):
+    def _generate_question(cls, plan, index=None):
+        """
+        Draw the values of a question, or decode them from `index` into the
+        question space of the plan if given.
+        """
+        slots = []
+        for (kind, a, b, fmt, _), grid in zip(plan.sample_steps, plan.grids):
+            if index is not None and grid is not None:
+                offset, size, scale = grid
+                index, digit = divmod(index, size)
+                if kind == SAMPLE_INT:
+                    slots.append(offset + digit)
+                elif kind == SAMPLE_FLOAT:
+                    slots.append(float(fmt.format((offset + digit) / scale)))
+                else:
+                    slots.append(a[digit])
+            elif kind == SAMPLE_INT:
+                slots.append(random.randint(a, b))
+            elif kind == SAMPLE_FLOAT:
+                # The rounded text is what the question shows
+                slots.append(float(fmt.format(random.uniform(a, b))))
+            else:
+                slots.append(random.choice(a))
+        if plan.exact_division:
+            cls._apply_exact_division(plan, slots)
+
+        parts = []
+        values = iter(slots)
+        for kind, a, _, fmt, sep in plan.steps:
+            if kind == LITERAL:
+                parts.append(a)
+            else:
+                parts.append(fmt.format(next(values)))
+                parts.append(sep)
+        return "".join(parts), slots
+
+    @classmethod
+    def _envaluate_question(cls, plan, slots):
         try:
-            res = eval(expr)
-            float(res) # Ensure the result can be converted to float
-        except ZeroDivisionError:
+            res = evaluate_program(plan.program_for(slots), slots)
+            if isinstance(res, complex):
+                # E.g. a negative base with a fractional exponent
+                res = float("nan")
+            float(res)  # Ensure the result can be converted to float
+        except (ZeroDivisionError, OverflowError):
             res = float("nan")
-        except (ValueError, TypeError, SyntaxError) as exc:
-            raise ValueError(f"Invalid expression '{expr}': {exc}") from exc
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid expression: {exc}") from exc
         return str(res)
 
     @classmethod
-    def _prettify_question(cls, expr):
-        expr = re.sub(r"\(\s+", "(", expr)
-        expr = re.sub(r"\s+\)", ")", expr)
-        return expr
+    def _generate_questions(cls, plan, count):
+        math_batch = cls._vectorized_module("math_batch", count)
+        if math_batch is not None and math_batch.is_vectorizable(plan):
+            return math_batch.generate_batch(plan, count)
+
+        questions = []
+        for _ in range(count):
+            expr, slots = cls._generate_question(plan)
+            answer = cls._envaluate_question(plan, slots)
+            questions.append((expr, answer, cls.derive_grading_key(answer)))
+        return questions
 
     @classmethod
-    def generate_quiz(cls, blueprint_unit):
-        count = blueprint_unit.get("count", 1)
-        quiz = []
+    def _iter_questions(cls, plan, count, unique=False):
+        if unique:
+            # Distinct indices into the question space give distinct
+            # questions without keeping track of the drawn ones
+            for index in unique_indices(plan.space_size, count):
+                expr, slots = cls._generate_question(plan, index)
+                answer = cls._envaluate_question(plan, slots)
+                yield expr, answer, cls.derive_grading_key(answer)
+            return
+
+        yield from cls._iter_chunks(
+            functools.partial(cls._generate_questions, plan), count
+        )
 
-        for _ in range(count):
-            elements = blueprint_unit["elements"]
-            expr = cls._generate_question(elements)
-            answer = cls._envaluate_question(expr)
-            question = cls._prettify_question(expr)
+    @classmethod
+    def _iter_tree_questions(cls, blueprint_unit, count):
+        """
+        Generate questions from random expression trees.
+
+        Every tree shape is compiled into a generation plan once and reused
+        for all questions of that shape. Within a chunk, the questions are
+        grouped by shape, so large groups are still generated in one batch.
+        """
+        tree = blueprint_unit["tree"]
+        exact_division = blueprint_unit.get("exact_division", False)
+        operands, operator = _split_tree_pool(blueprint_unit["elements"])
+        plans = {}
+
+        def generate_chunk(chunk_count):
+            positions = {}
+            for i in range(chunk_count):
+                leaves = random.randint(2, tree["operands"])
+                shape = _random_tree_shape(
+                    leaves, tree["depth"], len(operands)
+                )
+                positions.setdefault(shape, []).append(i)
+
+            questions = [None] * chunk_count
+            for shape, indices in positions.items():
+                plan = plans.get(shape)
+                if plan is None:
+                    elements = _tree_shape_elements(shape, operands, operator)
+                    plan = cls._compile_generation_plan(
+                        elements, exact_division
+                    )
+                    plans[shape] = plan
+                shape_questions = cls._generate_questions(plan, len(indices))
+                for i, question in zip(indices, shape_questions):
+                    questions[i] = question
+            return questions
+
+        return cls._iter_chunks(generate_chunk, count)
 
-            quiz.append(
-                {"question": question, "answer": answer, "category": "math"}
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        count = blueprint_unit.get("count", 1)
+        if "tree" in blueprint_unit:
+            questions = cls._iter_tree_questions(blueprint_unit, count)
+        else:
+            plan = cls._compile_generation_plan(
+                blueprint_unit["elements"],
+                blueprint_unit.get("exact_division", False),
             )
+            unique = blueprint_unit.get("unique", False)
+            questions = cls._iter_questions(plan, count, unique)
+
+        for question, answer, grading_key in questions:
+            yield {
+                "question": question,
+                "answer": answer,
+                "category": "math",
+                "grading_key": grading_key,
+            }
 
-        return quiz
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
 
     @classmethod
     def parse_user_answer(cls, user_answer):
@@ -405,26 +822,45 @@ class MathQuizUnit(QuizUnitBase):
         return str(user_answer)
 
     @classmethod
-    def compare_answers(cls, user_answer, correct_answer):
-        def derive_tol(s):
-            exponent = 0
-            if "e" in s:
-                s, exponent = s.split("e")
-                exponent = int(exponent)
-            tol = "".join(["0" if c.isdigit() else c for c in s])
-            tol = tol[:-1] + "1"
-            return float(tol) * 10**exponent
+    def derive_grading_key(cls, correct_answer):
+        """
+        Precompute the half tolerance of the correct answer.
+        """
+        return _derive_tolerance(correct_answer) / 2
 
+    @classmethod
+    def compare_answer_to_key(cls, user_answer, correct_answer, grading_key):
         if user_answer == correct_answer:
             return True
 
-        if "nan" in (user_answer, correct_answer):
+        # Answers without a finite value only match their string
+        value = float(correct_answer)
+        if not math.isfinite(value) or user_answer == "nan":
             return False
 
-        diff = abs(float(user_answer) - float(correct_answer))
-        tol = max(derive_tol(user_answer), derive_tol(correct_answer)) / 2
+        diff = abs(float(user_answer) - value)
+        tol = max(_derive_tolerance(user_answer) / 2, grading_key)
         return diff <= tol
 
+    @classmethod
+    def grade_answers(cls, user_answers, correct_answers, grading_keys):
+        math_grading = cls._vectorized_module(
+            "math_grading", len(user_answers)
+        )
+        if math_grading is not None:
+            return math_grading.grade_answers(
+                user_answers, correct_answers, grading_keys
+            )
+        return super().grade_answers(
+            user_answers, correct_answers, grading_keys
+        )
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        return cls.compare_answer_to_key(
+            user_answer, correct_answer, cls.derive_grading_key(correct_answer)
+        )
+
     @classmethod
     def prettify_answer(cls, answer):
         answer = answer.rstrip("0").rstrip(".") if "." in answer else answer
@@ -0,0 +1,112 @@
+"""
+Functions and constants available in math blueprints.
+
+The table is self-contained so that importing the math quiz unit does not
+load NumPy or SciPy. The functions follow NumPy's behavior on scalars (e.g.
+`log(0)` is `-inf` and `sqrt(-1)` is `nan` instead of raising) and the
+constants carry the values of `scipy.constants` (CODATA 2022).
+"""
+
+import math
+
+
+# Rounding keeps the sign of the argument, as NumPy does for e.g.
+# ceil(-0.5) == -0.0
+def _ceil(x):
+    if isinstance(x, int) or not math.isfinite(x):
+        return x
+    return math.copysign(float(math.ceil(x)), x)
+
+
+def _floor(x):
+    if isinstance(x, int) or not math.isfinite(x):
+        return x
+    return math.copysign(float(math.floor(x)), x)
+
+
+def _round(x):
+    # Like NumPy, round half to even and keep the type of the argument
+    if isinstance(x, int) or not math.isfinite(x):
+        return x
+    return math.copysign(float(round(x)), x)
+
+
+def _exp(x):
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _logarithm(log):
+    def wrapped(x):
+        if x == 0:
+            return -math.inf
+        if x < 0:
+            return math.nan
+        return log(x)
+
+    return wrapped
+
+
+def _sqrt(x):
+    if x < 0:
+        return math.nan
+    return math.sqrt(x)
+
+
+def _trigonometric(func):
+    def wrapped(x):
+        if math.isinf(x):
+            return math.nan
+        return func(x)
+
+    return wrapped
+
+
+FUNCTION_TABLE = {
+    "abs": abs,
+    "ceil": _ceil,
+    "floor": _floor,
+    "round": _round,
+    "exp": _exp,
+    "log": _logarithm(math.log),
+    "log10": _logarithm(math.log10),
+    "sqrt": _sqrt,
+    "sin": _trigonometric(math.sin),
+    "cos": _trigonometric(math.cos),
+    "tan": _trigonometric(math.tan),
+}
+
+# Functions that return an int for an int argument
+INT_PRESERVING_FUNCTIONS = {"abs", "ceil", "floor", "round"}
+
+_SPEED_OF_LIGHT = 299792458.0
+_PLANCK = 6.62607015e-34
+_GRAVITATIONAL_CONSTANT = 6.6743e-11
+_ELEMENTARY_CHARGE = 1.602176634e-19
+_BOLTZMANN = 1.380649e-23
+_AVOGADRO = 6.02214076e23
+
+CONSTANT_TABLE = {
+    "c": _SPEED_OF_LIGHT,
+    "h": _PLANCK,
+    "hbar": 1.0545718176461565e-34,
+    "G": _GRAVITATIONAL_CONSTANT,
+    "e": _ELEMENTARY_CHARGE,
+    "k": _BOLTZMANN,
+    "N_A": _AVOGADRO,
+    "R": 8.31446261815324,
+    "alpha": 0.0072973525643,
+    "mu_0": 1.25663706127e-06,
+    "epsilon_0": 8.8541878188e-12,
+    "sigma": 5.6703744191844314e-08,
+    "zero_Celsius": 273.15,
+    "pi": math.pi,
+    "Avogadro": _AVOGADRO,
+    "Boltzmann": _BOLTZMANN,
+    "Planck": _PLANCK,
+    "speed_of_light": _SPEED_OF_LIGHT,
+    "elementary_charge": _ELEMENTARY_CHARGE,
+    "gravitational_constant": _GRAVITATIONAL_CONSTANT,
+}
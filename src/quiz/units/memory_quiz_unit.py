@@ -1,7 +1,22 @@
-import random
+import math
+import threading
+from collections import OrderedDict
 
 from quiz.units.exceptions import UserConfigError
 from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.weighted_sampling import (
+    MAX_WEIGHT,
+    MIN_WEIGHT,
+    FenwickSampler,
+)
+
+DEFAULT_WEIGHT = 1.0
+
+# Samplers of stored decks by their `deck_id`, which is replaced whenever
+# the items of the deck change, least recently used first
+MAX_CACHED_DECKS = 32
+_deck_samplers = OrderedDict()
+_deck_samplers_lock = threading.Lock()
 
 
 def _assert_valid_key(key):
@@ -10,9 +25,72 @@ def _assert_valid_key(key):
     pass
 
 
+def _parse_weight(arg):
+    # Weights are positive numbers, relative to the default weight of 1
+    try:
+        weight = float(arg)
+    except ValueError:
+        weight = None
+    assert (
+        weight is not None and math.isfinite(weight) and weight > 0
+    ), f"argument '{arg}' must be 'off', 'on' or a positive weight"
+    assert (
+        MIN_WEIGHT <= weight <= MAX_WEIGHT
+    ), f"weight must be between {MIN_WEIGHT:g} and {MAX_WEIGHT:g}"
+    return weight
+
+
 def _assert_valid_value(value):
-    # No specific validation for value, but can be extended
-    pass
+    # Values are single words, as in the text format of the options
+    assert value and not any(
+        char.isspace() for char in value
+    ), "value must be a non-empty word without whitespace"
+
+
+def _parse_item(key, args):
+    """
+    Parse the arguments `<value> [on|off] [<weight>]` of a memory item.
+    """
+    assert len(args) in (
+        1,
+        2,
+        3,
+    ), "only one to three arguments are allowed"
+    value, *rest = args
+    enable = True
+    if rest and rest[0].lower() in ["off", "on"]:
+        enable = rest.pop(0).lower() == "on"
+    weight = _parse_weight(rest.pop(0)) if rest else DEFAULT_WEIGHT
+    assert not rest, "second argument must be 'off' or 'on'"
+    _assert_valid_key(key)
+    _assert_valid_value(value)
+    return {"key": key, "value": value, "enable": enable, "weight": weight}
+
+
+def _deck_sampler(blueprint_unit):
+    """
+    Return the weighted sampler of the items of a memory blueprint unit.
+
+    Units with a `deck_id` reuse the sampler of their deck, so a quiz only
+    pays for its draws. Other units build a sampler per quiz.
+    """
+    deck_id = blueprint_unit.get("deck_id")
+    with _deck_samplers_lock:
+        sampler = _deck_samplers.pop(deck_id, None)
+    if sampler is None:
+        # Disabled items keep their position with weight 0
+        sampler = FenwickSampler(
+            [
+                item.get("weight", DEFAULT_WEIGHT) if item["enable"] else 0.0
+                for item in blueprint_unit["items"]
+            ]
+        )
+    if deck_id is not None:
+        with _deck_samplers_lock:
+            _deck_samplers[deck_id] = sampler
+            if len(_deck_samplers) > MAX_CACHED_DECKS:
+                _deck_samplers.popitem(last=False)
+    return sampler
 
 
 class MemoryQuizUnit(QuizUnitBase):
@@ -31,38 +109,65 @@ class MemoryQuizUnit(QuizUnitBase):
             for opt in options:
                 key = opt.pop("key")
                 args = opt.pop("args")
-                assert len(args) in (
-                    1,
-                    2,
-                ), "only one or two arguments are allowed"
-                value = args[0]
-                if len(args) == 2:
-                    status = args[1].lower()
-                    assert status in [
-                        "off",
-                        "on",
-                    ], "second argument must be 'off' or 'on'"
-                    enable = status == "on"
-                else:
-                    enable = True
-                _assert_valid_key(key)
-                _assert_valid_value(value)
-                items.append({"key": key, "value": value, "enable": enable})
+                if key == "review" and not args:
+                    # Without a value, 'review' is the mode flag
+                    unit_bp["review"] = True
+                    continue
+                items.append(_parse_item(key, args))
         except AssertionError as e:
             raise UserConfigError(
                 f"Invalid option '{key}': {e}"
             ) from e
         return unit_bp
 
+    @classmethod
+    def transform_rows_to_items(cls, rows):
+        """
+        Lazily convert table rows `<key>,<value>[,on|off][,<weight>]` to
+        memory items, e.g. the rows of a CSV reader over an uploaded deck.
+
+        Parameters
+        ----------
+        rows : iterable of list of str
+            The rows. Empty rows are skipped.
+
+        Yields
+        ------
+        dict
+            The items, as in the `items` of the memory blueprint unit.
+
+        Raises
+        ------
+        UserConfigError
+            If a row is not a valid memory item.
+        """
+        for line, row in enumerate(rows, 1):
+            row = [cell.strip() for cell in row]
+            while row and not row[-1]:
+                row.pop()
+            if not row:
+                continue
+            try:
+                yield _parse_item(row[0], row[1:])
+            except AssertionError as e:
+                raise UserConfigError(
+                    f"Invalid row {line} '{row[0]}': {e}"
+                ) from e
+
     @classmethod
     def transform_blueprint_unit_to_options(cls, blueprint_unit):
         """
         Convert a blueprint unit back to options for the memory quiz.
         """
         options = []
+        if blueprint_unit.get("review"):
+            options.append({"key": "review", "args": []})
         for item in blueprint_unit["items"]:
             args = [item["value"]]
             args += ["on" if item["enable"] else "off"]
+            weight = item.get("weight", DEFAULT_WEIGHT)
+            if weight != DEFAULT_WEIGHT:
+                args.append(str(weight))
             options.append({"key": item["key"], "args": args})
         return options
 
@@ -73,30 +178,37 @@ class MemoryQuizUnit(QuizUnitBase):
         """
         count = blueprint_unit["count"]
 
-        items = [
-            (item["key"], item["value"])
-            for item in blueprint_unit["items"]
-            if item["enable"]
-        ]
-        if not items or len(items) < count:
+        items = blueprint_unit["items"]
+        sampler = _deck_sampler(blueprint_unit)
+        if sampler.population < count:
             raise UserConfigError(
                 "Not enough enabled items to generate the quiz"
             )
-        selected_items = random.sample(items, count)
+        selected_items = [
+            (items[i]["key"], items[i]["value"])
+            for i in sampler.sample(count)
+        ]
 
         quiz = []
         for item in selected_items:
             name, value = item
             question = f"What is the value of '{name}'?"
-            quiz.append(
-                {
-                    "question": question,
-                    "answer": value,
-                    "category": "memory",
-                }
-            )
+            quiz_item = {
+                "question": question,
+                "answer": value,
+                "category": "memory",
+            }
+            if blueprint_unit.get("review"):
+                # Identifies the item when the review results are recorded
+                quiz_item["item_key"] = name
+            quiz.append(quiz_item)
         return quiz
 
+    @classmethod
+    def has_distinct_draws(cls, blueprint_unit):
+        # Items are drawn without replacement
+        return True
+
     @classmethod
     def parse_user_answer(cls, user_answer):
         return str(user_answer)
@@ -0,0 +1,94 @@
+"""
+Sampling of distinct indices from large index spaces.
+
+Quiz units with a `unique` option enumerate their question space as
+`range(size)` and map `0, 1, 2, ...` through a keyed pseudo-random
+permutation of that range. The drawn indices are distinct by construction,
+so neither a set of seen questions nor a rejection loop is needed and the
+cost stays O(count), however large the space is.
+"""
+
+import random
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix(value):
+    # Finalizer of the splitmix64 generator
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class FeistelPermutation:
+    """
+    Keyed pseudo-random permutation of `range(size)`.
+
+    A balanced Feistel network permutes the smallest power of four covering
+    `size`. Values outside of `range(size)` are encrypted again (cycle
+    walking) until they fall inside, which takes less than four rounds on
+    average.
+
+    Parameters
+    ----------
+    size : int
+        Size of the permuted range.
+    key : int, optional
+        Key of the permutation, drawn from `random` if not given.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, key=None):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.size = size
+        self._half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._mask = (1 << self._half_bits) - 1
+        key = random.getrandbits(64) if key is None else key
+        self._round_keys = tuple(
+            _mix((key + i) & _MASK_64) for i in range(self.ROUNDS)
+        )
+
+    def _encrypt(self, value):
+        left, right = value >> self._half_bits, value & self._mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ (_mix(right ^ round_key) & self._mask)
+        return (left << self._half_bits) | right
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+def unique_indices(size, count):
+    """
+    Yield `count` pseudo-random indices from `range(size)`.
+
+    The indices are distinct as long as `count` does not exceed `size`.
+    Larger counts continue with a freshly keyed permutation after every
+    `size` indices, so every index occurs once per cycle.
+
+    Parameters
+    ----------
+    size : int
+        Size of the index space.
+    count : int
+        Number of indices to draw.
+
+    Yields
+    ------
+    int
+        The drawn indices.
+    """
+    for cycle_start in range(0, count, size):
+        permutation = FeistelPermutation(size)
+        for i in range(min(size, count - cycle_start)):
+            yield permutation[i]
@@ -1,5 +1,13 @@
+import importlib
 from abc import ABC, abstractmethod
 
+# Quizzes with at least this many questions are generated and graded in one
+# vectorized batch
+VECTORIZE_MIN_COUNT = 200
+
+# Questions are streamed in chunks of at most this many questions
+STREAM_CHUNK_COUNT = 10000
+
 
 class QuizUnitBase(ABC):
     """
@@ -83,6 +91,99 @@ class QuizUnitBase(ABC):
         """
         pass
 
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        """
+        Lazily generate the quiz questions of a blueprint unit.
+
+        Yields the same elements as `generate_quiz`. Units that can generate
+        their questions one by one (or in chunks) override this method, so
+        that streaming consumers keep memory constant regardless of the
+        count. By default, the list of `generate_quiz` is iterated.
+
+        Parameters
+        ----------
+        blueprint_unit : dict
+            A dictionary that includes all required configuration parameters
+            and a 'count' field indicating how many quiz items to generate.
+
+        Yields
+        ------
+        dict
+            Quiz elements, as returned by `generate_quiz`.
+        """
+        yield from cls.generate_quiz(blueprint_unit)
+
+    @classmethod
+    def _iter_chunks(cls, generate_chunk, count):
+        """
+        Generate questions in chunks of at most `STREAM_CHUNK_COUNT`, so that
+        streaming consumers keep memory constant regardless of the count.
+
+        Parameters
+        ----------
+        generate_chunk : callable
+            Called with the number of questions of a chunk, returns the
+            generated questions.
+        count : int
+            Number of questions to generate.
+
+        Yields
+        ------
+        Any
+            The questions returned by `generate_chunk`, in order.
+        """
+        for start in range(0, count, STREAM_CHUNK_COUNT):
+            yield from generate_chunk(min(STREAM_CHUNK_COUNT, count - start))
+
+    @classmethod
+    def _vectorized_module(cls, name, count):
+        """
+        Import the NumPy module `quiz.units.<name>` if `count` questions or
+        answers are worth vectorizing.
+
+        NumPy is only needed for large quizzes, small ones are handled one by
+        one without importing it.
+
+        Parameters
+        ----------
+        name : str
+            Name of the module, e.g. 'math_batch'.
+        count : int
+            Number of questions or answers to process.
+
+        Returns
+        -------
+        module or None
+            The module, or None below `VECTORIZE_MIN_COUNT`.
+        """
+        if count < VECTORIZE_MIN_COUNT:
+            return None
+        return importlib.import_module(f"quiz.units.{name}")
+
+    @classmethod
+    def has_distinct_draws(cls, blueprint_unit):
+        """
+        Whether the questions of a blueprint unit must be drawn in a single
+        generation call.
+
+        Units that draw without replacement (e.g. with a `unique` option)
+        only avoid repetitions within one call, so their blocks must not be
+        split into chunks generated independently. By default, this holds
+        for blueprint units with the `unique` option.
+
+        Parameters
+        ----------
+        blueprint_unit : dict
+            The blueprint unit to generate.
+
+        Returns
+        -------
+        bool
+            True if the questions must be generated in one call.
+        """
+        return bool(blueprint_unit.get("unique"))
+
     @classmethod
     @abstractmethod
     def parse_user_answer(cls, user_answer):
@@ -126,6 +227,81 @@ class QuizUnitBase(ABC):
         """
         pass
 
+    @classmethod
+    def derive_grading_key(cls, correct_answer):
+        """
+        Precompute what is needed to grade answers to a question, beyond the
+        correct answer itself.
+
+        Units whose comparison does work on the correct answer (e.g. deriving
+        tolerances) can override this method to do it once at generation
+        time. By default, no key is needed.
+
+        Parameters
+        ----------
+        correct_answer : str
+            The correct answer of the question.
+
+        Returns
+        -------
+        Any
+            A JSON-serializable grading key, passed to
+            `compare_answer_to_key` together with the correct answer.
+        """
+        return None
+
+    @classmethod
+    def compare_answer_to_key(cls, user_answer, correct_answer, grading_key):
+        """
+        Compare a user-provided answer with the correct answer and its
+        precomputed grading key.
+
+        Parameters
+        ----------
+        user_answer : str
+            The parsed user answer.
+        correct_answer : str
+            The correct answer of the question.
+        grading_key : Any
+            The key returned by `derive_grading_key` for the correct answer.
+
+        Returns
+        -------
+        bool
+            True if the answer is correct; otherwise False.
+        """
+        return cls.compare_answers(user_answer, correct_answer)
+
+    @classmethod
+    def grade_answers(cls, user_answers, correct_answers, grading_keys):
+        """
+        Grade several answers of this unit at once.
+
+        By default, every answer is compared with `compare_answer_to_key`.
+        Units can override this method to grade large submissions in one
+        vectorized pass.
+
+        Parameters
+        ----------
+        user_answers : list of str
+            The parsed user answers.
+        correct_answers : list of str
+            The correct answers of the corresponding questions.
+        grading_keys : list
+            The grading keys of the corresponding questions.
+
+        Returns
+        -------
+        list of bool
+            Whether each answer is correct.
+        """
+        return [
+            cls.compare_answer_to_key(user_answer, correct_answer, grading_key)
+            for user_answer, correct_answer, grading_key in zip(
+                user_answers, correct_answers, grading_keys
+            )
+        ]
+
     @classmethod
     @abstractmethod
     def prettify_answer(cls, answer):
@@ -0,0 +1,96 @@
+"""
+Lazy registry of the quiz units.
+
+The registry maps categories to the import paths of their unit classes and
+imports a unit module the first time its category is looked up, so a
+process only loads the units it actually serves. Units of other packages
+are discovered through the `ENTRY_POINT_GROUP` entry point group, e.g. in
+the `pyproject.toml` of the plugin:
+
+    [project.entry-points."mental_math_challenge.quiz_units"]
+    roman = "roman_quiz.unit:RomanQuizUnit"
+
+Built-in units take precedence over entry points of the same category.
+"""
+
+import importlib
+from collections.abc import Mapping
+
+from quiz.units.quiz_unit_base import QuizUnitBase
+
+ENTRY_POINT_GROUP = "mental_math_challenge.quiz_units"
+
+
+def _load_unit(path):
+    """
+    Import a unit class from a path like 'package.module:ClassName'.
+    """
+    module_name, _, class_name = path.partition(":")
+    unit = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(unit, type) and issubclass(unit, QuizUnitBase)):
+        raise TypeError(
+            f"Quiz unit '{path}' is not a subclass of QuizUnitBase"
+        )
+    return unit
+
+
+class QuizUnitRegistry(Mapping):
+    """
+    Read-only mapping of categories to quiz unit classes, importing each
+    unit on first access.
+
+    Parameters
+    ----------
+    paths : dict of str to str
+        Import paths of the built-in units by category, as
+        'package.module:ClassName'.
+    entry_point_group : str, optional
+        Entry point group to discover further units in. The entry points are
+        only read once a category is not found among the built-in units, or
+        when all categories are listed.
+    """
+
+    def __init__(self, paths, entry_point_group=None):
+        self._paths = dict(paths)
+        self._units = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        # importlib.metadata is slow to import, only plugins need it
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._entry_point_group):
+            self._paths.setdefault(entry_point.name, entry_point.value)
+
+    def __getitem__(self, category):
+        unit = self._units.get(category)
+        if unit is not None:
+            return unit
+        if category not in self._paths:
+            self._discover()
+        path = self._paths[category]
+        unit = self._units[category] = _load_unit(path)
+        return unit
+
+    def __contains__(self, category):
+        if category not in self._paths:
+            self._discover()
+        return category in self._paths
+
+    def __iter__(self):
+        self._discover()
+        return iter(self._paths)
+
+    def __len__(self):
+        self._discover()
+        return len(self._paths)
+
+    def loaded_categories(self):
+        """
+        Return the categories whose units were imported so far.
+        """
+        return list(self._units)
@@ -38,3 +38,39 @@ def map_args_to_option(option, args, mapping, required_length=0):
             raise MappingError(
                 f"Invalid argument '{arg}'"
             ) from e
+
+
+def add_kind_option(kinds, key, args):
+    """
+    Record an option selecting a kind of questions, e.g. 'gcd'.
+
+    Parameters:
+    ---------
+    kinds (set): The kinds selected so far, updated in place.
+    key (str): The option key, one of the kinds of the unit.
+    args (list): The arguments of the option. Kind options take none.
+    """
+    if key in kinds:
+        raise MappingError(
+            f"Option '{key}' defined multiple times."
+        )
+    map_args_to_option({}, args, [])
+    kinds.add(key)
+
+
+def resolve_kinds(kinds, question_kinds):
+    """
+    Return the selected kinds in the order of `question_kinds`. Without a
+    kind option, all kinds of questions are asked.
+    """
+    return [kind for kind in question_kinds if kind in kinds or not kinds]
+
+
+def kinds_to_options(kinds, question_kinds):
+    """
+    Convert the kinds of a blueprint unit back to options. No options are
+    needed if all kinds are asked.
+    """
+    if len(kinds) == len(question_kinds):
+        return []
+    return [{"key": kind, "args": []} for kind in kinds]
@@ -0,0 +1,191 @@
+import random
+
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.permutation import unique_indices
+from quiz.units.quiz_unit_base import QuizUnitBase
+from quiz.units.shared import (
+    MappingError,
+    add_kind_option,
+    kinds_to_options,
+    map_args_to_option,
+    resolve_kinds,
+)
+
+DEFAULT_START = 1
+DEFAULT_END = 12
+
+# Larger configurations are rejected, a drill should be able to cover all
+# of its facts
+MAX_FACTS = 100000
+
+# Kinds of questions, in the order of the options
+QUESTION_KINDS = ("multiply", "square", "cube", "sqrt")
+
+
+def _count_facts(start, end, kinds):
+    """
+    Return the number of facts of the given kinds in the range.
+    """
+    size = end - start + 1
+    return sum(size * size if kind == "multiply" else size for kind in kinds)
+
+
+def _fact_at(start, end, kinds, index):
+    """
+    Return the question and answer of a fact by its index.
+
+    The facts are ordered by kind, then by operands, so the operands follow
+    from the index. No table of the facts is kept in memory, only the
+    strings of the drawn facts are formatted.
+
+    Parameters
+    ----------
+    start : int
+        Smallest number of the tables.
+    end : int
+        Largest number of the tables.
+    kinds : sequence of str
+        Kinds of facts, see `QUESTION_KINDS`.
+    index : int
+        Index of the fact, below `_count_facts(start, end, kinds)`.
+
+    Returns
+    -------
+    tuple[str, str]
+        The question and its answer.
+    """
+    size = end - start + 1
+    for kind in kinds:
+        kind_count = size * size if kind == "multiply" else size
+        if index < kind_count:
+            break
+        index -= kind_count
+
+    if kind == "multiply":
+        a, b = divmod(index, size)
+        a, b = a + start, b + start
+        return f"{a} * {b}", str(a * b)
+    n = start + index
+    if kind == "square":
+        return f"{n} ** 2", str(n * n)
+    if kind == "cube":
+        return f"{n} ** 3", str(n * n * n)
+    return f"sqrt({n * n})", str(n)
+
+
+class TablesQuizUnit(QuizUnitBase):
+    """
+    Quiz unit for drilling multiplication tables, squares, cubes and square
+    roots of perfect squares.
+    """
+
+    @classmethod
+    def transform_options_to_blueprint_unit(cls, options):
+        """
+        Convert options to a blueprint unit for the tables quiz.
+        """
+        unit_bp = {}
+        kinds = set()
+        try:
+            for opt in options:
+                key = opt.pop("key")
+                args = opt.pop("args")
+                if key == "start" and "start" not in unit_bp:
+                    map_args_to_option(opt, args, [("start", int)], 1)
+                elif key == "end" and "end" not in unit_bp:
+                    map_args_to_option(opt, args, [("end", int)], 1)
+                elif key == "unique" and "unique" not in unit_bp:
+                    map_args_to_option(opt, args, [])
+                    opt["unique"] = True
+                elif key in ["start", "end", "unique"]:
+                    raise MappingError(
+                        f"Option '{key}' defined multiple times."
+                    )
+                elif key in QUESTION_KINDS:
+                    add_kind_option(kinds, key, args)
+                else:
+                    raise UserConfigError(
+                        f"Unknown option key: {key}"
+                    )
+                unit_bp.update(opt)
+        except MappingError as e:
+            raise UserConfigError(
+                f"Invalid option {key}: {e}"
+            ) from e
+        unit_bp.setdefault("start", DEFAULT_START)
+        unit_bp.setdefault("end", DEFAULT_END)
+        if unit_bp["start"] < 0:
+            raise UserConfigError(
+                "Start must not be negative."
+            )
+        if unit_bp["start"] > unit_bp["end"]:
+            raise UserConfigError(
+                "Start > end."
+            )
+        unit_bp["kinds"] = resolve_kinds(kinds, QUESTION_KINDS)
+        facts = _count_facts(
+            unit_bp["start"], unit_bp["end"], unit_bp["kinds"]
+        )
+        if facts > MAX_FACTS:
+            raise UserConfigError(
+                f"Too many facts ({facts}), at most {MAX_FACTS} are allowed."
+            )
+        return unit_bp
+
+    @classmethod
+    def transform_blueprint_unit_to_options(cls, blueprint_unit):
+        """
+        Convert a blueprint unit back to options for the tables quiz.
+        """
+        options = []
+        options.append(
+            {"key": "start", "args": [str(blueprint_unit["start"])]}
+        )
+        options.append(
+            {"key": "end", "args": [str(blueprint_unit["end"])]}
+        )
+        options += kinds_to_options(blueprint_unit["kinds"], QUESTION_KINDS)
+        if blueprint_unit.get("unique"):
+            options.append({"key": "unique", "args": []})
+        return options
+
+    @classmethod
+    def iter_questions(cls, blueprint_unit):
+        start = blueprint_unit["start"]
+        end = blueprint_unit["end"]
+        kinds = blueprint_unit["kinds"]
+        size = _count_facts(start, end, kinds)
+        count = blueprint_unit["count"]
+        if blueprint_unit.get("unique"):
+            # Every fact once per cycle, in a fresh order each cycle
+            indices = unique_indices(size, count)
+        else:
+            indices = (random.randrange(size) for _ in range(count))
+        for index in indices:
+            question, answer = _fact_at(start, end, kinds, index)
+            yield {
+                "question": question,
+                "answer": answer,
+                "category": "tables",
+            }
+
+    @classmethod
+    def generate_quiz(cls, blueprint_unit):
+        return list(cls.iter_questions(blueprint_unit))
+
+    @classmethod
+    def parse_user_answer(cls, user_answer):
+        try:
+            return str(int(user_answer.strip()))
+        except ValueError as e:
+            raise UserResponseError(
+                f"Invalid answer '{user_answer}'. Answer must be an integer."
+            ) from e
+
+    @classmethod
+    def compare_answers(cls, user_answer, correct_answer):
+        return user_answer == correct_answer
+
+    @classmethod
+    def prettify_answer(cls, answer):
+        return answer
@@ -0,0 +1,109 @@
+"""
+Weighted sampling without replacement from large item lists.
+
+The weights are stored in a Fenwick tree (binary indexed tree), so that
+drawing an item and removing its weight both take O(log n). The weights are
+resolved to integer multiples of `1 / WEIGHT_SCALE`, which keeps the tree
+exact: removing a drawn weight leaves no rounding residue, so every draw
+lands on an item that was not drawn yet.
+"""
+
+import random
+import threading
+
+# Weights are resolved to multiples of 1 / WEIGHT_SCALE and clamped to
+# [MIN_WEIGHT, MAX_WEIGHT], positive weights are never rounded to zero
+WEIGHT_SCALE = 1000
+MIN_WEIGHT = 1 / WEIGHT_SCALE
+MAX_WEIGHT = 1000.0
+
+
+def _resolve_weight(weight):
+    if weight < 0:
+        raise ValueError("weights must not be negative")
+    if weight == 0:
+        return 0
+    weight = min(max(weight, MIN_WEIGHT), MAX_WEIGHT)
+    return max(1, round(weight * WEIGHT_SCALE))
+
+
+class FenwickSampler:
+    """
+    Weighted sampler over `range(len(weights))` backed by a Fenwick tree.
+
+    Parameters
+    ----------
+    weights : sequence of float
+        Non-negative weights of the items. Items with weight 0 are never
+        drawn, other weights are clamped to [MIN_WEIGHT, MAX_WEIGHT].
+    """
+
+    def __init__(self, weights):
+        weights = [_resolve_weight(weight) for weight in weights]
+        size = len(weights)
+        tree = [0] * (size + 1)
+        for i, weight in enumerate(weights, 1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.size = size
+        self.population = sum(1 for weight in weights if weight > 0)
+        self._weights = weights
+        self._total = sum(weights)
+        self._tree = tree
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+        # Draws modify the tree temporarily
+        self._lock = threading.Lock()
+
+    def _add(self, index, delta):
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _find(self, target):
+        # Smallest index whose prefix sum exceeds target
+        tree = self._tree
+        position = 0
+        step = self._top
+        while step:
+            candidate = position + step
+            if candidate <= self.size and tree[candidate] <= target:
+                position = candidate
+                target -= tree[candidate]
+            step >>= 1
+        return position
+
+    def sample(self, count):
+        """
+        Draw `count` distinct indices with probabilities proportional to
+        their weights.
+
+        Parameters
+        ----------
+        count : int
+            Number of indices to draw.
+
+        Returns
+        -------
+        list of int
+            The drawn indices, in the order they were drawn.
+        """
+        if count > self.population:
+            raise ValueError("count exceeds the number of weighted items")
+        indices = []
+        with self._lock:
+            total = self._total
+            for _ in range(count):
+                index = self._find(random.randrange(total))
+                weight = self._weights[index]
+                indices.append(index)
+                self._add(index, -weight)
+                total -= weight
+            # Restore the drawn weights, so the sampler stays reusable
+            # without copying the tree
+            for index in indices:
+                self._add(index, self._weights[index])
+        return indices
+
@@ -1,3 +1,4 @@
+import io
 import json
 import unittest
 
@@ -6,7 +7,7 @@ from flask import Flask
 from app import db
 from app.auth_service import AuthService
 from app.blueprint_service import BlueprintService
-from app.models import User, UserBlueprint
+from app.models import MemoryItem, User, UserBlueprint
 from quiz import parse_blueprint_from_text
 from tests.utils.base_test_case import BaseTestCase
 
@@ -84,6 +85,145 @@ class BlueprintServiceTest(BaseTestCase):
 
         self.assertEqual(bp["blueprint"], expected_blueprint)
 
+    def test_import_memory_deck(self):
+        user = self._register_user("erin", "Strong1!")
+        deck = io.BytesIO(b"fruit,apple\ncolor,blue,off\nanimal,dog,on,2\n")
+        success, msg = self.bp_service.import_memory_deck(
+            user.id, "deck", "desc", deck, count=2
+        )
+        self.assertTrue(success, msg)
+
+        bp = self.bp_service.get_user_blueprint(
+            user.id, "deck", with_items=True
+        )
+        (unit, category), = bp["blueprint"]
+        self.assertEqual(category, "memory")
+        self.assertEqual(unit["count"], 2)
+        self.assertEqual(
+            [item["key"] for item in unit["items"]],
+            ["fruit", "color", "animal"],
+        )
+        self.assertFalse(unit["items"][1]["enable"])
+        self.assertEqual(unit["items"][2]["weight"], 2.0)
+
+    def test_import_memory_deck_tsv(self):
+        user = self._register_user("frank", "Strong1!")
+        deck = io.BytesIO("\ufefffruit\tapple\n".encode("utf-8"))
+        success, msg = self.bp_service.import_memory_deck(
+            user.id, "deck", "", deck, count=1, delimiter="\t"
+        )
+        self.assertTrue(success, msg)
+        bp = self.bp_service.get_user_blueprint(
+            user.id, "deck", with_items=True
+        )
+        self.assertEqual(bp["blueprint"][0][0]["items"][0]["key"], "fruit")
+
+    def test_import_invalid_memory_deck(self):
+        user = self._register_user("grace", "Strong1!")
+        cases = [
+            (b"fruit,apple\nbad key,x\n", 1),
+            (b"fruit,apple\nfruit,pear\n", 1),
+            (b"", 1),
+            (b"fruit,apple\n", 0),
+            (b"\xff\xfe,x\n", 1),
+        ]
+        for content, count in cases:
+            with self.subTest(content=content, count=count):
+                success, _ = self.bp_service.import_memory_deck(
+                    user.id, "deck", "", io.BytesIO(content), count=count
+                )
+                self.assertFalse(success)
+        self.assertIsNone(self.bp_service.get_user_blueprint(user.id, "deck"))
+
+    def test_memory_items_stored_as_rows(self):
+        user = self._register_user("heidi", "Strong1!")
+        blueprint_text = "math: 1\n int 1 10\n\nmemory: 1\n a x\n b y off\n"
+        success, msg = self.bp_service.add_user_blueprint(
+            user.id, "bp1", "", blueprint_text
+        )
+        self.assertTrue(success, msg)
+
+        # The stored JSON and the default entry carry no items
+        bp = self.bp_service.get_user_blueprint(user.id, "bp1")
+        self.assertNotIn("items", bp["blueprint"][1][0])
+        stored = db.session.get(UserBlueprint, bp["id"])
+        self.assertNotIn("items", json.loads(stored.blueprint)[1][0])
+        rows = MemoryItem.query.filter_by(blueprint_id=bp["id"]).all()
+        self.assertEqual(
+            [(row.block, row.key, row.enable) for row in rows],
+            [(1, "a", True), (1, "b", False)],
+        )
+
+        expected = json.loads(
+            json.dumps(parse_blueprint_from_text(blueprint_text))
+        )
+        # The memory block is identified by its deck id
+        deck_id = bp["blueprint"][1][0]["deck_id"]
+        expected[1][0]["deck_id"] = deck_id
+        loaded = self.bp_service.load_memory_items(
+            bp["id"], bp["blueprint"]
+        )
+        self.assertEqual(loaded, [tuple(block) for block in expected])
+        with_items = self.bp_service.get_user_blueprint(
+            user.id, "bp1", with_items=True
+        )
+        self.assertEqual(with_items["blueprint"], loaded)
+
+    def test_update_replaces_memory_items(self):
+        user = self._register_user("ivan", "Strong1!")
+        self.bp_service.add_user_blueprint(
+            user.id, "bp1", "", "memory: 1\n a x\n b y\n"
+        )
+        deck_id_before_update = self.bp_service.get_user_blueprint(
+            user.id, "bp1"
+        )["blueprint"][0][0]["deck_id"]
+        success, msg = self.bp_service.update_user_blueprint(
+            user.id, "bp1", "", "memory: 1\n c z\n"
+        )
+        self.assertTrue(success, msg)
+        bp = self.bp_service.get_user_blueprint(user.id, "bp1")
+        keys = [
+            row.key
+            for row in MemoryItem.query.filter_by(blueprint_id=bp["id"])
+        ]
+        self.assertEqual(keys, ["c"])
+        self.assertNotEqual(
+            bp["blueprint"][0][0]["deck_id"], deck_id_before_update
+        )
+
+        success, _ = self.bp_service.update_user_blueprint(
+            user.id, "bp1", "", "memory: 1\n c z\n c w\n"
+        )
+        self.assertFalse(success)
+
+    def test_set_memory_item_enabled(self):
+        user = self._register_user("judy", "Strong1!")
+        self.bp_service.add_user_blueprint(
+            user.id, "bp1", "", "memory: 1\n a x\n b y\n"
+        )
+        # Loading with an outdated session blueprint
+        session_blueprint = self.bp_service.get_user_blueprint(
+            user.id, "bp1"
+        )["blueprint"]
+        deck_id = session_blueprint[0][0]["deck_id"]
+        success, _ = self.bp_service.set_memory_item_enabled(
+            user.id, "bp1", "a", False
+        )
+        self.assertTrue(success)
+        bp = self.bp_service.get_user_blueprint(
+            user.id, "bp1", with_items=True
+        )
+        items = bp["blueprint"][0][0]["items"]
+        self.assertEqual([item["enable"] for item in items], [False, True])
+        self.assertNotEqual(bp["blueprint"][0][0]["deck_id"], deck_id)
+        loaded = self.bp_service.load_memory_items(bp["id"], session_blueprint)
+        self.assertEqual(loaded, bp["blueprint"])
+
+        success, _ = self.bp_service.set_memory_item_enabled(
+            user.id, "bp1", "missing", False
+        )
+        self.assertFalse(success)
+
     def test_get_user_blueprints_list(self):
         user = self._register_user("carol", "Strong1!")
         bp1 = "math: 1\n int 1 10\n"
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+from quiz.units import convert_batch
+from quiz.units.convert_quiz_unit import (
+    CONVERSION_MATRIX,
+    ConvertQuizUnit,
+    _format_value,
+)
+from tests.utils.base_test_case import BaseTestCase
+
+CONVERSIONS = [
+    {"from": "km", "to": "mi", "start": 0, "end": 100},
+    {"from": "F", "to": "C", "start": -100, "end": 100},
+]
+
+
+class ConvertBatchGenerateBatchTest(BaseTestCase):
+    def test_answers_match_scalar_conversion(self):
+        batch = convert_batch.generate_batch(CONVERSIONS, 3, 500)
+        self.assertEqual(len(batch), 500)
+        for question, answer in batch:
+            with self.subTest(question=question):
+                value, source, _, target = question.split()
+                key = (source.lstrip("°"), target.lstrip("°"))
+                factor, shift = CONVERSION_MATRIX[key]
+                self.assertEqual(
+                    answer, _format_value(int(value) * factor + shift, 3)
+                )
+                conversion = CONVERSIONS[0 if key == ("km", "mi") else 1]
+                self.assertTrue(
+                    conversion["start"] <= int(value) <= conversion["end"]
+                )
+
+
+class ConvertQuizBatchDispatchTest(BaseTestCase):
+    def test_large_quiz_uses_batch(self):
+        blueprint = {"conversions": CONVERSIONS, "precision": 2, "count": 300}
+        generate_batch = convert_batch.generate_batch
+        with patch.object(
+            convert_batch, "generate_batch", wraps=generate_batch
+        ) as mock_batch:
+            quiz = ConvertQuizUnit.generate_quiz(blueprint)
+        mock_batch.assert_called_once_with(CONVERSIONS, 2, 300)
+        self.assertEqual(len(quiz), 300)
+        self.assertTrue(all(q["category"] == "convert" for q in quiz))
+
+
+if __name__ == "__main__":
+    unittest.main()
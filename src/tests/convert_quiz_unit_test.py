@@ -0,0 +1,227 @@
+import unittest
+from copy import deepcopy
+
+from quiz.units.convert_quiz_unit import (
+    CONVERSION_MATRIX,
+    ConvertQuizUnit,
+    _format_value,
+)
+from quiz.units.exceptions import UserConfigError, UserResponseError
+
+# Unit keys by their labels in the questions
+UNIT_SYMBOLS = {
+    "km": "km",
+    "mi": "mi",
+    "kg": "kg",
+    "lb": "lb",
+    "K": "K",
+    "°C": "C",
+    "°F": "F",
+}
+
+
+def _convert(source, target, value):
+    factor, shift = CONVERSION_MATRIX[(source, target)]
+    return value * factor + shift
+
+
+class ConvertConversionMatrixTest(unittest.TestCase):
+    def test_known_conversions(self):
+        cases = [
+            ("km", "mi", 1.609344, 1.0),
+            ("mi", "km", 1.0, 1.609344),
+            ("C", "F", 100, 212),
+            ("F", "C", -40, -40),
+            ("C", "K", 0, 273.15),
+            ("K", "F", 0, -459.67),
+            ("lb", "kg", 1, 0.45359237),
+        ]
+        for source, target, value, expected in cases:
+            with self.subTest(source=source, target=target):
+                self.assertAlmostEqual(
+                    _convert(source, target, value), expected
+                )
+
+    def test_only_within_dimension(self):
+        self.assertNotIn(("km", "kg"), CONVERSION_MATRIX)
+        self.assertNotIn(("C", "C"), CONVERSION_MATRIX)
+
+    def test_format_value(self):
+        self.assertEqual(_format_value(62.1371, 2), "62.14")
+        self.assertEqual(_format_value(-0.001, 2), "0.00")
+        self.assertEqual(_format_value(-17.7778, 1), "-17.8")
+        self.assertEqual(_format_value(211.99999999, 0), "212")
+
+
+class ConvertQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
+    def test_defaults(self):
+        unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit([])
+        self.assertEqual(unit_bp["precision"], 2)
+        pairs = [(c["from"], c["to"]) for c in unit_bp["conversions"]]
+        self.assertEqual(
+            pairs,
+            [
+                ("km", "mi"),
+                ("mi", "km"),
+                ("C", "F"),
+                ("F", "C"),
+                ("kg", "lb"),
+                ("lb", "kg"),
+            ],
+        )
+        for conversion in unit_bp["conversions"]:
+            self.assertEqual((conversion["start"], conversion["end"]), (0, 100))
+
+    def test_valid_options(self):
+        options = [
+            {"key": "km", "args": ["mi", "10", "500"]},
+            {"key": "F", "args": ["C", "50"]},
+            {"key": "kg", "args": ["lb"]},
+            {"key": "precision", "args": ["1"]},
+        ]
+        unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(unit_bp["precision"], 1)
+        self.assertEqual(
+            unit_bp["conversions"],
+            [
+                {"from": "km", "to": "mi", "start": 10, "end": 500},
+                {"from": "F", "to": "C", "start": 0, "end": 50},
+                {"from": "kg", "to": "lb", "start": 0, "end": 100},
+            ],
+        )
+
+    def test_invalid_options(self):
+        cases = [
+            [{"key": "invalid", "args": []}],
+            [{"key": "km", "args": []}],
+            [{"key": "km", "args": ["kg"]}],
+            [{"key": "km", "args": ["km"]}],
+            [{"key": "km", "args": ["mi", "10", "5"]}],
+            [{"key": "km", "args": ["mi", "1", "2", "3"]}],
+            [{"key": "km", "args": ["mi", "ten"]}],
+            [{"key": "km", "args": ["mi", "0", "100000000000000000000"]}],
+            [{"key": "km", "args": ["mi", "-1000000000001", "0"]}],
+            [{"key": "km", "args": ["mi"]}, {"key": "km", "args": ["mi"]}],
+            [{"key": "precision", "args": []}],
+            [{"key": "precision", "args": ["11"]}],
+            [
+                {"key": "precision", "args": ["1"]},
+                {"key": "precision", "args": ["2"]},
+            ],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    ConvertQuizUnit.transform_options_to_blueprint_unit(
+                        deepcopy(options)
+                    )
+
+    def test_largest_range_generates_in_batch(self):
+        bound = str(10**12)
+        options = [{"key": "km", "args": ["mi", f"-{bound}", bound]}]
+        unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit(options)
+        unit_bp["count"] = 300
+        self.assertEqual(len(ConvertQuizUnit.generate_quiz(unit_bp)), 300)
+
+    def test_parse_unparse_roundtrip(self):
+        cases = [
+            [],
+            [
+                {"key": "C", "args": ["K", "-50", "50"]},
+                {"key": "precision", "args": ["0"]},
+            ],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit(
+                    deepcopy(options)
+                )
+                unparsed = (
+                    ConvertQuizUnit.transform_blueprint_unit_to_options(
+                        unit_bp
+                    )
+                )
+                reparsed = ConvertQuizUnit.transform_options_to_blueprint_unit(
+                    unparsed
+                )
+                self.assertEqual(unit_bp, reparsed)
+
+
+class ConvertQuizGenerateQuizTest(unittest.TestCase):
+    def _check_quiz(self, quiz, precision):
+        for q in quiz:
+            value, source, _, target = q["question"].split()
+            expected = _convert(
+                UNIT_SYMBOLS[source], UNIT_SYMBOLS[target], int(value)
+            )
+            self.assertEqual(q["answer"], _format_value(expected, precision))
+            self.assertEqual(q["category"], "convert")
+            grading_key = ConvertQuizUnit.derive_grading_key(q["answer"])
+            self.assertEqual(q["grading_key"], grading_key)
+
+    def test_generate_quiz(self):
+        unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit([])
+        unit_bp["count"] = 50
+        quiz = ConvertQuizUnit.generate_quiz(unit_bp)
+        self.assertEqual(len(quiz), 50)
+        self._check_quiz(quiz, 2)
+
+    def test_generate_large_quiz(self):
+        options = [
+            {"key": "C", "args": ["F", "-40", "40"]},
+            {"key": "mi", "args": ["km", "1000"]},
+            {"key": "precision", "args": ["1"]},
+        ]
+        unit_bp = ConvertQuizUnit.transform_options_to_blueprint_unit(options)
+        unit_bp["count"] = 500
+        quiz = ConvertQuizUnit.generate_quiz(unit_bp)
+        self.assertEqual(len(quiz), 500)
+        self._check_quiz(quiz, 1)
+
+
+class ConvertQuizAnswerTest(unittest.TestCase):
+    def test_parse_user_answer(self):
+        self.assertEqual(ConvertQuizUnit.parse_user_answer(" 62.1 "), "62.1")
+        with self.assertRaises(UserResponseError):
+            ConvertQuizUnit.parse_user_answer("62 mi")
+
+    def test_compare_answers(self):
+        cases = [
+            ("62.14", "62.14", True),
+            ("62.1", "62.14", True),
+            ("62", "62.14", True),
+            ("61.9", "62.14", True),
+            ("61.5", "62.14", False),
+            ("212", "212.00", True),
+            ("0", "0.00", True),
+            ("0.01", "0.00", False),
+        ]
+        for user_answer, correct_answer, expected in cases:
+            with self.subTest(user_answer=user_answer):
+                self.assertEqual(
+                    ConvertQuizUnit.compare_answers(
+                        user_answer, correct_answer
+                    ),
+                    expected,
+                )
+
+    def test_grade_answers_matches_compare(self):
+        answers = [f"{value / 10}" for value in range(600, 640)] * 10
+        correct_answers = ["62.14"] * len(answers)
+        keys = [ConvertQuizUnit.derive_grading_key("62.14")] * len(answers)
+        expected = [
+            ConvertQuizUnit.compare_answers(answer, "62.14")
+            for answer in answers
+        ]
+        self.assertEqual(
+            ConvertQuizUnit.grade_answers(answers, correct_answers, keys),
+            expected,
+        )
+
+    def test_prettify_answer(self):
+        self.assertEqual(ConvertQuizUnit.prettify_answer("212.00"), "212")
+        self.assertEqual(ConvertQuizUnit.prettify_answer("62.10"), "62.1")
+
+
+if __name__ == "__main__":
+    unittest.main()
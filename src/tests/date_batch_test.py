@@ -0,0 +1,62 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+from quiz.units import date_batch
+from quiz.units.date_quiz_unit import MONTH_NAMES, DateQuizUnit
+from tests.utils.base_test_case import BaseTestCase
+
+
+def _parse_question(question):
+    month, day, year = question.replace(",", "").split()
+    return datetime.date(int(year), MONTH_NAMES.index(month) + 1, int(day))
+
+
+class DateBatchGenerateBatchTest(BaseTestCase):
+    def test_answers_match_scalar_evaluation(self):
+        for start_year, end_year in [(1, 3), (1900, 2050), (9990, 9999)]:
+            batch = date_batch.generate_batch(start_year, end_year, 500)
+            self.assertEqual(len(batch), 500)
+            for question, answer in batch:
+                with self.subTest(question=question):
+                    date_str = _parse_question(question).isoformat()
+                    self.assertEqual(
+                        question, DateQuizUnit._prettify_question(date_str)
+                    )
+                    self.assertEqual(
+                        answer, DateQuizUnit._envaluate_question(date_str)
+                    )
+
+    def test_dates_within_range(self):
+        batch = date_batch.generate_batch(2000, 2001, 1000)
+        years = {_parse_question(question).year for question, _ in batch}
+        self.assertEqual(years, {2000, 2001})
+
+    def test_range_bounds_reachable(self):
+        batch = date_batch.generate_batch(2000, 2000, 5000)
+        questions = {question for question, _ in batch}
+        self.assertIn("January 01, 2000", questions)
+        self.assertIn("December 31, 2000", questions)
+
+
+class DateQuizBatchDispatchTest(BaseTestCase):
+    def test_large_quiz_uses_batch(self):
+        blueprint = {"start_year": 2000, "end_year": 2010, "count": 300}
+        with patch.object(
+            date_batch, "generate_batch", wraps=date_batch.generate_batch
+        ) as mock_batch:
+            quiz = DateQuizUnit.generate_quiz(blueprint)
+        mock_batch.assert_called_once_with(2000, 2010, 300)
+        self.assertEqual(len(quiz), 300)
+        self.assertTrue(all(q["category"] == "date" for q in quiz))
+
+    def test_small_quiz_skips_batch(self):
+        blueprint = {"start_year": 2000, "end_year": 2010, "count": 10}
+        with patch.object(date_batch, "generate_batch") as mock_batch:
+            quiz = DateQuizUnit.generate_quiz(blueprint)
+        mock_batch.assert_not_called()
+        self.assertEqual(len(quiz), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
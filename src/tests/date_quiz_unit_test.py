@@ -3,7 +3,11 @@ import unittest
 from unittest import TestCase
 from unittest.mock import patch
 
-from quiz.units.date_quiz_unit import DateQuizUnit
+from quiz.units.date_quiz_unit import (
+    DateQuizUnit,
+    _build_weekday_prefix_index,
+    _random_date,
+)
 from quiz.units.exceptions import UserConfigError, UserResponseError
 
 
@@ -52,6 +56,26 @@ class DateQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
         with self.assertRaises(UserConfigError):
             DateQuizUnit.transform_options_to_blueprint_unit(options)
 
+    def test_years_out_of_range(self):
+        cases = [
+            [{"key": "start", "args": ["0"]}, {"key": "end", "args": ["5"]}],
+            [{"key": "end", "args": ["10005"]}],
+            [{"key": "start", "args": ["-3"]}],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    DateQuizUnit.transform_options_to_blueprint_unit(options)
+
+    def test_unique_option(self):
+        options = [{"key": "unique", "args": []}]
+        blueprint = DateQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertTrue(blueprint["unique"])
+
+        options = [{"key": "unique", "args": ["yes"]}]
+        with self.assertRaises(UserConfigError):
+            DateQuizUnit.transform_options_to_blueprint_unit(options)
+
 
 class DateQuizTransformOptionsToBlueprintTest(unittest.TestCase):
     def test_parse_unparse_roundrip(self):
@@ -66,11 +90,23 @@ class DateQuizTransformOptionsToBlueprintTest(unittest.TestCase):
         self.assertEqual(len(roundtrip), 2)
         self.assertEqual(roundtrip, options)
 
+    def test_parse_unparse_roundrip_unique(self):
+        options = [
+            {"key": "start", "args": ["2020"]},
+            {"key": "end", "args": ["2025"]},
+            {"key": "unique", "args": []},
+        ]
+        blueprint = DateQuizUnit.transform_options_to_blueprint_unit(
+            deepcopy(options)
+        )
+        roundtrip = DateQuizUnit.transform_blueprint_unit_to_options(blueprint)
+        self.assertEqual(roundtrip, options)
+
 
 class DateQuizGenerateQuizTest(TestCase):
     def test_generate_quiz(self):
         with patch(
-            "quiz.units.date_quiz_unit.random_date"
+            "quiz.units.date_quiz_unit._random_date"
         ) as mock_random_date:
             mock_random_date.return_value = "2000-01-01"
             blueprint = {"start_year": 2000, "end_year": 2000, "count": 5}
@@ -83,13 +119,42 @@ class DateQuizGenerateQuizTest(TestCase):
                 self.assertEqual(q["category"], "date")
                 self.assertEqual(q["answer"], "saturday")
 
+    def test_random_date_range_bounds(self):
+        with patch("random.randint", side_effect=lambda a, b: a):
+            self.assertEqual(_random_date(1999, 2001), "1999-01-01")
+        with patch("random.randint", side_effect=lambda a, b: b):
+            self.assertEqual(_random_date(1999, 2001), "2001-12-31")
+
+    def test_iter_questions(self):
+        blueprint = {"start_year": 2000, "end_year": 2001, "count": 5}
+        questions = DateQuizUnit.iter_questions(blueprint)
+        first = next(questions)
+        self.assertEqual(first["category"], "date")
+        self.assertEqual(len(list(questions)), 4)
+
+    def test_generate_quiz_unique(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2000,
+            "count": 366,
+            "unique": True,
+        }
+        quiz = DateQuizUnit.generate_quiz(blueprint)
+        questions = [q["question"] for q in quiz]
+        self.assertEqual(len(set(questions)), 366)
+        self.assertIn("February 29, 2000", questions)
+        self.assertIn("January 01, 2000", questions)
+        self.assertIn("December 31, 2000", questions)
+
 
 class DateQuizParseUserAnswerTest(unittest.TestCase):
     def test_parse_user_answer_valid(self):
         cases = [
             ("Monday", "monday"),
             ("tu", "tuesday"),
-            ("WEDNESDAY", "wednesday")
+            ("WEDNESDAY", "wednesday"),
+            (" thurs ", "thursday"),
+            ("Sa", "saturday"),
         ]
         for answer, expected in cases:
             answer = DateQuizUnit.parse_user_answer(answer)
@@ -99,13 +164,30 @@ class DateQuizParseUserAnswerTest(unittest.TestCase):
         answers = [
             "Moonday",
             "t",
-            "wednesdayay"
+            "wednesdayay",
+            "day",
+            "nesday",
         ]
         for answer in answers:
             with self.assertRaises(UserResponseError):
                 DateQuizUnit.parse_user_answer(answer)
             
 
+    def test_ambiguous_prefix_rejected(self):
+        index = _build_weekday_prefix_index(["sunday", "sundag"])
+        self.assertIsNone(index["su"])
+        self.assertIsNone(index["sunda"])
+        self.assertEqual(index["sunday"], "sunday")
+        self.assertEqual(index["sundag"], "sundag")
+        with patch.dict(
+            "quiz.units.date_quiz_unit.WEEKDAY_PREFIX_INDEX",
+            {"mo": None},
+        ):
+            with self.assertRaises(UserResponseError) as ctx:
+                DateQuizUnit.parse_user_answer("mo")
+        self.assertIn("Ambiguous", str(ctx.exception))
+
+
 class DateQuizCompareAnswersTest(unittest.TestCase): 
     def test_compare_answers(self):
         self.assertTrue(DateQuizUnit.compare_answers("monday", "monday"))
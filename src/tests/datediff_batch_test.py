@@ -0,0 +1,69 @@
+import datetime
+import unittest
+from unittest.mock import patch
+
+from quiz.units import datediff_batch
+from quiz.units.date_quiz_unit import MONTH_NAMES
+from quiz.units.datediff_quiz_unit import DateDiffQuizUnit
+from tests.utils.base_test_case import BaseTestCase
+
+
+def _parse_date(text):
+    month, day, year = text.replace(",", "").split()
+    return datetime.date(int(year), MONTH_NAMES.index(month) + 1, int(day))
+
+
+class DateDiffBatchGenerateBatchTest(BaseTestCase):
+    def test_answers_match_scalar_evaluation(self):
+        kinds = ["between", "after"]
+        batch = datediff_batch.generate_batch(1, 9999, kinds, 500)
+        self.assertEqual(len(batch), 500)
+        for question, answer in batch:
+            with self.subTest(question=question):
+                if question.startswith("How many"):
+                    dates = question[len("How many days are between ") : -1]
+                    start, end = map(_parse_date, dates.split(" and "))
+                    kind = "between"
+                else:
+                    days, start = question[len("What date is ") : -1].split(
+                        " days after "
+                    )
+                    start = _parse_date(start)
+                    end = start + datetime.timedelta(days=int(days))
+                    kind = "after"
+                args = (kind, start.toordinal(), end.toordinal())
+                self.assertLessEqual(start, end)
+                self.assertEqual(
+                    question, DateDiffQuizUnit._prettify_question(*args)
+                )
+                self.assertEqual(
+                    answer, DateDiffQuizUnit._envaluate_question(*args)
+                )
+
+    def test_single_kind(self):
+        batch = datediff_batch.generate_batch(2000, 2001, ["after"], 300)
+        for question, answer in batch:
+            self.assertTrue(question.startswith("What date is"))
+            self.assertIn(answer[:4], ("2000", "2001"))
+
+
+class DateDiffQuizBatchDispatchTest(BaseTestCase):
+    def test_large_quiz_uses_batch(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2010,
+            "kinds": ["between"],
+            "count": 300,
+        }
+        generate_batch = datediff_batch.generate_batch
+        with patch.object(
+            datediff_batch, "generate_batch", wraps=generate_batch
+        ) as mock_batch:
+            quiz = DateDiffQuizUnit.generate_quiz(blueprint)
+        mock_batch.assert_called_once_with(2000, 2010, ["between"], 300)
+        self.assertEqual(len(quiz), 300)
+        self.assertTrue(all(q["category"] == "datediff" for q in quiz))
+
+
+if __name__ == "__main__":
+    unittest.main()
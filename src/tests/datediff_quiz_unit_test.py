@@ -0,0 +1,179 @@
+import datetime
+import unittest
+from copy import deepcopy
+from unittest.mock import patch
+
+from quiz.units.datediff_quiz_unit import DateDiffQuizUnit
+from quiz.units.exceptions import UserConfigError, UserResponseError
+
+
+class DateDiffQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
+    def test_valid_start_end_years(self):
+        options = [
+            {"key": "start", "args": ["1990"]},
+            {"key": "end", "args": ["2000"]},
+        ]
+        unit_bp = DateDiffQuizUnit.transform_options_to_blueprint_unit(
+            options
+        )
+        self.assertEqual(unit_bp["start_year"], 1990)
+        self.assertEqual(unit_bp["end_year"], 2000)
+        self.assertEqual(unit_bp["kinds"], ["between", "after"])
+
+    def test_default_years(self):
+        unit_bp = DateDiffQuizUnit.transform_options_to_blueprint_unit([])
+        self.assertEqual(unit_bp["start_year"], 1900)
+        self.assertEqual(unit_bp["end_year"], 2050)
+
+    def test_kind_options(self):
+        unit_bp = DateDiffQuizUnit.transform_options_to_blueprint_unit(
+            [{"key": "after", "args": []}]
+        )
+        self.assertEqual(unit_bp["kinds"], ["after"])
+        unit_bp = DateDiffQuizUnit.transform_options_to_blueprint_unit(
+            [{"key": "after", "args": []}, {"key": "between", "args": []}]
+        )
+        self.assertEqual(unit_bp["kinds"], ["between", "after"])
+
+    def test_invalid_options(self):
+        cases = [
+            [{"key": "invalid", "args": []}],
+            [
+                {"key": "start", "args": ["1990"]},
+                {"key": "start", "args": ["1991"]},
+            ],
+            [{"key": "between", "args": []}, {"key": "between", "args": []}],
+            [{"key": "after", "args": ["1"]}],
+            [
+                {"key": "start", "args": ["2001"]},
+                {"key": "end", "args": ["2000"]},
+            ],
+            [{"key": "start", "args": ["0"]}, {"key": "end", "args": ["5"]}],
+            [{"key": "end", "args": ["10005"]}],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    DateDiffQuizUnit.transform_options_to_blueprint_unit(
+                        deepcopy(options)
+                    )
+
+    def test_parse_unparse_roundtrip(self):
+        for options in [
+            [],
+            [{"key": "between", "args": []}],
+            [{"key": "start", "args": ["1"]}, {"key": "after", "args": []}],
+        ]:
+            with self.subTest(options=options):
+                unit_bp = DateDiffQuizUnit.transform_options_to_blueprint_unit(
+                    deepcopy(options)
+                )
+                unparsed = DateDiffQuizUnit.transform_blueprint_unit_to_options(
+                    unit_bp
+                )
+                reparsed = DateDiffQuizUnit.transform_options_to_blueprint_unit(
+                    unparsed
+                )
+                self.assertEqual(unit_bp, reparsed)
+
+
+class DateDiffQuizGenerateQuizTest(unittest.TestCase):
+    def test_generate_between_question(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2000,
+            "kinds": ["between"],
+            "count": 1,
+        }
+        ordinals = [
+            datetime.date(2000, 3, 1).toordinal(),
+            datetime.date(2000, 2, 1).toordinal(),
+        ]
+        with patch("random.randint", side_effect=ordinals):
+            quiz = DateDiffQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(
+            quiz[0]["question"],
+            "How many days are between February 01, 2000 and March 01, 2000?",
+        )
+        self.assertEqual(quiz[0]["answer"], "29")
+        self.assertEqual(quiz[0]["category"], "datediff")
+
+    def test_generate_after_question(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2001,
+            "kinds": ["after"],
+            "count": 1,
+        }
+        ordinals = [
+            datetime.date(2000, 12, 31).toordinal(),
+            datetime.date(2001, 1, 10).toordinal(),
+        ]
+        with patch("random.randint", side_effect=ordinals):
+            quiz = DateDiffQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(
+            quiz[0]["question"], "What date is 10 days after December 31, 2000?"
+        )
+        self.assertEqual(quiz[0]["answer"], "2001-01-10")
+
+    def test_dates_within_range(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2000,
+            "kinds": ["after"],
+            "count": 50,
+        }
+        for question in DateDiffQuizUnit.generate_quiz(blueprint):
+            self.assertTrue(question["answer"].startswith("2000-"))
+            self.assertTrue(question["question"].endswith("2000?"))
+
+    def test_iter_questions(self):
+        blueprint = {
+            "start_year": 2000,
+            "end_year": 2001,
+            "kinds": ["between", "after"],
+            "count": 5,
+        }
+        questions = DateDiffQuizUnit.iter_questions(blueprint)
+        self.assertEqual(next(questions)["category"], "datediff")
+        self.assertEqual(len(list(questions)), 4)
+
+
+class DateDiffQuizParseUserAnswerTest(unittest.TestCase):
+    def test_parse_user_answer_valid(self):
+        cases = [
+            ("42", "42"),
+            (" 007 ", "7"),
+            ("2020-03-01", "2020-03-01"),
+            ("March 01, 2020", "2020-03-01"),
+            ("march 1 2020", "2020-03-01"),
+        ]
+        for answer, expected in cases:
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    DateDiffQuizUnit.parse_user_answer(answer), expected
+                )
+
+    def test_parse_user_answer_invalid(self):
+        for answer in ["", "ten", "2020-02-30", "1.5"]:
+            with self.subTest(answer=answer):
+                with self.assertRaises(UserResponseError):
+                    DateDiffQuizUnit.parse_user_answer(answer)
+
+
+class DateDiffQuizPrettifyAnswerTest(unittest.TestCase):
+    def test_prettify_answer(self):
+        self.assertEqual(
+            DateDiffQuizUnit.prettify_answer("2020-03-01"), "March 01, 2020"
+        )
+        self.assertEqual(DateDiffQuizUnit.prettify_answer("29"), "29")
+
+    def test_compare_answers(self):
+        self.assertTrue(DateDiffQuizUnit.compare_answers("29", "29"))
+        self.assertFalse(
+            DateDiffQuizUnit.compare_answers("2020-03-01", "2020-03-02")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import unittest
+from copy import deepcopy
+from unittest.mock import patch
+
+from quiz.units import factor_quiz_unit
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.factor_quiz_unit import (
+    FactorQuizUnit,
+    _prime_factors,
+    _sieve_smallest_factors,
+)
+
+
+def _smallest_factor(n):
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            return p
+        p += 1
+    return n
+
+
+class FactorSieveTest(unittest.TestCase):
+    def test_smallest_factors(self):
+        smallest_factors = _sieve_smallest_factors(5000)
+        for n in range(2, 5001):
+            self.assertEqual(smallest_factors[n], _smallest_factor(n))
+
+    def test_sieve_grows_and_is_reused(self):
+        with patch.object(
+            factor_quiz_unit, "_smallest_factors", factor_quiz_unit.array("I")
+        ):
+            first = _sieve_smallest_factors(100)
+            self.assertIs(_sieve_smallest_factors(50), first)
+            grown = _sieve_smallest_factors(1000)
+            self.assertGreater(len(grown), 1000)
+            self.assertEqual(grown[997], 997)
+            self.assertEqual(grown[999], 3)
+
+    def test_sieve_growth_capped(self):
+        with patch.object(
+            factor_quiz_unit, "_smallest_factors", factor_quiz_unit.array("I")
+        ), patch.object(factor_quiz_unit, "MAX_END", 1000):
+            self.assertEqual(len(_sieve_smallest_factors(600)), 601)
+            grown = _sieve_smallest_factors(900)
+            self.assertEqual(len(grown), 1001)
+            self.assertEqual(grown[997], 997)
+
+    def test_prime_factors(self):
+        self.assertEqual(_prime_factors(360), [2, 2, 2, 3, 3, 5])
+        self.assertEqual(_prime_factors(97), [97])
+        self.assertEqual(_prime_factors(2), [2])
+
+
+class FactorQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
+    def test_defaults(self):
+        unit_bp = FactorQuizUnit.transform_options_to_blueprint_unit([])
+        self.assertEqual(unit_bp["start"], 2)
+        self.assertEqual(unit_bp["end"], 100)
+        self.assertEqual(
+            unit_bp["kinds"], ["factorize", "prime", "gcd", "lcm"]
+        )
+
+    def test_valid_options(self):
+        options = [
+            {"key": "start", "args": ["10"]},
+            {"key": "end", "args": ["500"]},
+            {"key": "lcm", "args": []},
+            {"key": "prime", "args": []},
+        ]
+        unit_bp = FactorQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(unit_bp["start"], 10)
+        self.assertEqual(unit_bp["end"], 500)
+        self.assertEqual(unit_bp["kinds"], ["prime", "lcm"])
+
+    def test_invalid_options(self):
+        cases = [
+            [{"key": "invalid", "args": []}],
+            [{"key": "start", "args": ["1"]}],
+            [{"key": "start", "args": ["50"]}, {"key": "end", "args": ["10"]}],
+            [{"key": "end", "args": [str(10**7 + 1)]}],
+            [{"key": "gcd", "args": ["2"]}],
+            [{"key": "gcd", "args": []}, {"key": "gcd", "args": []}],
+            [{"key": "end", "args": ["ten"]}],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    FactorQuizUnit.transform_options_to_blueprint_unit(
+                        deepcopy(options)
+                    )
+
+    def test_parse_unparse_roundtrip(self):
+        for options in [[], [{"key": "factorize", "args": []}]]:
+            with self.subTest(options=options):
+                unit_bp = FactorQuizUnit.transform_options_to_blueprint_unit(
+                    deepcopy(options)
+                )
+                unparsed = FactorQuizUnit.transform_blueprint_unit_to_options(
+                    unit_bp
+                )
+                reparsed = FactorQuizUnit.transform_options_to_blueprint_unit(
+                    unparsed
+                )
+                self.assertEqual(unit_bp, reparsed)
+
+
+class FactorQuizGenerateQuizTest(unittest.TestCase):
+    def _generate(self, kind, count=50, start=2, end=1000):
+        blueprint = {
+            "start": start,
+            "end": end,
+            "kinds": [kind],
+            "count": count,
+        }
+        return FactorQuizUnit.generate_quiz(blueprint)
+
+    def test_factorize(self):
+        for q in self._generate("factorize"):
+            n = int(q["question"].split()[-1].rstrip("?"))
+            factors = [int(f) for f in q["answer"].split("*")]
+            self.assertEqual(factors, sorted(factors))
+            product = 1
+            for factor in factors:
+                self.assertEqual(_smallest_factor(factor), factor)
+                product *= factor
+            self.assertEqual(product, n)
+            self.assertEqual(q["category"], "factor")
+
+    def test_prime(self):
+        for q in self._generate("prime"):
+            n = int(q["question"].split()[1])
+            expected = "yes" if _smallest_factor(n) == n else "no"
+            self.assertEqual(q["answer"], expected)
+
+    def test_gcd_and_lcm(self):
+        for q in self._generate("gcd") + self._generate("lcm"):
+            words = q["question"].rstrip("?").split()
+            a, b = int(words[-3]), int(words[-1])
+            answer = int(q["answer"])
+            if "GCD" in q["question"]:
+                self.assertEqual(a % answer + b % answer, 0)
+            else:
+                self.assertEqual(answer % a + answer % b, 0)
+
+    def test_range(self):
+        for q in self._generate("prime", start=50, end=60):
+            n = int(q["question"].split()[1])
+            self.assertTrue(50 <= n <= 60)
+
+
+class FactorQuizAnswerTest(unittest.TestCase):
+    def test_parse_user_answer(self):
+        cases = [
+            ("12", "12"),
+            ("3*2*2", "2*2*3"),
+            ("2 x 2 x 3", "2*2*3"),
+            ("2^2 * 3", "2*2*3"),
+            ("3, 2^2", "2*2*3"),
+            (" Yes ", "yes"),
+            ("n", "no"),
+        ]
+        for answer, expected in cases:
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    FactorQuizUnit.parse_user_answer(answer), expected
+                )
+
+    def test_parse_user_answer_invalid(self):
+        cases = ["maybe", "2*", "2^-1", "0", "1.5", "2^1000", "2^1000000000"]
+        for answer in cases:
+            with self.subTest(answer=answer):
+                with self.assertRaises(UserResponseError):
+                    FactorQuizUnit.parse_user_answer(answer)
+
+    def test_compare_answers(self):
+        parse = FactorQuizUnit.parse_user_answer
+        self.assertTrue(FactorQuizUnit.compare_answers(parse("2^2*3"), "2*2*3"))
+        self.assertFalse(FactorQuizUnit.compare_answers(parse("2*3"), "2*2*3"))
+
+    def test_prettify_answer(self):
+        self.assertEqual(
+            FactorQuizUnit.prettify_answer("2*2*2*3*3*5"), "2^3 * 3^2 * 5"
+        )
+        self.assertEqual(FactorQuizUnit.prettify_answer("12"), "12")
+        self.assertEqual(FactorQuizUnit.prettify_answer("yes"), "Yes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+from copy import deepcopy
+from fractions import Fraction
+
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.fraction_quiz_unit import (
+    FractionQuizUnit,
+    _proper_fractions,
+)
+
+
+class FractionProperFractionsTest(unittest.TestCase):
+    def test_proper_fractions(self):
+        self.assertEqual(
+            _proper_fractions(4),
+            (
+                Fraction(1, 4),
+                Fraction(1, 3),
+                Fraction(1, 2),
+                Fraction(2, 3),
+                Fraction(3, 4),
+            ),
+        )
+
+    def test_proper_fractions_are_cached(self):
+        self.assertIs(_proper_fractions(12), _proper_fractions(12))
+
+
+class FractionQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
+    def test_defaults(self):
+        unit_bp = FractionQuizUnit.transform_options_to_blueprint_unit([])
+        self.assertEqual(unit_bp["max_denominator"], 12)
+        self.assertEqual(unit_bp["max_amount"], 200)
+        self.assertEqual(
+            unit_bp["kinds"], ["add", "subtract", "multiply", "percent"]
+        )
+
+    def test_valid_options(self):
+        options = [
+            {"key": "denominator", "args": ["20"]},
+            {"key": "amount", "args": ["50"]},
+            {"key": "percent", "args": []},
+            {"key": "add", "args": []},
+        ]
+        unit_bp = FractionQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(unit_bp["max_denominator"], 20)
+        self.assertEqual(unit_bp["max_amount"], 50)
+        self.assertEqual(unit_bp["kinds"], ["add", "percent"])
+
+    def test_invalid_options(self):
+        cases = [
+            [{"key": "invalid", "args": []}],
+            [{"key": "denominator", "args": ["1"]}],
+            [{"key": "denominator", "args": ["101"]}],
+            [{"key": "denominator", "args": []}],
+            [{"key": "amount", "args": ["0"]}],
+            [{"key": "add", "args": ["1"]}],
+            [{"key": "add", "args": []}, {"key": "add", "args": []}],
+            [
+                {"key": "amount", "args": ["10"]},
+                {"key": "amount", "args": ["20"]},
+            ],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    FractionQuizUnit.transform_options_to_blueprint_unit(
+                        deepcopy(options)
+                    )
+
+    def test_parse_unparse_roundtrip(self):
+        cases = [[], [{"key": "multiply", "args": []}]]
+        for options in cases:
+            with self.subTest(options=options):
+                unit_bp = FractionQuizUnit.transform_options_to_blueprint_unit(
+                    deepcopy(options)
+                )
+                unparsed = (
+                    FractionQuizUnit.transform_blueprint_unit_to_options(
+                        unit_bp
+                    )
+                )
+                reparsed = FractionQuizUnit.transform_options_to_blueprint_unit(
+                    unparsed
+                )
+                self.assertEqual(unit_bp, reparsed)
+
+
+class FractionQuizGenerateQuizTest(unittest.TestCase):
+    def test_generate_quiz(self):
+        unit_bp = FractionQuizUnit.transform_options_to_blueprint_unit([])
+        unit_bp["count"] = 200
+        quiz = FractionQuizUnit.generate_quiz(unit_bp)
+        self.assertEqual(len(quiz), 200)
+        for q in quiz:
+            with self.subTest(question=q["question"]):
+                if "% of " in q["question"]:
+                    percentage, amount = q["question"].split("% of ")
+                    expected = Fraction(int(percentage), 100) * int(amount)
+                else:
+                    a, operator, b = q["question"].split()
+                    a, b = Fraction(a), Fraction(b)
+                    expected = {"+": a + b, "-": a - b, "*": a * b}[operator]
+                    self.assertTrue(0 < a < 1 and 0 < b < 1)
+                    self.assertLessEqual(b.denominator, 12)
+                self.assertGreaterEqual(expected, 0)
+                self.assertEqual(q["answer"], str(expected))
+                self.assertEqual(q["category"], "fraction")
+
+
+class FractionQuizAnswerTest(unittest.TestCase):
+    def test_parse_user_answer(self):
+        cases = [
+            ("3/4", "3/4"),
+            ("6/8", "3/4"),
+            ("0.75", "3/4"),
+            ("75%", "3/4"),
+            (" 3 / 4 ", "3/4"),
+            ("75 %", "3/4"),
+            ("2", "2"),
+            ("4/2", "2"),
+            ("200%", "2"),
+            ("-1/6", "-1/6"),
+            ("12.5%", "1/8"),
+        ]
+        for answer, expected in cases:
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    FractionQuizUnit.parse_user_answer(answer), expected
+                )
+
+    def test_parse_user_answer_invalid(self):
+        cases = [
+            "abc",
+            "1/0",
+            "3/4%%",
+            "inf",
+            "1/2/3",
+            "1e10000000",
+            "1E5",
+            "1" * 33,
+            "1 1/2",
+            "1 5%",
+        ]
+        for answer in cases:
+            with self.subTest(answer=answer):
+                with self.assertRaises(UserResponseError):
+                    FractionQuizUnit.parse_user_answer(answer)
+
+    def test_compare_answers(self):
+        parse = FractionQuizUnit.parse_user_answer
+        self.assertTrue(FractionQuizUnit.compare_answers(parse("0.75"), "3/4"))
+        self.assertFalse(FractionQuizUnit.compare_answers(parse("0.7"), "3/4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
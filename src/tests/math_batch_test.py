@@ -0,0 +1,182 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from quiz.units import math_batch
+from quiz.units.math_quiz_unit import (
+    CONSTANT_TABLE,
+    FUNCTION_TABLE,
+    SUPPORTED_OPERATORS,
+    MathQuizUnit,
+)
+from tests.utils.base_test_case import BaseTestCase
+
+_EVAL_NAMESPACE = {**FUNCTION_TABLE, **CONSTANT_TABLE}
+
+
+def _eval_answer(expr):
+    try:
+        return str(eval(expr, _EVAL_NAMESPACE))
+    except ZeroDivisionError:
+        return "nan"
+
+
+class MathBatchGenerateBatchTest(BaseTestCase):
+    def _generate(self, elements, count=500):
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        return math_batch.generate_batch(plan, count)
+
+    def test_answers_match_scalar_evaluation(self):
+        operators = sorted(SUPPORTED_OPERATORS)
+        cases = [
+            [
+                {"type": "int", "start": -5, "end": 5},
+                {"type": "operator", "value": operators},
+                {"type": "int", "start": -3, "end": 3},
+                {"type": "operator", "value": operators},
+                {"type": "float.1", "start": -3.0, "end": 3.0},
+            ],
+            [
+                {"type": "function", "value": "sqrt"},
+                {"type": "bracket", "value": "("},
+                {"type": "int", "start": 0, "end": 50},
+                {"type": "operator", "value": ["*", "-"]},
+                {"type": "constant", "value": "pi"},
+                {"type": "bracket", "value": ")"},
+                {"type": "operator", "value": ["/"]},
+                {"type": "float", "start": -1.0, "end": 1.0},
+            ],
+        ]
+        random.seed(0)
+        for elements in cases:
+            for expr, answer, _ in self._generate(elements):
+                with self.subTest(expr=expr):
+                    self.assertEqual(answer, _eval_answer(expr))
+
+    def test_grading_keys_match_answers(self):
+        elements = [
+            {"type": "int", "start": -5, "end": 5},
+            {"type": "operator", "value": ["+", "/", "**"]},
+            {"type": "int", "start": -3, "end": 3},
+        ]
+        for expr, answer, grading_key in self._generate(elements):
+            with self.subTest(expr=expr):
+                self.assertEqual(
+                    grading_key, MathQuizUnit.derive_grading_key(answer)
+                )
+
+    def test_brackets_without_inner_spaces(self):
+        elements = [
+            {"type": "bracket", "value": "("},
+            {"type": "int", "start": 1, "end": 9},
+            {"type": "operator", "value": ["+"]},
+            {"type": "int", "start": 1, "end": 9},
+            {"type": "bracket", "value": ")"},
+            {"type": "operator", "value": ["*"]},
+            {"type": "int", "start": 1, "end": 9},
+        ]
+        for expr, _, _ in self._generate(elements):
+            with self.subTest(expr=expr):
+                self.assertRegex(expr, r"^\(\d \+ \d\) \* \d$")
+
+    def test_zero_division_per_element(self):
+        elements = [
+            {"type": "int", "start": 1, "end": 10},
+            {"type": "operator", "value": ["/", "//", "%"]},
+            {"type": "int", "start": 0, "end": 1},
+        ]
+        for expr, answer, _ in self._generate(elements):
+            with self.subTest(expr=expr):
+                if expr.endswith(" 0"):
+                    self.assertEqual(answer, "nan")
+                else:
+                    self.assertEqual(answer, _eval_answer(expr))
+
+    def test_int_results_keep_int_format(self):
+        elements = [
+            {"type": "int", "start": -10**6, "end": 10**6},
+            {"type": "operator", "value": ["*", "**"]},
+            {"type": "int", "start": 0, "end": 9},
+        ]
+        for expr, answer, _ in self._generate(elements):
+            with self.subTest(expr=expr):
+                self.assertEqual(answer, str(eval(expr)))
+
+    def test_exact_division(self):
+        elements = [
+            {"type": "int", "start": -50, "end": 50},
+            {"type": "operator", "value": ["/", "//", "+"]},
+            {"type": "int", "start": -5, "end": 5},
+            {"type": "operator", "value": ["*", "/"]},
+            {"type": "int", "start": 3, "end": 7},
+        ]
+        plan = MathQuizUnit._compile_generation_plan(
+            elements, exact_division=True
+        )
+        for expr, answer, _ in math_batch.generate_batch(plan, 500):
+            with self.subTest(expr=expr):
+                dividend, op, divisor = expr.split(" ")[:3]
+                if op != "+":
+                    self.assertIn(int(dividend), range(-50, 51))
+                    self.assertNotEqual(int(divisor), 0)
+                    self.assertEqual(int(dividend) % int(divisor), 0)
+                self.assertEqual(answer, _eval_answer(expr))
+
+    def test_int_results_at_exact_float_limit(self):
+        # 2 ** 53 is the first float64 value shared by several ints
+        elements = [
+            {"type": "int", "start": 2, "end": 2},
+            {"type": "operator", "value": ["**"]},
+            {"type": "int", "start": 53, "end": 53},
+            {"type": "operator", "value": ["+", "-"]},
+            {"type": "int", "start": 0, "end": 1},
+        ]
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        for expr, answer, _ in math_batch.generate_batch(plan, 300):
+            with self.subTest(expr=expr):
+                slots = [
+                    int(part) if part.isdigit() else part
+                    for part in expr.split()
+                ]
+                scalar = MathQuizUnit._envaluate_question(plan, slots)
+                self.assertEqual(answer, scalar)
+                self.assertEqual(answer, str(eval(expr)))
+
+    def test_large_int_range_not_vectorizable(self):
+        elements = [{"type": "int", "start": 0, "end": 2**60}]
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        self.assertFalse(math_batch.is_vectorizable(plan))
+
+
+class MathQuizGenerateQuizBatchTest(BaseTestCase):
+    def test_large_count_uses_batch(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 10},
+                {"type": "operator", "value": ["+"]},
+                {"type": "int", "start": 1, "end": 10},
+            ],
+            "count": 1000,
+        }
+        with patch.object(
+            math_batch, "generate_batch", wraps=math_batch.generate_batch
+        ) as spy:
+            quiz = MathQuizUnit.generate_quiz(blueprint)
+        spy.assert_called_once()
+        self.assertEqual(len(quiz), 1000)
+        for q in quiz:
+            self.assertEqual(q["answer"], str(eval(q["question"])))
+
+    def test_small_count_skips_batch(self):
+        blueprint = {
+            "elements": [{"type": "int", "start": 1, "end": 10}],
+            "count": 5,
+        }
+        with patch.object(math_batch, "generate_batch") as spy:
+            quiz = MathQuizUnit.generate_quiz(blueprint)
+        spy.assert_not_called()
+        self.assertEqual(len(quiz), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import math
+import unittest
+
+from quiz.units.math_evaluator import (
+    CLOSE,
+    FUNCTION,
+    NUMBER,
+    OPEN,
+    OPERATOR,
+    PRECEDENCE,
+    VALUE,
+    compile_program,
+    evaluate_program,
+)
+from tests.utils.base_test_case import BaseTestCase
+
+
+def _tokenize(expr):
+    """
+    Tokenize a space separated expression for the tests, numbers and
+    operators are stored in slots in order of appearance.
+    """
+    tokens = []
+    slots = []
+    for part in expr.split():
+        if part == "(":
+            tokens.append((OPEN, None))
+        elif part == ")":
+            tokens.append((CLOSE, None))
+        elif part in PRECEDENCE:
+            tokens.append((OPERATOR, len(slots)))
+            slots.append(part)
+        elif part == "pi":
+            tokens.append((VALUE, math.pi))
+        elif part == "sqrt":
+            tokens.append((FUNCTION, math.sqrt))
+        else:
+            value = float(part) if "." in part else int(part)
+            tokens.append((NUMBER, len(slots)))
+            slots.append(value)
+    return tokens, slots
+
+
+def _evaluate(expr):
+    tokens, slots = _tokenize(expr)
+    precedences = {
+        i: PRECEDENCE[slot]
+        for i, slot in enumerate(slots)
+        if isinstance(slot, str)
+    }
+    program = compile_program(tokens, precedences)
+    return evaluate_program(program, slots)
+
+
+class CompileAndEvaluateProgramTest(BaseTestCase):
+    def test_matches_python_semantics(self):
+        cases = [
+            "1 + 2 * 3",
+            "( 1 + 2 ) * 3",
+            "10 - 4 - 3",
+            "2 ** 3 ** 2",
+            "7 // 2 * 3",
+            "-7 % 3",
+            "-2 ** 2",
+            "( -2 ) ** 2",
+            "2 ** -2 ** 2",
+            "2 * -3 ** 2",
+            "- 3 ** 2",
+            "- -3 ** 2",
+            "-0.0 ** 2",
+            "1.5 / 4 + pi",
+            "- ( 2 + 3 ) * 4",
+        ]
+        for expr in cases:
+            with self.subTest(expr=expr):
+                expected = eval(expr.replace("pi", repr(math.pi)))
+                self.assertEqual(repr(_evaluate(expr)), repr(expected))
+
+    def test_function_applied_to_bracket(self):
+        result = _evaluate("sqrt ( 7 + 9 ) * 2")
+        self.assertEqual(result, 8.0)
+
+    def test_zero_division_propagates(self):
+        with self.assertRaises(ZeroDivisionError):
+            _evaluate("1 / ( 2 - 2 )")
+
+    def test_large_integer_power_overflows(self):
+        for expr in ["9 ** 9 ** 9", "( 2 ** 5000 ) * 2", "- 2 ** 5000"]:
+            with self.subTest(expr=expr):
+                with self.assertRaises(OverflowError):
+                    _evaluate(expr)
+        self.assertEqual(_evaluate("2 ** 100"), 2**100)
+        self.assertEqual(_evaluate("1 ** 10000000"), 1)
+
+    def test_invalid_expressions(self):
+        cases = [
+            "1 +",
+            "( 1 + 2",
+            "1 + 2 )",
+            "1 2",
+            "( )",
+        ]
+        for expr in cases:
+            with self.subTest(expr=expr):
+                with self.assertRaises(ValueError):
+                    _evaluate(expr)
+
+
+if __name__ == "__main__":
+    unittest.main()
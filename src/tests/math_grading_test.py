@@ -0,0 +1,104 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from quiz.units import math_grading
+from quiz.units.math_quiz_unit import MathQuizUnit
+from tests.utils.base_test_case import BaseTestCase
+
+
+def _scalar_grades(user_answers, correct_answers, grading_keys):
+    return [
+        MathQuizUnit.compare_answer_to_key(*grading)
+        for grading in zip(user_answers, correct_answers, grading_keys)
+    ]
+
+
+class MathGradingGradeAnswersTest(BaseTestCase):
+    def test_edge_cases_match_scalar_grading(self):
+        cases = [
+            ("1.0", "1.00"),
+            ("1.5", "1.50"),
+            ("0.0001", "1e-4"),
+            ("0.00011", "1e-4"),
+            ("1000", "1e3"),
+            ("999", "1e3"),
+            ("2", "1.99"),
+            ("0.0001", "0.9e-4"),
+            ("1.1", "1.0001"),
+            ("1.5", "1.59"),
+            ("1.5e-8", "1.5e-9"),
+            ("1.5E-8", "1.5e-8"),
+            ("-1.5", "-1.54"),
+            ("-1.5", "1.5"),
+            ("nan", "nan"),
+            ("1", "nan"),
+            ("nan", "1"),
+            ("inf", "inf"),
+            ("1e400", "inf"),
+            ("1_000", "1000"),
+        ]
+        user_answers = [user_answer for user_answer, _ in cases]
+        correct_answers = [answer for _, answer in cases]
+        grading_keys = list(
+            map(MathQuizUnit.derive_grading_key, correct_answers)
+        )
+        grading = (user_answers, correct_answers, grading_keys)
+        grades = math_grading.grade_answers(*grading)
+        expected = _scalar_grades(*grading)
+        for case, grade, expected_grade in zip(cases, grades, expected):
+            with self.subTest(case=case):
+                self.assertEqual(grade, expected_grade)
+
+    def test_random_answers_match_scalar_grading(self):
+        random.seed(0)
+        user_answers = []
+        correct_answers = []
+        grading_keys = []
+        for _ in range(2000):
+            answer = str(random.uniform(-1000, 1000))
+            correct_answers.append(answer)
+            grading_keys.append(MathQuizUnit.derive_grading_key(answer))
+            value = float(answer) * random.uniform(0.999, 1.001)
+            user_answer = random.choice(
+                [
+                    answer,
+                    str(round(value, random.randint(0, 4))),
+                    f"{value:.3e}",
+                    str(-value),
+                ]
+            )
+            user_answers.append(user_answer)
+        grading = (user_answers, correct_answers, grading_keys)
+        self.assertEqual(
+            math_grading.grade_answers(*grading), _scalar_grades(*grading)
+        )
+
+    def test_empty(self):
+        self.assertEqual(math_grading.grade_answers([], [], []), [])
+
+
+class MathQuizGradeAnswersTest(BaseTestCase):
+    def test_large_submission_uses_vectorized_grading(self):
+        grading_keys = [MathQuizUnit.derive_grading_key("2")] * 500
+        with patch.object(
+            math_grading, "grade_answers", wraps=math_grading.grade_answers
+        ) as spy:
+            grades = MathQuizUnit.grade_answers(
+                ["2"] * 500, ["2"] * 500, grading_keys
+            )
+        spy.assert_called_once()
+        self.assertEqual(grades, [True] * 500)
+
+    def test_small_submission_skips_vectorized_grading(self):
+        grading_keys = [MathQuizUnit.derive_grading_key("2")] * 5
+        with patch.object(math_grading, "grade_answers") as spy:
+            grades = MathQuizUnit.grade_answers(
+                ["3"] * 5, ["2"] * 5, grading_keys
+            )
+        spy.assert_not_called()
+        self.assertEqual(grades, [False] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
 from copy import deepcopy
+import random
+import time
 import unittest
 from unittest.mock import patch
 
@@ -421,6 +423,136 @@ class MathQuizTransformOptionsToBlueprintUnitTest(BaseTestCase):
             str(exc.exception),
         )
 
+    def test_bracket_problems(self):
+        cases = [
+            (["bracket_open", "bracket_close"], "empty brackets"),
+            (
+                ["int", "bracket_open", "int", "bracket_close"],
+                "opening bracket after an operand",
+            ),
+            (
+                ["bracket_open", "int", "op", "bracket_close"],
+                "operator before closing bracket",
+            ),
+            (
+                ["bracket_open", "int", "bracket_close", "int"],
+                "operand after closing bracket",
+            ),
+        ]
+        for specifiers, reason in cases:
+            options = self._generate_options(specifiers)
+            with self.subTest(specifiers=specifiers):
+                with self.assertRaises(UserConfigError) as exc:
+                    MathQuizUnit.transform_options_to_blueprint_unit(options)
+                self.assertIn(reason, str(exc.exception))
+
+    def test_problem_reports_element_position(self):
+        specifiers = ["int", "op", "int", "int"]
+        options = self._generate_options(specifiers)
+        with self.assertRaises(UserConfigError) as exc:
+            MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertIn("(element 4)", str(exc.exception))
+
+    def test_leading_sign_valid(self):
+        options = [
+            {"key": "(", "args": []},
+            {"key": "op", "args": ["-"]},
+            {"key": "int", "args": ["1", "10"]},
+            {"key": ")", "args": []},
+            {"key": "op", "args": ["**"]},
+            {"key": "int", "args": ["2"]},
+        ]
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(options)
+        blueprint["count"] = 5
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        for question in quiz:
+            with self.subTest(question=question["question"]):
+                self.assertEqual(
+                    question["answer"], str(eval(question["question"]))
+                )
+
+    def test_validation_does_not_eval(self):
+        options = self._generate_options(["int", "op", "int"])
+        with patch("builtins.eval") as mock_eval:
+            MathQuizUnit.transform_options_to_blueprint_unit(options)
+        mock_eval.assert_not_called()
+
+    def test_exact_division_option(self):
+        options = self._generate_options(["int", "op", "int"])
+        options[1]["args"] = ["/"]
+        options.append({"key": "exact", "args": []})
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertTrue(blueprint["exact_division"])
+        self.assertEqual(len(blueprint["elements"]), 3)
+
+    def test_exact_division_option_invalid(self):
+        cases = [
+            [{"key": "exact", "args": ["yes"]}],
+            [{"key": "exact", "args": []}],
+        ]
+        for extra in cases:
+            options = self._generate_options(["int", "op", "int"]) + extra
+            with self.subTest(extra=extra):
+                with self.assertRaises(UserConfigError):
+                    MathQuizUnit.transform_options_to_blueprint_unit(options)
+
+
+    def test_unique_option(self):
+        options = self._generate_options(["int", "op", "int"])
+        options.append({"key": "unique", "args": []})
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertTrue(blueprint["unique"])
+
+    def test_unique_and_exact_division_exclusive(self):
+        options = self._generate_options(["int", "op", "int"])
+        options[1]["args"] = ["/"]
+        options.append({"key": "exact", "args": []})
+        options.append({"key": "unique", "args": []})
+        with self.assertRaises(UserConfigError) as exc:
+            MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertIn("cannot be combined", str(exc.exception))
+
+
+    def test_tree_option(self):
+        options = self._generate_options(["int", "op", "const"])
+        options.append({"key": "tree", "args": ["3"]})
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(blueprint["tree"], {"depth": 3, "operands": 8})
+
+        # Pools do not need to form a valid expression
+        options = self._generate_options(["int", "float", "op", "op"])
+        options.append({"key": "tree", "args": ["2", "3"]})
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(blueprint["tree"], {"depth": 2, "operands": 3})
+
+    def test_tree_option_invalid(self):
+        cases = [
+            (["int", "op"], ["0"]),
+            (["int", "op"], ["7"]),
+            (["int", "op"], ["30"]),
+            (["int", "op"], ["2", "5"]),
+            (["int", "op"], ["2", "1"]),
+            (["int", "op"], ["two"]),
+            (["int"], ["2"]),
+            (["op"], ["2"]),
+            (["int", "op", "func"], ["2"]),
+            (["bracket_open", "int", "op", "bracket_close"], ["2"]),
+        ]
+        for specifiers, args in cases:
+            options = self._generate_options(specifiers)
+            options.append({"key": "tree", "args": args})
+            with self.subTest(specifiers=specifiers, args=args):
+                with self.assertRaises(UserConfigError):
+                    MathQuizUnit.transform_options_to_blueprint_unit(options)
+
+    def test_tree_and_unique_exclusive(self):
+        options = self._generate_options(["int", "op"])
+        options.append({"key": "tree", "args": ["2"]})
+        options.append({"key": "unique", "args": []})
+        with self.assertRaises(UserConfigError) as exc:
+            MathQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertIn("cannot be combined", str(exc.exception))
+
 
 class MathQuizTransoformOptionsToblueprintUnitTest(BaseTestCase):
     def test_transform_blueprint_unit_to_options_round_trip(self):
@@ -445,6 +577,31 @@ class MathQuizTransoformOptionsToblueprintUnitTest(BaseTestCase):
                 self.assertEqual(original["key"], roundtrip["key"])
                 self.assertEqual(original["args"], roundtrip["args"])
 
+    def test_tree_round_trip(self):
+        options = [
+            {"key": "int", "args": ["1", "10"]},
+            {"key": "op", "args": ["+", "*"]},
+            {"key": "tree", "args": ["3", "5"]},
+        ]
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(
+            deepcopy(options)
+        )
+        result = MathQuizUnit.transform_blueprint_unit_to_options(blueprint)
+        self.assertEqual(result, options)
+
+    def test_exact_division_round_trip(self):
+        options = [
+            {"key": "int", "args": ["1", "10"]},
+            {"key": "op", "args": ["//"]},
+            {"key": "int", "args": ["1", "10"]},
+            {"key": "exact", "args": []},
+        ]
+        blueprint = MathQuizUnit.transform_options_to_blueprint_unit(
+            deepcopy(options)
+        )
+        result = MathQuizUnit.transform_blueprint_unit_to_options(blueprint)
+        self.assertEqual(result, options)
+
 
 class MathQuizGenerateQuizTest(BaseTestCase):
     def test_generate_long_quiz_valid(self):
@@ -548,6 +705,265 @@ class MathQuizGenerateQuizTest(BaseTestCase):
             answer = q["answer"]
             self.assertEqual(answer, "nan")
 
+    def test_exact_division(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": -30, "end": 30},
+                {"type": "operator", "value": ["/", "//"]},
+                {"type": "int", "start": -4, "end": 4},
+            ],
+            "count": 100,
+            "exact_division": True,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        for q in quiz:
+            with self.subTest(question=q["question"]):
+                dividend, op, divisor = q["question"].split(" ")
+                self.assertIn(int(dividend), range(-30, 31))
+                self.assertIn(int(divisor), range(-4, 5))
+                self.assertNotEqual(int(divisor), 0)
+                self.assertEqual(int(dividend) % int(divisor), 0)
+                self.assertEqual(q["answer"], str(eval(q["question"])))
+
+    def test_exact_division_only_direct_operands(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 9},
+                {"type": "operator", "value": ["*"]},
+                {"type": "int", "start": 1, "end": 9},
+                {"type": "operator", "value": ["/"]},
+                {"type": "int", "start": 2, "end": 9},
+            ],
+            "count": 1,
+            "exact_division": True,
+        }
+        plan = MathQuizUnit._compile_generation_plan(
+            blueprint["elements"], exact_division=True
+        )
+        program = plan.program_for([1, "*", 1, "/", 2])
+        # (a * b) / c divides a product, not a drawn integer
+        self.assertEqual(plan.divisions_in(program), ())
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(quiz[0]["answer"], str(eval(quiz[0]["question"])))
+
+    def test_unique_questions(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 4},
+                {"type": "operator", "value": ["+", "-", "*"]},
+                {"type": "float.1", "start": 0.0, "end": 0.4},
+            ],
+            "count": 60,
+            "unique": True,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        questions = [q["question"] for q in quiz]
+        self.assertEqual(len(set(questions)), 60)
+        for q in quiz:
+            with self.subTest(question=q["question"]):
+                self.assertEqual(q["answer"], str(eval(q["question"])))
+
+    def test_unique_questions_count_exceeds_space(self):
+        blueprint = {
+            "elements": [{"type": "int", "start": 1, "end": 3}],
+            "count": 7,
+            "unique": True,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        questions = [q["question"] for q in quiz]
+        self.assertEqual(sorted(questions[:3]), ["1", "2", "3"])
+        self.assertEqual(sorted(questions[3:6]), ["1", "2", "3"])
+
+    def test_tree_questions(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 9},
+                {"type": "operator", "value": ["+", "-"]},
+                {"type": "operator", "value": ["*", "+"]},
+            ],
+            "tree": {"depth": 3, "operands": 5},
+            "count": 100,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(len(quiz), 100)
+        for q in quiz:
+            question = q["question"]
+            with self.subTest(question=question):
+                operands = [
+                    part
+                    for part in question.split()
+                    if part.strip("()").isdigit()
+                ]
+                self.assertIn(len(operands), range(2, 6))
+                depth = max_depth = 0
+                for char in question:
+                    depth += {"(": 1, ")": -1}.get(char, 0)
+                    max_depth = max(max_depth, depth)
+                self.assertLessEqual(max_depth, 2)
+                self.assertEqual(q["answer"], str(eval(question)))
+
+    def test_tree_nested_powers_terminate(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 2, "end": 9},
+                {"type": "operator", "value": ["+", "*", "**", "/"]},
+            ],
+            "tree": {"depth": 3, "operands": 8},
+        }
+        # Seeds 25 and 37 drew powers nested in exponents, which took
+        # seconds per question when evaluated exactly
+        for seed, count in [(25, 1), (37, 1), (0, 40), (0, 500)]:
+            with self.subTest(seed=seed, count=count):
+                random.seed(seed)
+                start = time.perf_counter()
+                quiz = MathQuizUnit.generate_quiz(
+                    dict(blueprint, count=count)
+                )
+                self.assertLess(time.perf_counter() - start, 2)
+                self.assertEqual(len(quiz), count)
+
+    def test_tree_plan_compiled_once_per_shape(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 9},
+                {"type": "operator", "value": ["+"]},
+            ],
+            "tree": {"depth": 1, "operands": 2},
+            "count": 20,
+        }
+        with patch.object(
+            MathQuizUnit,
+            "_compile_generation_plan",
+            wraps=MathQuizUnit._compile_generation_plan,
+        ) as spy:
+            quiz = MathQuizUnit.generate_quiz(blueprint)
+        spy.assert_called_once()
+        self.assertEqual(len(quiz), 20)
+
+    def test_complex_result_is_nan(self):
+        blueprint = {
+            "elements": [
+                {"type": "bracket", "value": "("},
+                {"type": "int", "start": -3, "end": -1},
+                {"type": "bracket", "value": ")"},
+                {"type": "operator", "value": ["**"]},
+                {"type": "float.1", "start": 0.1, "end": 0.9},
+            ],
+            "count": 5,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        for q in quiz:
+            self.assertEqual(q["answer"], "nan")
+
+    def test_exact_division_without_valid_dividend(self):
+        blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 2},
+                {"type": "operator", "value": ["/"]},
+                {"type": "int", "start": 0, "end": 0},
+            ],
+            "count": 3,
+            "exact_division": True,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        for q in quiz:
+            self.assertEqual(q["answer"], "nan")
+
+
+class MathQuizIterQuestionsTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.blueprint = {
+            "elements": [
+                {"type": "int", "start": 1, "end": 9},
+                {"type": "operator", "value": ["+", "*"]},
+                {"type": "int", "start": 1, "end": 9},
+            ],
+            "count": 25,
+        }
+
+    def test_iter_questions(self):
+        tree = {"depth": 2, "operands": 3}
+        for options in [{}, {"unique": True}, {"tree": tree}]:
+            blueprint = {**self.blueprint, **options}
+            with self.subTest(options=options):
+                quiz = list(MathQuizUnit.iter_questions(blueprint))
+                self.assertEqual(len(quiz), 25)
+                for q in quiz:
+                    self.assertEqual(q["category"], "math")
+                    self.assertEqual(q["answer"], str(eval(q["question"])))
+
+    @patch("quiz.units.quiz_unit_base.STREAM_CHUNK_COUNT", 10)
+    def test_iter_questions_in_chunks(self):
+        with patch.object(
+            MathQuizUnit,
+            "_generate_questions",
+            wraps=MathQuizUnit._generate_questions,
+        ) as spy:
+            questions = MathQuizUnit.iter_questions(self.blueprint)
+            next(questions)
+            spy.assert_called_once()
+            self.assertEqual(spy.call_args.args[1], 10)
+            self.assertEqual(len(list(questions)), 24)
+        self.assertEqual(
+            [call.args[1] for call in spy.call_args_list], [10, 10, 5]
+        )
+
+
+class MathQuizCompileGenerationPlanTest(BaseTestCase):
+    def test_plan_resolves_static_parts(self):
+        elements = [
+            {"type": "function", "value": "sqrt"},
+            {"type": "bracket", "value": "("},
+            {"type": "float.2", "start": 1.0, "end": 2.0},
+            {"type": "operator", "value": ["+", "-"]},
+            {"type": "constant", "value": "pi"},
+            {"type": "bracket", "value": ")"},
+        ]
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        self.assertEqual(len(plan.steps), len(elements))
+        self.assertEqual(plan.steps[0][1], "sqrt")
+        self.assertEqual(plan.steps[2][1:4], (1.0, 2.0, "{:.2f}"))
+        self.assertEqual(plan.steps[3][1], ("+", "-"))
+        # Brackets are spaced by the separators, not after generation
+        self.assertEqual(plan.steps[1][1], "(")
+        self.assertEqual(plan.steps[4][1], "pi")
+        self.assertEqual(plan.operator_slots, (1,))
+        self.assertEqual(plan.mixed_slots, ())
+
+    def test_plan_reused_for_questions(self):
+        elements = [
+            {"type": "int", "start": 3, "end": 3},
+            {"type": "operator", "value": "//"},
+            {"type": "float", "start": 0.5, "end": 0.5},
+        ]
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        for _ in range(3):
+            expr, slots = MathQuizUnit._generate_question(plan)
+            self.assertEqual(expr, "3 // 0.5")
+            self.assertEqual(slots, [3, "//", 0.5])
+            answer = MathQuizUnit._envaluate_question(plan, slots)
+            self.assertEqual(answer, "6.0")
+
+    def test_plan_mixed_precedence_operators(self):
+        elements = [
+            {"type": "int", "start": 2, "end": 2},
+            {"type": "operator", "value": ["+", "*", "**"]},
+            {"type": "int", "start": 3, "end": 3},
+            {"type": "operator", "value": ["*"]},
+            {"type": "int", "start": 4, "end": 4},
+        ]
+        plan = MathQuizUnit._compile_generation_plan(elements)
+        self.assertEqual(plan.mixed_slots, (1,))
+        for _ in range(30):
+            expr, slots = MathQuizUnit._generate_question(plan)
+            answer = MathQuizUnit._envaluate_question(plan, slots)
+            self.assertEqual(answer, str(eval(expr)))
+
+    def test_plan_invalid_element_type(self):
+        with self.assertRaises(ValueError):
+            MathQuizUnit._compile_generation_plan([{"type": "unknown"}])
+
 
 class MathQuizParseUserAnswerTest(BaseTestCase):
     def test_parse_user_answer_valid(self):
@@ -608,6 +1024,68 @@ class MathQuizCompareAnswersTest(BaseTestCase):
                     MathQuizUnit.compare_answers(user_answer, correct_answer)
                 )
 
+    def test_compare_negative_answers(self):
+        self.assertTrue(MathQuizUnit.compare_answers("-1.5", "-1.54"))
+        self.assertTrue(MathQuizUnit.compare_answers("-2", "-1.99"))
+        self.assertFalse(MathQuizUnit.compare_answers("-1.5", "-1.59"))
+        self.assertFalse(MathQuizUnit.compare_answers("-1.5", "1.5"))
+
+
+class MathQuizGradingKeyTest(BaseTestCase):
+    def test_derive_grading_key(self):
+        cases = [
+            ("3.14", 0.005),
+            ("-2", 0.5),
+            ("1e3", 500.0),
+        ]
+        for answer, expected in cases:
+            with self.subTest(answer=answer):
+                self.assertEqual(
+                    MathQuizUnit.derive_grading_key(answer), expected
+                )
+
+    def test_compare_answer_to_key(self):
+        cases = [
+            ("1.0", "1.00", True),
+            ("0.00011", "1e-4", True),
+            ("999", "1e3", True),
+            ("1.5", "1.59", False),
+            ("nan", "nan", True),
+            ("1", "nan", False),
+            ("nan", "1", False),
+        ]
+        for user_answer, correct_answer, expected in cases:
+            with self.subTest(user_answer=user_answer, answer=correct_answer):
+                key = MathQuizUnit.derive_grading_key(correct_answer)
+                self.assertEqual(
+                    MathQuizUnit.compare_answer_to_key(
+                        user_answer, correct_answer, key
+                    ),
+                    expected,
+                )
+
+    def test_generate_quiz_emits_grading_key(self):
+        blueprint = {
+            "elements": [
+                {"type": "float.2", "start": -10.0, "end": 10.0},
+                {"type": "operator", "value": ["*"]},
+                {"type": "int", "start": -10, "end": 10},
+            ],
+            "count": 10,
+        }
+        quiz = MathQuizUnit.generate_quiz(blueprint)
+        for q in quiz:
+            with self.subTest(question=q["question"]):
+                self.assertEqual(
+                    q["grading_key"],
+                    MathQuizUnit.derive_grading_key(q["answer"]),
+                )
+                self.assertTrue(
+                    MathQuizUnit.compare_answer_to_key(
+                        q["answer"], q["answer"], q["grading_key"]
+                    )
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
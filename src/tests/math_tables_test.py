@@ -0,0 +1,60 @@
+import math
+import unittest
+
+from quiz.units.math_tables import CONSTANT_TABLE, FUNCTION_TABLE
+from tests.utils.base_test_case import BaseTestCase
+
+
+class MathTablesFunctionTableTest(BaseTestCase):
+    def test_values_like_numpy(self):
+        cases = [
+            ("abs", -3, 3),
+            ("ceil", 2.1, 3.0),
+            ("ceil", 4, 4),
+            ("floor", -2.1, -3.0),
+            ("round", 2.5, 2.0),
+            ("round", 3.5, 4.0),
+            ("round", 7, 7),
+            ("exp", 1000.0, math.inf),
+            ("log", 0, -math.inf),
+            ("log10", 1000.0, 3.0),
+            ("sqrt", 16, 4.0),
+        ]
+        for name, arg, expected in cases:
+            with self.subTest(name=name, arg=arg):
+                result = FUNCTION_TABLE[name](arg)
+                self.assertEqual(result, expected)
+                self.assertIs(type(result), type(expected))
+
+    def test_domain_errors_give_nan(self):
+        cases = [
+            ("log", -1.0),
+            ("log10", -1.0),
+            ("sqrt", -1),
+            ("sin", math.inf),
+            ("cos", -math.inf),
+            ("tan", math.inf),
+        ]
+        for name, arg in cases:
+            with self.subTest(name=name, arg=arg):
+                self.assertTrue(math.isnan(FUNCTION_TABLE[name](arg)))
+
+    def test_rounding_keeps_sign_of_zero(self):
+        for name, arg in [("ceil", -0.5), ("round", -0.2), ("floor", -0.0)]:
+            with self.subTest(name=name):
+                self.assertEqual(
+                    math.copysign(1.0, FUNCTION_TABLE[name](arg)), -1.0
+                )
+
+
+class MathTablesConstantTableTest(BaseTestCase):
+    def test_derived_constants_consistent(self):
+        c = CONSTANT_TABLE
+        self.assertAlmostEqual(c["hbar"] / (c["h"] / (2 * math.pi)), 1.0)
+        self.assertAlmostEqual(c["R"] / (c["N_A"] * c["k"]), 1.0)
+        self.assertEqual(c["speed_of_light"], c["c"])
+        self.assertEqual(c["zero_Celsius"], 273.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 from copy import deepcopy
 import unittest
+from unittest.mock import patch
 
+from quiz.units import memory_quiz_unit
 from quiz.units.exceptions import UserConfigError
 from quiz.units.memory_quiz_unit import MemoryQuizUnit
 
@@ -36,12 +38,93 @@ class MemoryQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
         with self.assertRaises(UserConfigError):
             MemoryQuizUnit.transform_options_to_blueprint_unit(options)
 
+    def test_weight_arg(self):
+        options = [
+            {"key": "fruit", "args": ["apple", "2.5"]},
+            {"key": "color", "args": ["blue", "off", "3"]},
+            {"key": "animal", "args": ["dog"]},
+        ]
+        blueprint = MemoryQuizUnit.transform_options_to_blueprint_unit(
+            options
+        )
+        self.assertEqual(blueprint["items"][0]["weight"], 2.5)
+        self.assertEqual(blueprint["items"][0]["enable"], True)
+        self.assertEqual(blueprint["items"][1]["weight"], 3.0)
+        self.assertEqual(blueprint["items"][1]["enable"], False)
+        self.assertEqual(blueprint["items"][2]["weight"], 1.0)
+
+    def test_invalid_weight_arg(self):
+        cases = [
+            ["apple", "0"],
+            ["apple", "-1"],
+            ["apple", "2", "on"],
+            ["apple", "1e16"],
+            ["apple", "0.0001"],
+        ]
+        for args in cases:
+            with self.subTest(args=args):
+                with self.assertRaises(UserConfigError):
+                    MemoryQuizUnit.transform_options_to_blueprint_unit(
+                        [{"key": "fruit", "args": args}]
+                    )
+
+    def test_review_option(self):
+        options = [
+            {"key": "review", "args": []},
+            {"key": "fruit", "args": ["apple"]},
+        ]
+        blueprint = MemoryQuizUnit.transform_options_to_blueprint_unit(
+            deepcopy(options)
+        )
+        self.assertTrue(blueprint["review"])
+        self.assertEqual(len(blueprint["items"]), 1)
+        roundtrip = MemoryQuizUnit.transform_blueprint_unit_to_options(
+            blueprint
+        )
+        self.assertEqual(roundtrip[0], {"key": "review", "args": []})
+
     def test_invalid_option_missing_arg(self):
         options = [{"key": "fruit", "args": []}]
         with self.assertRaises(UserConfigError):
             MemoryQuizUnit.transform_options_to_blueprint_unit(options)
 
 
+class MemoryQuizTransformRowsToItemsTest(unittest.TestCase):
+    def test_valid_rows(self):
+        rows = [
+            ["fruit", "apple"],
+            [],
+            [" color ", "blue", "off", ""],
+            ["animal", "dog", "on", "2"],
+        ]
+        items = list(MemoryQuizUnit.transform_rows_to_items(rows))
+        self.assertEqual(
+            items,
+            [
+                {"key": "fruit", "value": "apple", "enable": True,
+                 "weight": 1.0},
+                {"key": "color", "value": "blue", "enable": False,
+                 "weight": 1.0},
+                {"key": "animal", "value": "dog", "enable": True,
+                 "weight": 2.0},
+            ],
+        )
+
+    def test_rows_consumed_lazily(self):
+        rows = iter([["fruit", "apple"], ["invalid key", "x"]])
+        items = MemoryQuizUnit.transform_rows_to_items(rows)
+        self.assertEqual(next(items)["key"], "fruit")
+        with self.assertRaises(UserConfigError) as ctx:
+            next(items)
+        self.assertIn("row 2", str(ctx.exception))
+
+    def test_invalid_rows(self):
+        for row in [["fruit"], ["fruit", "red apple"], ["1st", "x"]]:
+            with self.subTest(row=row):
+                with self.assertRaises(UserConfigError):
+                    list(MemoryQuizUnit.transform_rows_to_items([row]))
+
+
 class MemoryQuizTransformBlueprintUnitToOptionsTest(unittest.TestCase):
     def test_conversion_roundtrip(self):
         options = [
@@ -63,6 +146,16 @@ class MemoryQuizTransformBlueprintUnitToOptionsTest(unittest.TestCase):
         self.assertEqual(roundtrip[2]["key"], "animal")
         self.assertEqual(roundtrip[2]["args"], ["dog", "off"])
 
+    def test_conversion_roundtrip_weight(self):
+        options = [{"key": "fruit", "args": ["apple", "on", "2.5"]}]
+        blueprint = MemoryQuizUnit.transform_options_to_blueprint_unit(
+            deepcopy(options)
+        )
+        roundtrip = MemoryQuizUnit.transform_blueprint_unit_to_options(
+            blueprint
+        )
+        self.assertEqual(roundtrip, options)
+
 
 class MemoryQuizGenerateQuizTest(unittest.TestCase):
 
@@ -107,6 +200,67 @@ class MemoryQuizGenerateQuizTest(unittest.TestCase):
         for q in quiz:
             self._validate_quiz_item(q, blueprint["items"])
 
+    def test_weighted_items_drawn_more_often(self):
+        items = self.items
+        items[0]["weight"] = 9.0
+        blueprint = {"count": 1, "items": items}
+        answers = [
+            MemoryQuizUnit.generate_quiz(blueprint)[0]["answer"]
+            for _ in range(500)
+        ]
+        self.assertGreater(answers.count("paris"), 350)
+        self.assertNotIn("blue", answers)
+
+    def test_review_mode_tracks_item_keys(self):
+        blueprint = {"count": 2, "items": self.items, "review": True}
+        quiz = MemoryQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(
+            sorted(q["item_key"] for q in quiz), ["animal", "capital"]
+        )
+        blueprint = {"count": 2, "items": self.items}
+        quiz = MemoryQuizUnit.generate_quiz(blueprint)
+        self.assertTrue(all("item_key" not in q for q in quiz))
+
+    def test_sampler_cached_per_deck(self):
+        blueprint = {"count": 2, "items": self.items, "deck_id": "deck-1"}
+        with patch.object(
+            memory_quiz_unit,
+            "FenwickSampler",
+            wraps=memory_quiz_unit.FenwickSampler,
+        ) as mock_sampler:
+            for _ in range(3):
+                MemoryQuizUnit.generate_quiz(blueprint)
+            self.assertEqual(mock_sampler.call_count, 1)
+
+            # A changed deck comes with a new deck id
+            blueprint["deck_id"] = "deck-2"
+            MemoryQuizUnit.generate_quiz(blueprint)
+            self.assertEqual(mock_sampler.call_count, 2)
+
+            # Without a deck id, every quiz builds its sampler
+            del blueprint["deck_id"]
+            MemoryQuizUnit.generate_quiz(blueprint)
+            MemoryQuizUnit.generate_quiz(blueprint)
+            self.assertEqual(mock_sampler.call_count, 4)
+
+    def test_sampler_cache_bounded(self):
+        for i in range(memory_quiz_unit.MAX_CACHED_DECKS + 5):
+            blueprint = {"count": 1, "items": self.items, "deck_id": i}
+            MemoryQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(
+            len(memory_quiz_unit._deck_samplers),
+            memory_quiz_unit.MAX_CACHED_DECKS,
+        )
+
+    def test_extreme_weights_terminate(self):
+        items = [
+            {"key": "a", "value": "x", "enable": True, "weight": 1e16},
+            {"key": "b", "value": "y", "enable": True, "weight": 1.0},
+            {"key": "c", "value": "z", "enable": True, "weight": 1e-9},
+        ]
+        quiz = MemoryQuizUnit.generate_quiz({"count": 3, "items": items})
+        self.assertEqual(sorted(q["answer"] for q in quiz), ["x", "y", "z"])
+
     def test_count_greater_than_item_length(self):
         blueprint = {
             "count": 3,
@@ -0,0 +1,116 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from quiz import parallel_generation
+from quiz.parallel_generation import generate_quiz_parallel
+from quiz.quiz_engine import QuizEngine
+from tests.utils.base_test_case import BaseTestCase
+
+
+def _math_block(count, **options):
+    elements = [
+        {"type": "int", "start": 1, "end": 9},
+        {"type": "operator", "value": ["+", "*"]},
+        {"type": "int", "start": 1, "end": 9},
+    ]
+    return ({"elements": elements, "count": count, **options}, "math")
+
+
+def _date_block(count):
+    return ({"start_year": 2000, "end_year": 2010, "count": count}, "date")
+
+
+@patch.object(parallel_generation, "MIN_CHUNK_COUNT", 20)
+class GenerateQuizParallelTest(BaseTestCase):
+    def test_block_order_preserved(self):
+        blueprint = [_math_block(50), _date_block(5), _math_block(30)]
+        quiz = generate_quiz_parallel(blueprint, workers=2)
+        categories = [q["category"] for q in quiz]
+        self.assertEqual(
+            categories, ["math"] * 50 + ["date"] * 5 + ["math"] * 30
+        )
+        for q in quiz:
+            if q["category"] == "math":
+                self.assertEqual(q["answer"], str(eval(q["question"])))
+
+    def test_small_blocks_inline(self):
+        blueprint = [_math_block(5), _date_block(5)]
+        with patch.object(
+            parallel_generation, "ProcessPoolExecutor"
+        ) as executor:
+            quiz = generate_quiz_parallel(blueprint, workers=4)
+        executor.assert_not_called()
+        self.assertEqual(len(quiz), 10)
+
+    def test_split_count(self):
+        cases = [
+            (19, 4, [19]),
+            (40, 4, [20, 20]),
+            (101, 4, [26, 25, 25, 25]),
+            (1000, 3, [334, 333, 333]),
+        ]
+        for count, workers, expected in cases:
+            with self.subTest(count=count, workers=workers):
+                self.assertEqual(
+                    parallel_generation._split_count(count, workers), expected
+                )
+
+    def test_unique_blocks_not_split(self):
+        blueprint = [_math_block(162, unique=True)]
+        quiz = generate_quiz_parallel(blueprint, workers=4)
+        questions = [q["question"] for q in quiz]
+        self.assertEqual(len(set(questions)), 162)
+
+    def test_memory_blocks_not_split(self):
+        items = [
+            {"key": f"k{i}", "value": f"v{i}", "enable": True}
+            for i in range(120)
+        ]
+        blueprint = [({"items": items, "count": 100}, "memory")]
+        quiz = generate_quiz_parallel(blueprint, workers=2)
+        questions = [q["question"] for q in quiz]
+        self.assertEqual(len(set(questions)), 100)
+
+    def test_reproducible_with_seed(self):
+        blueprint = [_math_block(60), _date_block(40)]
+        random.seed(0)
+        first = generate_quiz_parallel(blueprint, workers=3)
+        random.seed(0)
+        second = generate_quiz_parallel(blueprint, workers=3)
+        self.assertEqual(first, second)
+
+    def test_chunks_use_independent_streams(self):
+        blueprint = [_date_block(200)]
+        quiz = generate_quiz_parallel(blueprint, workers=4)
+        chunks = [quiz[i : i + 50] for i in range(0, 200, 50)]
+        for i, chunk in enumerate(chunks[1:]):
+            with self.subTest(chunk=i + 1):
+                self.assertNotEqual(chunk, chunks[0])
+
+
+class QuizEngineGenerateQuizWorkersTest(BaseTestCase):
+    def test_inline_without_workers(self):
+        blueprint = [_math_block(10)]
+        with patch.object(
+            parallel_generation, "generate_quiz_parallel"
+        ) as parallel:
+            for workers in [None, 1]:
+                quiz = QuizEngine().generate_quiz(blueprint, workers)
+                self.assertEqual(len(quiz), 10)
+        parallel.assert_not_called()
+
+    def test_parallel_with_workers(self):
+        blueprint = [_math_block(10)]
+        with patch.object(
+            parallel_generation,
+            "generate_quiz_parallel",
+            wraps=generate_quiz_parallel,
+        ) as parallel:
+            quiz = QuizEngine().generate_quiz(blueprint, workers=2)
+        parallel.assert_called_once_with(blueprint, 2)
+        self.assertEqual(len(quiz), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from quiz.units.permutation import FeistelPermutation, unique_indices
+
+
+class FeistelPermutationTest(unittest.TestCase):
+    def test_is_permutation(self):
+        for size in [1, 2, 3, 4, 5, 17, 100, 1000, 4097]:
+            with self.subTest(size=size):
+                permutation = FeistelPermutation(size)
+                values = [permutation[i] for i in range(size)]
+                self.assertEqual(sorted(values), list(range(size)))
+
+    def test_same_key_same_permutation(self):
+        first = FeistelPermutation(1000, key=42)
+        second = FeistelPermutation(1000, key=42)
+        other = FeistelPermutation(1000, key=43)
+        values = [first[i] for i in range(1000)]
+        self.assertEqual(values, [second[i] for i in range(1000)])
+        self.assertNotEqual(values, [other[i] for i in range(1000)])
+
+    def test_large_size(self):
+        size = 10**18
+        permutation = FeistelPermutation(size)
+        values = [permutation[i] for i in range(1000)]
+        self.assertEqual(len(set(values)), 1000)
+        for value in values:
+            self.assertTrue(0 <= value < size)
+
+    def test_index_out_of_range(self):
+        permutation = FeistelPermutation(10)
+        for index in [-1, 10]:
+            with self.subTest(index=index):
+                with self.assertRaises(IndexError):
+                    permutation[index]
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            FeistelPermutation(0)
+
+
+class UniqueIndicesTest(unittest.TestCase):
+    def test_distinct_within_size(self):
+        random.seed(0)
+        indices = list(unique_indices(50, 50))
+        self.assertEqual(sorted(indices), list(range(50)))
+
+    def test_count_exceeds_size(self):
+        indices = list(unique_indices(7, 23))
+        self.assertEqual(len(indices), 23)
+        for start in range(0, 21, 7):
+            with self.subTest(start=start):
+                cycle = indices[start : start + 7]
+                self.assertEqual(sorted(cycle), list(range(7)))
+        self.assertEqual(len(set(indices[21:])), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -261,6 +261,30 @@ class GenerateQuizTest(BaseTestCase):
             self.assertEqual(q["category"], "DUMMY")
 
 
+@patch(old_mapping, new_mapping)
+class IterQuizTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.engine = QuizEngine()
+        self.blueprint = [({"count": 1, "value": "dummy"}, "DUMMY")] * 3
+
+    def test_iter_quiz_matches_generate_quiz(self):
+        quiz = list(self.engine.iter_quiz(self.blueprint))
+        self.assertEqual(quiz, self.engine.generate_quiz(self.blueprint))
+
+    def test_iter_quiz_is_lazy(self):
+        with patch.object(
+            DummyQuizUnit,
+            "iter_questions",
+            wraps=DummyQuizUnit.iter_questions,
+        ) as spy:
+            questions = self.engine.iter_quiz(self.blueprint)
+            spy.assert_not_called()
+            next(questions)
+            spy.assert_called_once_with(self.blueprint[0][0])
+
+
 @patch(old_mapping, new_mapping)
 class ComputeQuizResultsTest(BaseTestCase):
 
@@ -314,6 +338,49 @@ class ComputeQuizResultsTest(BaseTestCase):
         self.assertFalse(results[0]["is_correct"])
         self.assertEqual(results[0]["user_answer"], "Not answered")
 
+    def test_grading_key_used(self):
+        quiz = [dict(self.quiz[0], grading_key="prepared")]
+        with patch.object(
+            DummyQuizUnit,
+            "derive_grading_key",
+            wraps=DummyQuizUnit.derive_grading_key,
+        ) as derive_spy, patch.object(
+            DummyQuizUnit,
+            "compare_answer_to_key",
+            wraps=DummyQuizUnit.compare_answer_to_key,
+        ) as compare_spy:
+            results = self.engine.compute_quiz_results(quiz, ["4"])
+        derive_spy.assert_not_called()
+        compare_spy.assert_called_once_with("4", "4", "prepared")
+        self.assertTrue(results[0]["is_correct"])
+        self.assertEqual(results[0]["correct_answer"], "4")
+
+    def test_grading_key_derived_if_missing(self):
+        with patch.object(
+            DummyQuizUnit,
+            "derive_grading_key",
+            wraps=DummyQuizUnit.derive_grading_key,
+        ) as derive_spy:
+            results = self.engine.compute_quiz_results(self.quiz, ["4"])
+        derive_spy.assert_called_once_with("4")
+        self.assertTrue(results[0]["is_correct"])
+
+    def test_answers_graded_per_category(self):
+        quiz = self.quiz * 3
+        with patch.object(
+            DummyQuizUnit,
+            "grade_answers",
+            wraps=DummyQuizUnit.grade_answers,
+        ) as grade_spy:
+            results = self.engine.compute_quiz_results(quiz, ["4", "", "5"])
+        grade_spy.assert_called_once_with(["4", "5"], ["4", "4"], [None, None])
+        self.assertEqual(
+            [res["is_correct"] for res in results], [True, False, False]
+        )
+        self.assertEqual(
+            [res["user_answer"] for res in results], ["4", "Not answered", "5"]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,23 @@ class QuizIntegrationTest(BaseTestCase):
             """date: 1
   start 2020
   end 2020""",
+            """datediff: 1
+  start 2020
+  end 2020
+  between""",
+            """factor: 1
+  start 12
+  end 12
+  factorize""",
+            """tables: 1
+  start 7
+  end 7
+  square""",
+            """convert: 1
+  C F 100 100""",
+            """fraction: 1
+  denominator 2
+  multiply""",
             """memory: 1
   fruit apple on
   animal dog off
@@ -30,11 +47,17 @@ class QuizIntegrationTest(BaseTestCase):
 
         # Force specific answers on the quiz for testing purposes, were required
         quiz[1].update({"answer": "monday"})
+        quiz[2].update({"answer": "29"})
 
         submission = {
             "answer_0": "3",
             "answer_1": "Monday",
-            "answer_2": "apple",
+            "answer_2": "29",
+            "answer_3": "3 x 2^2",
+            "answer_4": "49",
+            "answer_5": "212",
+            "answer_6": "25%",
+            "answer_7": "apple",
         }
         user_answers = collect_user_answers(submission, len(quiz))
         results = compute_quiz_results(quiz, user_answers)
@@ -50,9 +73,29 @@ class QuizIntegrationTest(BaseTestCase):
         self.assertTrue(results[1]["is_correct"])
         self.assertEqual(results[1]["user_answer"].lower(), "monday")
 
-        # Verify Memory quiz results
+        # Verify Datediff quiz results
         self.assertTrue(results[2]["is_correct"])
-        self.assertEqual(results[2]["user_answer"], "apple")
+        self.assertEqual(results[2]["user_answer"], "29")
+
+        # Verify Factor quiz results
+        self.assertTrue(results[3]["is_correct"])
+        self.assertEqual(results[3]["user_answer"], "2^2 * 3")
+
+        # Verify Tables quiz results
+        self.assertTrue(results[4]["is_correct"])
+        self.assertEqual(results[4]["user_answer"], "49")
+
+        # Verify Convert quiz results
+        self.assertTrue(results[5]["is_correct"])
+        self.assertEqual(results[5]["correct_answer"], "212")
+
+        # Verify Fraction quiz results
+        self.assertTrue(results[6]["is_correct"])
+        self.assertEqual(results[6]["user_answer"], "1/4")
+
+        # Verify Memory quiz results
+        self.assertTrue(results[7]["is_correct"])
+        self.assertEqual(results[7]["user_answer"], "apple")
 
 
 if __name__ == "__main__":
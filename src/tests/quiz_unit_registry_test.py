@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+from quiz.units import QUIZ_UNIT_MAPPING, QUIZ_UNIT_PATHS, registry
+from quiz.units.date_quiz_unit import DateQuizUnit
+from quiz.units.registry import QuizUnitRegistry
+from tests.utils.base_test_case import BaseTestCase
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MEASURE_LOADED_UNITS = """
+import json
+import sys
+
+from quiz import generate_quiz, parse_blueprint_from_text
+
+generate_quiz(parse_blueprint_from_text("date: 2"))
+print(json.dumps(sorted(m for m in sys.modules if m.endswith("_quiz_unit"))))
+"""
+
+PLUGIN_ENTRY_POINTS = [
+    EntryPoint(
+        name="plugin",
+        value="quiz.units.date_quiz_unit:DateQuizUnit",
+        group=registry.ENTRY_POINT_GROUP,
+    ),
+    EntryPoint(
+        name="date",
+        value="quiz.units.memory_quiz_unit:MemoryQuizUnit",
+        group=registry.ENTRY_POINT_GROUP,
+    ),
+]
+
+
+class QuizUnitRegistryTest(BaseTestCase):
+    def test_builtin_units(self):
+        self.assertEqual(set(QUIZ_UNIT_MAPPING), set(QUIZ_UNIT_PATHS))
+        for category, path in QUIZ_UNIT_PATHS.items():
+            with self.subTest(category=category):
+                unit = QUIZ_UNIT_MAPPING[category]
+                self.assertEqual(f"{unit.__module__}:{unit.__name__}", path)
+
+    def test_only_used_units_are_imported(self):
+        output = subprocess.run(
+            [sys.executable, "-c", _MEASURE_LOADED_UNITS],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        self.assertEqual(json.loads(output), ["quiz.units.date_quiz_unit"])
+
+    def test_unit_loaded_once(self):
+        units = QuizUnitRegistry({"date": QUIZ_UNIT_PATHS["date"]})
+        self.assertEqual(units.loaded_categories(), [])
+        with patch.object(
+            registry, "_load_unit", wraps=registry._load_unit
+        ) as mock_load:
+            self.assertIs(units["date"], DateQuizUnit)
+            self.assertIs(units.get("date"), DateQuizUnit)
+        mock_load.assert_called_once()
+        self.assertEqual(units.loaded_categories(), ["date"])
+
+    def test_unknown_category(self):
+        units = QuizUnitRegistry({"date": QUIZ_UNIT_PATHS["date"]})
+        self.assertIsNone(units.get("unknown"))
+        self.assertNotIn("unknown", units)
+        with self.assertRaises(KeyError):
+            units["unknown"]
+
+    def test_invalid_unit(self):
+        units = QuizUnitRegistry({"invalid": "quiz.units.registry:Mapping"})
+        with self.assertRaises(TypeError):
+            units["invalid"]
+
+    def test_entry_point_discovery(self):
+        units = QuizUnitRegistry(
+            {"date": QUIZ_UNIT_PATHS["date"]}, registry.ENTRY_POINT_GROUP
+        )
+        with patch(
+            "importlib.metadata.entry_points",
+            return_value=PLUGIN_ENTRY_POINTS,
+        ) as mock_entry_points:
+            # Built-in units are found without reading the entry points
+            self.assertIs(units["date"], DateQuizUnit)
+            mock_entry_points.assert_not_called()
+
+            self.assertIs(units["plugin"], DateQuizUnit)
+            self.assertEqual(set(units), {"date", "plugin"})
+            self.assertEqual(len(units), 2)
+        mock_entry_points.assert_called_once_with(
+            group=registry.ENTRY_POINT_GROUP
+        )
+        # Built-in units take precedence
+        self.assertIs(units["date"], DateQuizUnit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from tests.utils.base_test_case import BaseTestCase
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for importing the quiz units in a fresh interpreter, as every web
+# worker does on startup
+MAX_IMPORT_SECONDS = 0.5
+MAX_NEW_MODULES = 60
+
+_MEASURE_IMPORT = """
+import json
+import sys
+import time
+
+before = set(sys.modules)
+start = time.perf_counter()
+import quiz.units
+elapsed = time.perf_counter() - start
+modules = sorted(set(sys.modules) - before)
+print(json.dumps({"seconds": elapsed, "modules": modules}))
+"""
+
+
+class QuizUnitsImportTest(BaseTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        output = subprocess.run(
+            [sys.executable, "-c", _MEASURE_IMPORT],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        cls.measurement = json.loads(output)
+
+    def test_heavy_dependencies_not_imported(self):
+        for module in self.measurement["modules"]:
+            with self.subTest(module=module):
+                self.assertFalse(module.split(".")[0] in ("numpy", "scipy"))
+
+    def test_module_count_within_budget(self):
+        self.assertLessEqual(
+            len(self.measurement["modules"]), MAX_NEW_MODULES
+        )
+
+    def test_import_time_within_budget(self):
+        self.assertLessEqual(self.measurement["seconds"], MAX_IMPORT_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from app import db
+from app.auth_service import AuthService
+from app.blueprint_service import BlueprintService
+from app.models import MemoryReviewState, User
+from app.review_service import BOX_INTERVALS, ReviewService
+from quiz import compute_quiz_results, generate_quiz
+from tests.utils.base_test_case import BaseTestCase
+
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+BLUEPRINT_TEXT = """memory: 2
+ review
+ fruit apple
+ color blue
+ animal dog
+ city paris off
+"""
+
+
+class ReviewServiceTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app = Flask(__name__)
+        self.app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+        self.app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+        self.app.config["SECRET_KEY"] = "test-secret"
+
+        db.init_app(self.app)
+        self.app.app_context().push()
+        db.app = self.app
+        db.create_all()
+
+        self.auth = AuthService(db=db)
+        self.bp_service = BlueprintService(db=db)
+        self.review_service = ReviewService(db=db)
+
+        email = "alice@example.com"
+        self.auth.add_pending_user(email, "alice", "Strong1!")
+        self.auth.register_pending_user_by_email(email)
+        user = User.query.filter_by(username="alice").first()
+        self.bp_service.add_user_blueprint(
+            user.id, "deck", "desc", BLUEPRINT_TEXT
+        )
+        entry = self.bp_service.get_user_blueprint(user.id, "deck")
+        self.blueprint_id = entry["id"]
+        self.blueprint = entry["blueprint"]
+
+    def tearDown(self):
+        super().tearDown()
+        db.session.remove()
+        db.drop_all()
+
+    def _scheduled_keys(self, now):
+        blueprint = self.review_service.schedule_blueprint(
+            self.blueprint_id, self.blueprint, now=now
+        )
+        unit, _ = blueprint[0]
+        return [item["key"] for item in unit["items"]], unit["count"]
+
+    def _review(self, answers, now):
+        blueprint = self.review_service.schedule_blueprint(
+            self.blueprint_id, self.blueprint, now=now
+        )
+        quiz = generate_quiz(blueprint)
+        user_answers = [answers[q["item_key"]] for q in quiz]
+        results = compute_quiz_results(quiz, user_answers)
+        self.review_service.record_results(
+            self.blueprint_id, quiz, results, now=now
+        )
+        return quiz
+
+    def test_new_items_scheduled_in_deck_order(self):
+        keys, count = self._scheduled_keys(NOW)
+        self.assertEqual(keys, ["fruit", "color"])
+        self.assertEqual(count, 2)
+
+    def test_due_items_do_not_share_deck_sampler(self):
+        self.assertIn("deck_id", self.blueprint[0][0])
+        blueprint = self.review_service.schedule_blueprint(
+            self.blueprint_id, self.blueprint, now=NOW
+        )
+        self.assertNotIn("deck_id", blueprint[0][0])
+
+    def test_review_quiz_tracks_item_keys(self):
+        quiz = self._review({"fruit": "apple", "color": "red"}, NOW)
+        self.assertEqual(
+            sorted(q["item_key"] for q in quiz), ["color", "fruit"]
+        )
+        states = {
+            state.item_key: state for state in MemoryReviewState.query.all()
+        }
+        self.assertEqual(states["fruit"].box, 1)
+        self.assertEqual(states["fruit"].due, NOW + BOX_INTERVALS[1])
+        self.assertEqual(states["color"].box, 0)
+        self.assertEqual(states["color"].due, NOW)
+
+    def test_due_items_before_new_items(self):
+        self._review({"fruit": "apple", "color": "red"}, NOW)
+        # 'color' is due again, 'fruit' is not, 'animal' is new
+        keys, _ = self._scheduled_keys(NOW + timedelta(hours=1))
+        self.assertEqual(sorted(keys), ["animal", "color"])
+
+    def test_correct_answers_move_up_boxes(self):
+        answers = {"fruit": "apple", "color": "blue"}
+        self._review(answers, NOW)
+        self._review(answers, NOW + BOX_INTERVALS[1])
+        state = MemoryReviewState.query.filter_by(item_key="fruit").first()
+        self.assertEqual(state.box, 2)
+        self.assertEqual(state.due, NOW + BOX_INTERVALS[1] + BOX_INTERVALS[2])
+
+    def test_nothing_due(self):
+        answers = {"fruit": "apple", "color": "blue", "animal": "dog"}
+        self._review(answers, NOW)
+        self._review(answers, NOW)
+        keys, count = self._scheduled_keys(NOW)
+        self.assertEqual(keys, [])
+        self.assertEqual(count, 0)
+        blueprint = self.review_service.schedule_blueprint(
+            self.blueprint_id, self.blueprint, now=NOW
+        )
+        self.assertEqual(generate_quiz(blueprint), [])
+
+    def test_quiz_route_redirects_when_nothing_due(self):
+        from app.routes import register_routes
+
+        self.app.auth = self.auth
+        self.app.bp_service = self.bp_service
+        self.app.review_service = self.review_service
+        register_routes(self.app)
+        now = datetime.utcnow()
+        answers = {"fruit": "apple", "color": "blue", "animal": "dog"}
+        self._review(answers, now)
+        self._review(answers, now)
+
+        client = self.app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = User.query.first().id
+            session["username"] = "alice"
+            session["blueprint"] = self.blueprint
+            session["blueprint_id"] = self.blueprint_id
+        response = client.get("/quiz")
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.location.endswith("/"))
+        with client.session_transaction() as session:
+            self.assertNotIn("quiz", session)
+            self.assertEqual(
+                session["_flashes"],
+                [("info", "Nothing is due for review right now.")],
+            )
+
+    def test_non_review_blocks_unchanged(self):
+        unit = {"count": 1, "start_year": 2000, "end_year": 2000}
+        blueprint = [(unit, "date")]
+        scheduled = self.review_service.schedule_blueprint(
+            self.blueprint_id, blueprint, now=NOW
+        )
+        self.assertEqual(scheduled, blueprint)
+
+    def test_states_deleted_with_blueprint(self):
+        self._review({"fruit": "apple", "color": "blue"}, NOW)
+        self.assertEqual(MemoryReviewState.query.count(), 2)
+        user = User.query.filter_by(username="alice").first()
+        self.bp_service.delete_user_blueprint(user.id, "deck")
+        self.assertEqual(MemoryReviewState.query.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
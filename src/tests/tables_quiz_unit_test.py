@@ -0,0 +1,162 @@
+import math
+import unittest
+from collections import Counter
+from copy import deepcopy
+
+from quiz.units.exceptions import UserConfigError, UserResponseError
+from quiz.units.tables_quiz_unit import (
+    TablesQuizUnit,
+    _count_facts,
+    _fact_at,
+)
+
+
+class TablesFactAtTest(unittest.TestCase):
+    def _facts(self, start, end, kinds):
+        count = _count_facts(start, end, kinds)
+        return [_fact_at(start, end, kinds, i) for i in range(count)]
+
+    def test_fact_at(self):
+        facts = self._facts(2, 3, ("multiply", "sqrt"))
+        self.assertEqual(
+            facts,
+            [
+                ("2 * 2", "4"),
+                ("2 * 3", "6"),
+                ("3 * 2", "6"),
+                ("3 * 3", "9"),
+                ("sqrt(4)", "2"),
+                ("sqrt(9)", "3"),
+            ],
+        )
+
+    def test_fact_at_powers(self):
+        facts = self._facts(4, 5, ("square", "cube"))
+        self.assertEqual(
+            facts,
+            [
+                ("4 ** 2", "16"),
+                ("5 ** 2", "25"),
+                ("4 ** 3", "64"),
+                ("5 ** 3", "125"),
+            ],
+        )
+
+
+class TablesQuizTransformOptionsToBlueprintUnitTest(unittest.TestCase):
+    def test_defaults(self):
+        unit_bp = TablesQuizUnit.transform_options_to_blueprint_unit([])
+        self.assertEqual(unit_bp["start"], 1)
+        self.assertEqual(unit_bp["end"], 12)
+        self.assertEqual(
+            unit_bp["kinds"], ["multiply", "square", "cube", "sqrt"]
+        )
+        self.assertNotIn("unique", unit_bp)
+
+    def test_valid_options(self):
+        options = [
+            {"key": "start", "args": ["3"]},
+            {"key": "end", "args": ["20"]},
+            {"key": "sqrt", "args": []},
+            {"key": "multiply", "args": []},
+            {"key": "unique", "args": []},
+        ]
+        unit_bp = TablesQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(unit_bp["start"], 3)
+        self.assertEqual(unit_bp["end"], 20)
+        self.assertEqual(unit_bp["kinds"], ["multiply", "sqrt"])
+        self.assertTrue(unit_bp["unique"])
+
+    def test_invalid_options(self):
+        cases = [
+            [{"key": "invalid", "args": []}],
+            [{"key": "start", "args": ["-1"]}],
+            [{"key": "start", "args": ["5"]}, {"key": "end", "args": ["4"]}],
+            [{"key": "end", "args": ["1000"]}],
+            [{"key": "square", "args": ["2"]}],
+            [{"key": "unique", "args": []}, {"key": "unique", "args": []}],
+            [{"key": "cube", "args": []}, {"key": "cube", "args": []}],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                with self.assertRaises(UserConfigError):
+                    TablesQuizUnit.transform_options_to_blueprint_unit(
+                        deepcopy(options)
+                    )
+
+    def test_large_range_without_multiply(self):
+        options = [
+            {"key": "end", "args": ["1000"]},
+            {"key": "square", "args": []},
+        ]
+        unit_bp = TablesQuizUnit.transform_options_to_blueprint_unit(options)
+        self.assertEqual(unit_bp["end"], 1000)
+
+    def test_parse_unparse_roundtrip(self):
+        cases = [
+            [],
+            [{"key": "cube", "args": []}, {"key": "unique", "args": []}],
+        ]
+        for options in cases:
+            with self.subTest(options=options):
+                unit_bp = TablesQuizUnit.transform_options_to_blueprint_unit(
+                    deepcopy(options)
+                )
+                unparsed = TablesQuizUnit.transform_blueprint_unit_to_options(
+                    unit_bp
+                )
+                reparsed = TablesQuizUnit.transform_options_to_blueprint_unit(
+                    unparsed
+                )
+                self.assertEqual(unit_bp, reparsed)
+
+
+class TablesQuizGenerateQuizTest(unittest.TestCase):
+    def test_generate_quiz(self):
+        blueprint = {
+            "start": 2,
+            "end": 9,
+            "kinds": ["multiply", "square", "cube", "sqrt"],
+            "count": 200,
+        }
+        quiz = TablesQuizUnit.generate_quiz(blueprint)
+        self.assertEqual(len(quiz), 200)
+        for q in quiz:
+            expression = q["question"].replace("sqrt", "isqrt")
+            expected = eval(expression, {"isqrt": math.isqrt})
+            self.assertEqual(q["answer"], str(expected))
+            self.assertEqual(q["category"], "tables")
+
+    def test_unique_covers_every_fact_once_per_cycle(self):
+        blueprint = {
+            "start": 1,
+            "end": 12,
+            "kinds": ["multiply"],
+            "unique": True,
+            "count": 300,
+        }
+        quiz = TablesQuizUnit.generate_quiz(blueprint)
+        first_cycle = Counter(q["question"] for q in quiz[:144])
+        self.assertEqual(len(first_cycle), 144)
+        second_cycle = Counter(q["question"] for q in quiz[144:288])
+        self.assertEqual(len(second_cycle), 144)
+
+
+class TablesQuizAnswerTest(unittest.TestCase):
+    def test_parse_user_answer(self):
+        self.assertEqual(TablesQuizUnit.parse_user_answer(" 56 "), "56")
+        self.assertEqual(TablesQuizUnit.parse_user_answer("056"), "56")
+
+    def test_parse_user_answer_invalid(self):
+        for answer in ["abc", "5.5", "7*8"]:
+            with self.subTest(answer=answer):
+                with self.assertRaises(UserResponseError):
+                    TablesQuizUnit.parse_user_answer(answer)
+
+    def test_compare_answers(self):
+        self.assertTrue(TablesQuizUnit.compare_answers("56", "56"))
+        self.assertFalse(TablesQuizUnit.compare_answers("54", "56"))
+
+
+if __name__ == "__main__":
+    unittest.main()
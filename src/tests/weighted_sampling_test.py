@@ -0,0 +1,59 @@
+import random
+import unittest
+from collections import Counter
+
+from quiz.units.weighted_sampling import FenwickSampler
+
+
+class FenwickSamplerTest(unittest.TestCase):
+    def test_draws_are_distinct(self):
+        for size in [1, 2, 3, 7, 8, 100, 1000]:
+            with self.subTest(size=size):
+                sampler = FenwickSampler([random.random() + 0.1] * size)
+                indices = sampler.sample(size)
+                self.assertEqual(sorted(indices), list(range(size)))
+
+    def test_zero_weights_never_drawn(self):
+        sampler = FenwickSampler([0.0, 1.0, 0.0, 2.0, 0.0])
+        self.assertEqual(sampler.population, 2)
+        for _ in range(100):
+            self.assertEqual(sorted(sampler.sample(2)), [1, 3])
+
+    def test_count_exceeds_population(self):
+        sampler = FenwickSampler([1.0, 0.0])
+        with self.assertRaises(ValueError):
+            sampler.sample(2)
+
+    def test_negative_weight(self):
+        with self.assertRaises(ValueError):
+            FenwickSampler([1.0, -1.0])
+
+    def test_draw_probabilities_follow_weights(self):
+        random.seed(0)
+        sampler = FenwickSampler([1.0, 2.0, 7.0])
+        draws = Counter(sampler.sample(1)[0] for _ in range(20000))
+        self.assertAlmostEqual(draws[0] / 20000, 0.1, delta=0.02)
+        self.assertAlmostEqual(draws[1] / 20000, 0.2, delta=0.02)
+        self.assertAlmostEqual(draws[2] / 20000, 0.7, delta=0.02)
+
+    def test_extreme_weight_ratios(self):
+        # Stored weights outside of the accepted range are clamped, so the
+        # remaining weights stay exact and every draw succeeds
+        sampler = FenwickSampler([1e16, 1.0, 1e-12, 3.0])
+        for _ in range(100):
+            self.assertEqual(sorted(sampler.sample(4)), [0, 1, 2, 3])
+
+    def test_tree_restored_after_sampling(self):
+        sampler = FenwickSampler([0.5, 1.0, 0.0, 2.25])
+        tree = list(sampler._tree)
+        sampler.sample(3)
+        self.assertEqual(sampler._tree, tree)
+
+    def test_sampler_reusable(self):
+        sampler = FenwickSampler([1.0] * 10)
+        for _ in range(5):
+            self.assertEqual(len(set(sampler.sample(10))), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()